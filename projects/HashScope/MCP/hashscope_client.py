@@ -4,16 +4,73 @@ HashScope API Client
 This module provides a client for interacting with the HashScope API.
 """
 
-import requests
-from typing import Dict, Any, Optional, List, Union
-import json
+import asyncio
+import httpx
+import ijson
+import orjson
+from cachetools import TTLCache, LRUCache
+from typing import Dict, Any, AsyncIterator, Optional, List, Sequence, Tuple, Union
+
+# Symbolic endpoint names mapped to their API paths
+ENDPOINTS = {
+    'btc_usd': '/crypto/btc/usd',
+    'btc_krw': '/crypto/btc/krw',
+    'usdt_krw': '/crypto/usdt/krw',
+    'kimchi_premium': '/crypto/kimchi-premium',
+    'trump_posts': '/social/trump',
+    'elon_posts': '/social/elon',
+    'x_trends': '/social/x/trends',
+    'funding_rates': '/derivatives/funding-rates',
+    'open_interest': '/derivatives/open-interest',
+    'hsk_updates': '/projects/hsk',
+    'ethereum_standards': '/projects/ethereum/standards',
+    'solana_updates': '/projects/solana',
+    'bitcoin_activity': '/opensource/bitcoin',
+    'ethereum_activity': '/opensource/ethereum',
+}
+
+# Endpoints served from the short-lived price cache
+PRICE_ENDPOINTS = frozenset({'btc_usd', 'btc_krw', 'usdt_krw', 'kimchi_premium'})
+
+# Significant digits requested for price values; shorter numbers mean smaller, faster-to-parse bodies
+DEFAULT_PRECISION = 6
+
+HTTP_METHODS = frozenset({'GET', 'POST', 'PUT', 'DELETE'})
+
+
+class _ByteStreamReader:
+    """Adapt an async byte iterator to the async ``read()`` interface ijson expects."""
+    
+    def __init__(self, chunks: AsyncIterator[bytes]):
+        self._chunks = chunks
+    
+    async def read(self, size: int = -1) -> bytes:
+        # ijson probes with read(0) and accepts chunks of any length;
+        # an empty chunk signals end of stream
+        if size == 0:
+            return b''
+        async for chunk in self._chunks:
+            if chunk:
+                return chunk
+        return b''
 
 class HashScopeClient:
     """
-    Client for interacting with the HashScope API.
+    Async client for interacting with the HashScope API.
+
+    A single pooled ``httpx.AsyncClient`` (HTTP/2, keep-alive) is created lazily
+    and reused across calls. Call ``aclose()`` when the client is no longer needed.
+    
+    Read-only GET responses are kept in in-memory TTL caches: price data for
+    ``price_cache_ttl`` seconds and slower-moving feeds (social, derivatives,
+    projects, open source) for ``feed_cache_ttl`` seconds. Once an entry expires
+    the request is revalidated with ``If-None-Match``, and a ``304 Not Modified``
+    reuses the previously decoded body.
     """
     
-    def __init__(self, api_key_id: str, api_key_secret: str, base_url: str = "https://hashkey.sungwoonsong.com/api"):
+    def __init__(self, api_key_id: str, api_key_secret: str, base_url: str = "https://hashkey.sungwoonsong.com/api",
+                 max_connections: int = 64, max_keepalive_connections: int = 32,
+                 price_cache_ttl: float = 10, feed_cache_ttl: float = 120):
         """
         Initialize the HashScope API client.
         
@@ -21,19 +78,71 @@ class HashScopeClient:
             api_key_id: The API key ID
             api_key_secret: The API key secret
             base_url: The base URL for the HashScope API (default: https://hashkey.sungwoonsong.com/api)
+            max_connections: Maximum number of concurrent connections in the pool
+            max_keepalive_connections: Maximum number of idle keep-alive connections
+            price_cache_ttl: Seconds to cache price responses (/crypto/*)
+            feed_cache_ttl: Seconds to cache the other, slower-moving responses
         """
         self.api_key_id = api_key_id
         self.api_key_secret = api_key_secret
         self.base_url = base_url.rstrip('/')
-        self.session = requests.Session()
-        self.session.headers.update({
+        self.headers = {
             'api-key-id': api_key_id,
             'api-key-secret': api_key_secret,
             'Content-Type': 'application/json',
             'Accept': 'application/json'
-        })
+        }
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections
+        )
+        self._client: Optional[httpx.AsyncClient] = None
+        self._client_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._price_cache = TTLCache(maxsize=1024, ttl=price_cache_ttl)
+        self._feed_cache = TTLCache(maxsize=256, ttl=feed_cache_ttl)
+        # Last ETag and decoded body per GET, used for conditional revalidation
+        self._etags = LRUCache(maxsize=1024)
+        
+        # Resolve absolute URLs and cache assignments once instead of per call
+        self._endpoints = {name: f"{self.base_url}{path}" for name, path in ENDPOINTS.items()}
+        self._caches = {
+            name: self._price_cache if name in PRICE_ENDPOINTS else self._feed_cache
+            for name in ENDPOINTS
+        }
+    
+    def _get_client(self) -> httpx.AsyncClient:
+        """
+        Return the shared AsyncClient, creating it on first use.
+        
+        Connections are bound to the event loop they were opened on, so a new
+        client is created if the client is used from a different loop
+        (e.g. after switching between async calls and synchronous tool calls,
+        which share one background loop). The previous client is closed on its
+        own loop if that loop is still running.
+        """
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client_loop is not loop:
+            old_client, old_loop = self._client, self._client_loop
+            if old_client is not None and old_loop is not None and old_loop.is_running() and not old_loop.is_closed():
+                asyncio.run_coroutine_threadsafe(old_client.aclose(), old_loop)
+            self._client = httpx.AsyncClient(
+                http2=True,
+                limits=self.limits,
+                headers=self.headers
+            )
+            self._client_loop = loop
+        return self._client
     
-    def _make_request(self, method: str, endpoint: str, params: Optional[Dict[str, Any]] = None, 
+    async def aclose(self) -> None:
+        """
+        Close the underlying HTTP connection pool.
+        """
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            self._client_loop = None
+    
+    async def _make_request(self, method: str, endpoint: str, params: Optional[Dict[str, Any]] = None, 
                      data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
         Make a request to the HashScope API.
@@ -48,160 +157,371 @@ class HashScopeClient:
             The API response as a dictionary
         """
         url = f"{self.base_url}/{endpoint.lstrip('/')}"
+        return await self._request(method, url, params=params, data=data)
+    
+    async def _send(self, method: str, url: str, params: Optional[Dict[str, Any]] = None,
+                    data: Optional[Dict[str, Any]] = None,
+                    headers: Optional[Dict[str, str]] = None) -> httpx.Response:
+        """
+        Send a request to an absolute URL.
+        
+        Args:
+            method: The HTTP method to use
+            url: The absolute request URL
+            params: Query parameters
+            data: Request body data
+            headers: Extra per-request headers
+            
+        Returns:
+            The raw response (2xx, or 304 for conditional requests)
+        """
+        method = method.upper()
+        if method not in HTTP_METHODS:
+            raise ValueError(f"Unsupported HTTP method: {method}")
+        
+        # Content-Type: application/json is already part of the default headers
+        content = orjson.dumps(data) if data is not None else None
         
         try:
-            if method.lower() == 'get':
-                response = self.session.get(url, params=params)
-            elif method.lower() == 'post':
-                response = self.session.post(url, params=params, json=data)
-            elif method.lower() == 'put':
-                response = self.session.put(url, params=params, json=data)
-            elif method.lower() == 'delete':
-                response = self.session.delete(url, params=params, json=data)
-            else:
-                raise ValueError(f"Unsupported HTTP method: {method}")
+            response = await self._get_client().request(method, url, params=params, content=content,
+                                                        headers=headers)
+            if response.status_code != 304:
+                response.raise_for_status()
+            return response
+        except httpx.HTTPStatusError as e:
+            try:
+                error_data = orjson.loads(e.response.content)
+                error_message = error_data.get('detail', str(e))
+            except (ValueError, AttributeError):
+                error_message = e.response.text or str(e)
             
-            response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
-            if hasattr(e, 'response') and e.response is not None:
-                try:
-                    error_data = e.response.json()
-                    error_message = error_data.get('detail', str(e))
-                except ValueError:
-                    error_message = e.response.text or str(e)
-            else:
-                error_message = str(e)
+            raise Exception(f"HashScope API error: {error_message}")
+        except httpx.HTTPError as e:
+            raise Exception(f"HashScope API error: {str(e)}")
+    
+    async def _request(self, method: str, url: str, params: Optional[Dict[str, Any]] = None,
+                       data: Optional[Dict[str, Any]] = None) -> Any:
+        """
+        Send a request to an absolute URL and decode the JSON response.
+        
+        Args:
+            method: The HTTP method to use
+            url: The absolute request URL
+            params: Query parameters
+            data: Request body data
+            
+        Returns:
+            The decoded API response
+        """
+        response = await self._send(method, url, params=params, data=data)
+        return orjson.loads(response.content)
+    
+    async def _get(self, name: str, params: Optional[Dict[str, Any]] = None) -> Any:
+        """
+        Make a cached GET request to a known HashScope API endpoint.
+        
+        Args:
+            name: The symbolic endpoint name (a key of ``ENDPOINTS``)
+            params: Query parameters
             
+        Returns:
+            The API response, served from the TTL cache when still fresh
+        """
+        cache = self._caches[name]
+        key = (name, tuple(sorted(params.items())) if params else ())
+        
+        try:
+            return cache[key]
+        except KeyError:
+            pass
+        
+        validator = self._etags.get(key)
+        headers = {'If-None-Match': validator[0]} if validator else None
+        response = await self._send('GET', self._endpoints[name], params=params, headers=headers)
+        
+        if response.status_code == 304 and validator:
+            result = validator[1]
+        else:
+            result = orjson.loads(response.content)
+            etag = response.headers.get('etag')
+            if etag:
+                self._etags[key] = (etag, result)
+        
+        cache[key] = result
+        return result
+    
+    async def iter_items(self, name: str, params: Optional[Dict[str, Any]] = None,
+                         take: Optional[int] = None) -> AsyncIterator[Any]:
+        """
+        Stream the items of a list endpoint without materialising the whole response.
+        
+        The body is parsed incrementally and the connection is released as soon as
+        ``take`` items have been read. Responses are not cached.
+        
+        Args:
+            name: The symbolic endpoint name (a key of ``ENDPOINTS``)
+            params: Query parameters
+            take: Stop after this many items (all items if omitted)
+            
+        Yields:
+            The decoded items of the top-level JSON array
+        """
+        if take is not None and take <= 0:
+            return
+        
+        try:
+            async with self._get_client().stream('GET', self._endpoints[name], params=params) as response:
+                if response.is_error:
+                    await response.aread()
+                    response.raise_for_status()
+                
+                count = 0
+                async for item in ijson.items_async(_ByteStreamReader(response.aiter_bytes()), 'item',
+                                                    use_float=True):
+                    yield item
+                    count += 1
+                    if take is not None and count >= take:
+                        break
+        except httpx.HTTPStatusError as e:
+            try:
+                error_message = orjson.loads(e.response.content).get('detail', str(e))
+            except (ValueError, AttributeError):
+                error_message = e.response.text or str(e)
             raise Exception(f"HashScope API error: {error_message}")
+        except httpx.HTTPError as e:
+            raise Exception(f"HashScope API error: {str(e)}")
+    
+    @staticmethod
+    def _precision_params(precision: Optional[int]) -> Optional[Dict[str, int]]:
+        """
+        Build the ``precision=`` query parameter that asks the server to round price values.
+        """
+        return {'precision': precision} if precision is not None else None
+    
+    @staticmethod
+    def _list_params(fields: Optional[Sequence[str]], limit: Optional[int]) -> Optional[Dict[str, Any]]:
+        """
+        Build the ``fields=`` (sparse fieldset) and ``limit=`` query parameters for a list request.
+        """
+        params = {}
+        if fields:
+            params['fields'] = ','.join(fields)
+        if limit is not None:
+            params['limit'] = limit
+        return params or None
+    
+    async def get_many(self, calls: List[Tuple[str, Optional[Dict[str, Any]]]]) -> List[Union[Any, Exception]]:
+        """
+        Issue several GET requests concurrently over the shared connection pool.
+        
+        Args:
+            calls: A list of (endpoint name, params) tuples, e.g. ``[('btc_usd', None)]``
+            
+        Returns:
+            The responses in the same order as ``calls``. A failed request yields
+            its exception in place of the response instead of failing the batch.
+        """
+        return await asyncio.gather(
+            *(self._get(name, params) for name, params in calls),
+            return_exceptions=True
+        )
     
     # Crypto Price API
-    def get_btc_usd(self) -> Dict[str, Any]:
+    async def get_btc_usd(self, precision: Optional[int] = DEFAULT_PRECISION) -> Dict[str, Any]:
         """
         Get the current BTC price in USD from Binance.
         
+        Args:
+            precision: Significant digits for price values (full precision if None)
+        
         Returns:
             The current BTC/USD price data
         """
-        return self._make_request('get', '/crypto/btc/usd')
+        return await self._get('btc_usd', self._precision_params(precision))
     
-    def get_btc_krw(self) -> Dict[str, Any]:
+    async def get_btc_krw(self, precision: Optional[int] = DEFAULT_PRECISION) -> Dict[str, Any]:
         """
         Get the current BTC price in KRW from Upbit.
         
+        Args:
+            precision: Significant digits for price values (full precision if None)
+        
         Returns:
             The current BTC/KRW price data
         """
-        return self._make_request('get', '/crypto/btc/krw')
+        return await self._get('btc_krw', self._precision_params(precision))
     
-    def get_usdt_krw(self) -> Dict[str, Any]:
+    async def get_usdt_krw(self, precision: Optional[int] = DEFAULT_PRECISION) -> Dict[str, Any]:
         """
         Get the current USDT price in KRW from Upbit.
         
+        Args:
+            precision: Significant digits for price values (full precision if None)
+        
         Returns:
             The current USDT/KRW price data
         """
-        return self._make_request('get', '/crypto/usdt/krw')
+        return await self._get('usdt_krw', self._precision_params(precision))
     
-    def get_kimchi_premium(self) -> Dict[str, Any]:
+    async def get_kimchi_premium(self, precision: Optional[int] = DEFAULT_PRECISION) -> Dict[str, Any]:
         """
         Get the kimchi premium percentage between Korean and global markets.
         
+        Args:
+            precision: Significant digits for price values (full precision if None)
+        
         Returns:
             The current kimchi premium data
         """
-        return self._make_request('get', '/crypto/kimchi-premium')
+        return await self._get('kimchi_premium', self._precision_params(precision))
+    
+    async def get_crypto_snapshot(self, precision: Optional[int] = DEFAULT_PRECISION
+                                  ) -> Dict[str, Union[Dict[str, Any], Exception]]:
+        """
+        Get BTC/USD, BTC/KRW, USDT/KRW and the kimchi premium in one concurrent batch.
+        
+        Args:
+            precision: Significant digits for price values (full precision if None)
+        
+        Returns:
+            A dictionary keyed by ``btc_usd``, ``btc_krw``, ``usdt_krw`` and
+            ``kimchi_premium``. Entries whose request failed hold the exception.
+        """
+        names = ('btc_usd', 'btc_krw', 'usdt_krw', 'kimchi_premium')
+        params = self._precision_params(precision)
+        results = await self.get_many([(name, params) for name in names])
+        return dict(zip(names, results))
     
     # Social Media API
-    def get_trump_posts(self) -> Dict[str, Any]:
+    async def get_trump_posts(self, fields: Optional[Sequence[str]] = None,
+                              limit: Optional[int] = None) -> Dict[str, Any]:
         """
         Get Donald Trump's latest posts from Truth Social.
         
+        Args:
+            fields: Only return these keys for each item (all keys if omitted)
+            limit: Maximum number of items to return (all items if omitted)
+        
         Returns:
             Latest posts from Donald Trump
         """
-        return self._make_request('get', '/social/trump')
+        return await self._get('trump_posts', self._list_params(fields, limit))
     
-    def get_elon_posts(self) -> Dict[str, Any]:
+    async def get_elon_posts(self, fields: Optional[Sequence[str]] = None,
+                             limit: Optional[int] = None) -> Dict[str, Any]:
         """
         Get Elon Musk's latest posts from X (Twitter).
         
+        Args:
+            fields: Only return these keys for each item (all keys if omitted)
+            limit: Maximum number of items to return (all items if omitted)
+        
         Returns:
             Latest posts from Elon Musk
         """
-        return self._make_request('get', '/social/elon')
+        return await self._get('elon_posts', self._list_params(fields, limit))
     
-    def get_x_trends(self) -> Dict[str, Any]:
+    async def get_x_trends(self, fields: Optional[Sequence[str]] = None,
+                           limit: Optional[int] = None) -> Dict[str, Any]:
         """
         Get current trending topics on X (Twitter).
         
+        Args:
+            fields: Only return these keys for each item (all keys if omitted)
+            limit: Maximum number of items to return (all items if omitted)
+        
         Returns:
             Current trending topics on X
         """
-        return self._make_request('get', '/social/x/trends')
+        return await self._get('x_trends', self._list_params(fields, limit))
     
     # Derivatives Market API
-    def get_funding_rates(self) -> Dict[str, Any]:
+    async def get_funding_rates(self, fields: Optional[Sequence[str]] = None,
+                                limit: Optional[int] = None) -> Dict[str, Any]:
         """
         Get current funding rates for major cryptocurrency futures markets.
         
+        Args:
+            fields: Only return these keys for each item (all keys if omitted)
+            limit: Maximum number of items to return (all items if omitted)
+        
         Returns:
             Current funding rates data
         """
-        return self._make_request('get', '/derivatives/funding-rates')
+        return await self._get('funding_rates', self._list_params(fields, limit))
     
-    def get_open_interest(self) -> Dict[str, Any]:
+    async def get_open_interest(self, fields: Optional[Sequence[str]] = None,
+                                limit: Optional[int] = None) -> Dict[str, Any]:
         """
         Get open interest ratios for major cryptocurrency derivatives.
         
+        Args:
+            fields: Only return these keys for each item (all keys if omitted)
+            limit: Maximum number of items to return (all items if omitted)
+        
         Returns:
             Open interest data
         """
-        return self._make_request('get', '/derivatives/open-interest')
+        return await self._get('open_interest', self._list_params(fields, limit))
     
     # Blockchain Projects API
-    def get_hsk_updates(self) -> Dict[str, Any]:
+    async def get_hsk_updates(self, fields: Optional[Sequence[str]] = None,
+                              limit: Optional[int] = None) -> Dict[str, Any]:
         """
         Get latest updates and developments from HashKey Chain.
         
+        Args:
+            fields: Only return these keys for each item (all keys if omitted)
+            limit: Maximum number of items to return (all items if omitted)
+        
         Returns:
             Latest updates from HashKey Chain
         """
-        return self._make_request('get', '/projects/hsk')
+        return await self._get('hsk_updates', self._list_params(fields, limit))
     
-    def get_ethereum_standards(self) -> Dict[str, Any]:
+    async def get_ethereum_standards(self, fields: Optional[Sequence[str]] = None,
+                                     limit: Optional[int] = None) -> Dict[str, Any]:
         """
         Get information about new Ethereum standards and proposals.
         
+        Args:
+            fields: Only return these keys for each item (all keys if omitted)
+            limit: Maximum number of items to return (all items if omitted)
+        
         Returns:
             Information about Ethereum standards
         """
-        return self._make_request('get', '/projects/ethereum/standards')
+        return await self._get('ethereum_standards', self._list_params(fields, limit))
     
-    def get_solana_updates(self) -> Dict[str, Any]:
+    async def get_solana_updates(self, fields: Optional[Sequence[str]] = None,
+                                 limit: Optional[int] = None) -> Dict[str, Any]:
         """
         Get latest updates and developments from Solana blockchain.
         
+        Args:
+            fields: Only return these keys for each item (all keys if omitted)
+            limit: Maximum number of items to return (all items if omitted)
+        
         Returns:
             Latest updates from Solana blockchain
         """
-        return self._make_request('get', '/projects/solana')
+        return await self._get('solana_updates', self._list_params(fields, limit))
     
     # Open Source API
-    def get_bitcoin_activity(self) -> Dict[str, Any]:
+    async def get_bitcoin_activity(self) -> Dict[str, Any]:
         """
         Get latest pull requests, stars, and activities from Bitcoin Core repository.
         
         Returns:
             Latest activities from Bitcoin Core
         """
-        return self._make_request('get', '/opensource/bitcoin')
+        return await self._get('bitcoin_activity')
     
-    def get_ethereum_activity(self) -> Dict[str, Any]:
+    async def get_ethereum_activity(self) -> Dict[str, Any]:
         """
         Get latest pull requests, stars, and activities from Ethereum Core repositories.
         
         Returns:
             Latest activities from Ethereum Core
         """
-        return self._make_request('get', '/opensource/ethereum')
+        return await self._get('ethereum_activity')
@@ -4,11 +4,27 @@ HashScope LangChain Tools
 This module provides LangChain tools for interacting with the HashScope API.
 """
 
-from typing import Dict, Any, List, Optional
+import asyncio
+import threading
+from typing import Dict, Any, List, Optional, Callable, Awaitable
 from langchain.tools import BaseTool, StructuredTool, Tool
 from langchain.pydantic_v1 import BaseModel, Field
 from .hashscope_client import HashScopeClient
 
+# Repository star/fork/issue counts with thousands separators
+REPO_STATS_TEMPLATE = "- Stars: {stars:,}\n- Forks: {forks:,}\n- Open Issues: {open_issues:,}"
+
+# Maximum number of list items a tool formats; the server is asked for no more than this
+MAX_ITEMS = 5
+
+# Keys each tool formats; requested as sparse fieldsets so unused fields are not transferred
+POST_FIELDS = ("timestamp", "content", "likes", "reposts")
+TREND_FIELDS = ("name", "tweet_count", "category")
+FUNDING_RATE_FIELDS = ("symbol", "exchange", "rate", "next_funding_time", "interval")
+OPEN_INTEREST_FIELDS = ("symbol", "exchange", "open_interest", "open_interest_usd", "change_24h")
+PROJECT_UPDATE_FIELDS = ("title", "date", "type", "description")
+ETHEREUM_STANDARD_FIELDS = ("eip_number", "title", "status", "type", "category", "author", "created", "description")
+
 class HashScopeToolkit:
     """
     Toolkit for HashScope API tools.
@@ -37,6 +53,7 @@ class HashScopeToolkit:
             get_btc_krw_tool(self.client),
             get_usdt_krw_tool(self.client),
             get_kimchi_premium_tool(self.client),
+            get_crypto_snapshot_tool(self.client),
             get_trump_posts_tool(self.client),
             get_elon_posts_tool(self.client),
             get_x_trends_tool(self.client),
@@ -48,21 +65,56 @@ class HashScopeToolkit:
             get_bitcoin_activity_tool(self.client),
             get_ethereum_activity_tool(self.client),
         ]
+    
+    async def aclose(self) -> None:
+        """
+        Close the HTTP connection pool shared by the toolkit's tools.
+        """
+        await self.client.aclose()
+
+
+_sync_loop: Optional[asyncio.AbstractEventLoop] = None
+_sync_loop_lock = threading.Lock()
+
+
+def _get_sync_loop() -> asyncio.AbstractEventLoop:
+    """
+    Return the long-lived event loop that runs synchronous tool calls, starting it on first use.
+    
+    Running every synchronous call on the same background loop lets the client keep
+    one connection pool instead of opening a new one per call.
+    """
+    global _sync_loop
+    with _sync_loop_lock:
+        if _sync_loop is None:
+            _sync_loop = asyncio.new_event_loop()
+            threading.Thread(target=_sync_loop.run_forever, name="hashscope-tools", daemon=True).start()
+        return _sync_loop
+
+
+def _run_sync(coroutine: Callable[[], Awaitable[str]]) -> Callable[[], str]:
+    """Wrap an async tool body so the tool can also be invoked synchronously."""
+    
+    def _run() -> str:
+        return asyncio.run_coroutine_threadsafe(coroutine(), _get_sync_loop()).result()
+    
+    return _run
 
 
 # Tool Definitions for Cryptocurrency Data
 def get_btc_usd_tool(client: HashScopeClient) -> BaseTool:
     """Create a tool for getting BTC/USD price."""
     
-    def _run() -> str:
+    async def _arun() -> str:
         try:
-            result = client.get_btc_usd()
+            result = await client.get_btc_usd()
             return f"Current price of BTC is {result['price']} USD. Last updated: {result['timestamp']}"
         except Exception as e:
             return f"Error fetching BTC/USD price: {str(e)}"
     
     return Tool.from_function(
-        func=_run,
+        func=_run_sync(_arun),
+        coroutine=_arun,
         name="get_btc_usd_price",
         description="Get the current BTC price in USD from Binance.",
     )
@@ -70,15 +122,16 @@ def get_btc_usd_tool(client: HashScopeClient) -> BaseTool:
 def get_btc_krw_tool(client: HashScopeClient) -> BaseTool:
     """Create a tool for getting BTC/KRW price."""
     
-    def _run() -> str:
+    async def _arun() -> str:
         try:
-            result = client.get_btc_krw()
+            result = await client.get_btc_krw()
             return f"Current price of BTC is {result['price']} KRW. Last updated: {result['timestamp']}"
         except Exception as e:
             return f"Error fetching BTC/KRW price: {str(e)}"
     
     return Tool.from_function(
-        func=_run,
+        func=_run_sync(_arun),
+        coroutine=_arun,
         name="get_btc_krw_price",
         description="Get the current BTC price in KRW from Upbit.",
     )
@@ -86,15 +139,16 @@ def get_btc_krw_tool(client: HashScopeClient) -> BaseTool:
 def get_usdt_krw_tool(client: HashScopeClient) -> BaseTool:
     """Create a tool for getting USDT/KRW price."""
     
-    def _run() -> str:
+    async def _arun() -> str:
         try:
-            result = client.get_usdt_krw()
+            result = await client.get_usdt_krw()
             return f"Current price of USDT is {result['price']} KRW. Last updated: {result['timestamp']}"
         except Exception as e:
             return f"Error fetching USDT/KRW price: {str(e)}"
     
     return Tool.from_function(
-        func=_run,
+        func=_run_sync(_arun),
+        coroutine=_arun,
         name="get_usdt_krw_price",
         description="Get the current USDT price in KRW from Upbit.",
     )
@@ -102,38 +156,72 @@ def get_usdt_krw_tool(client: HashScopeClient) -> BaseTool:
 def get_kimchi_premium_tool(client: HashScopeClient) -> BaseTool:
     """Create a tool for getting kimchi premium."""
     
-    def _run() -> str:
+    async def _arun() -> str:
         try:
-            result = client.get_kimchi_premium()
+            result = await client.get_kimchi_premium()
             return f"Current kimchi premium is {result['premium']}%. BTC/USD: ${result['btc_usd']}, BTC/KRW: ₩{result['btc_krw']}, USDT/KRW: ₩{result['usdt_krw']}"
         except Exception as e:
             return f"Error fetching kimchi premium: {str(e)}"
     
     return Tool.from_function(
-        func=_run,
+        func=_run_sync(_arun),
+        coroutine=_arun,
         name="get_kimchi_premium",
         description="Get the kimchi premium percentage between Korean and global markets.",
     )
 
+def get_crypto_snapshot_tool(client: HashScopeClient) -> BaseTool:
+    """Create a tool for getting BTC/USDT prices and kimchi premium in one call."""
+    
+    async def _arun() -> str:
+        try:
+            snapshot = await client.get_crypto_snapshot()
+            parts = ["Current crypto market snapshot:", ""]
+            
+            for label, key, currency in (("BTC/USD", "btc_usd", "USD"), ("BTC/KRW", "btc_krw", "KRW"), ("USDT/KRW", "usdt_krw", "KRW")):
+                result = snapshot[key]
+                if isinstance(result, Exception):
+                    parts.append(f"- {label}: unavailable ({result})")
+                else:
+                    parts.append(f"- {label}: {result['price']} {currency}")
+            
+            premium = snapshot["kimchi_premium"]
+            if isinstance(premium, Exception):
+                parts.append(f"- Kimchi premium: unavailable ({premium})")
+            else:
+                parts.append(f"- Kimchi premium: {premium['premium_percentage']}% (USD/KRW: {premium['exchange_rate']})")
+            
+            return "\n".join(parts)
+        except Exception as e:
+            return f"Error fetching crypto snapshot: {str(e)}"
+    
+    return Tool.from_function(
+        func=_run_sync(_arun),
+        coroutine=_arun,
+        name="get_crypto_snapshot",
+        description="Get BTC/USD, BTC/KRW, USDT/KRW prices and the kimchi premium in a single call. Prefer this over calling the individual price tools one by one.",
+    )
+
 # Tool Definitions for Social Media
 def get_trump_posts_tool(client: HashScopeClient) -> BaseTool:
     """Create a tool for getting Trump's latest posts."""
     
-    def _run() -> str:
+    async def _arun() -> str:
         try:
-            posts = client.get_trump_posts()
-            response = "Donald Trump's latest posts from Truth Social:\n\n"
+            posts = await client.get_trump_posts(fields=POST_FIELDS, limit=MAX_ITEMS)
+            parts = ["Donald Trump's latest posts from Truth Social:", ""]
             
             for i, post in enumerate(posts, 1):
-                response += f"{i}. [{post['timestamp']}] {post['content']}\n"
-                response += f"   Likes: {post['likes']}, Reposts: {post['reposts']}\n\n"
+                parts.append(f"{i}. [{post['timestamp']}] {post['content']}")
+                parts.append(f"   Likes: {post['likes']}, Reposts: {post['reposts']}\n")
             
-            return response
+            return "\n".join(parts)
         except Exception as e:
             return f"Error fetching Trump's posts: {str(e)}"
     
     return Tool.from_function(
-        func=_run,
+        func=_run_sync(_arun),
+        coroutine=_arun,
         name="get_trump_posts",
         description="Get Donald Trump's latest posts from Truth Social.",
     )
@@ -141,21 +229,22 @@ def get_trump_posts_tool(client: HashScopeClient) -> BaseTool:
 def get_elon_posts_tool(client: HashScopeClient) -> BaseTool:
     """Create a tool for getting Elon Musk's latest posts."""
     
-    def _run() -> str:
+    async def _arun() -> str:
         try:
-            posts = client.get_elon_posts()
-            response = "Elon Musk's latest posts from X (Twitter):\n\n"
+            posts = await client.get_elon_posts(fields=POST_FIELDS, limit=MAX_ITEMS)
+            parts = ["Elon Musk's latest posts from X (Twitter):", ""]
             
             for i, post in enumerate(posts, 1):
-                response += f"{i}. [{post['timestamp']}] {post['content']}\n"
-                response += f"   Likes: {post['likes']}, Reposts: {post['reposts']}\n\n"
+                parts.append(f"{i}. [{post['timestamp']}] {post['content']}")
+                parts.append(f"   Likes: {post['likes']}, Reposts: {post['reposts']}\n")
             
-            return response
+            return "\n".join(parts)
         except Exception as e:
             return f"Error fetching Elon Musk's posts: {str(e)}"
     
     return Tool.from_function(
-        func=_run,
+        func=_run_sync(_arun),
+        coroutine=_arun,
         name="get_elon_posts",
         description="Get Elon Musk's latest posts from X (Twitter).",
     )
@@ -163,21 +252,22 @@ def get_elon_posts_tool(client: HashScopeClient) -> BaseTool:
 def get_x_trends_tool(client: HashScopeClient) -> BaseTool:
     """Create a tool for getting X (Twitter) trends."""
     
-    def _run() -> str:
+    async def _arun() -> str:
         try:
-            trends = client.get_x_trends()
-            response = "Current trending topics on X (Twitter):\n\n"
+            trends = await client.get_x_trends(fields=TREND_FIELDS, limit=MAX_ITEMS)
+            parts = ["Current trending topics on X (Twitter):", ""]
             
             for i, trend in enumerate(trends, 1):
-                response += f"{i}. {trend['name']} - {trend['tweet_count']} tweets\n"
-                response += f"   Category: {trend['category']}\n\n"
+                parts.append(f"{i}. {trend['name']} - {trend['tweet_count']} tweets")
+                parts.append(f"   Category: {trend['category']}\n")
             
-            return response
+            return "\n".join(parts)
         except Exception as e:
             return f"Error fetching X trends: {str(e)}"
     
     return Tool.from_function(
-        func=_run,
+        func=_run_sync(_arun),
+        coroutine=_arun,
         name="get_x_trends",
         description="Get current trending topics on X (Twitter).",
     )
@@ -186,21 +276,22 @@ def get_x_trends_tool(client: HashScopeClient) -> BaseTool:
 def get_funding_rates_tool(client: HashScopeClient) -> BaseTool:
     """Create a tool for getting funding rates."""
     
-    def _run() -> str:
+    async def _arun() -> str:
         try:
-            rates = client.get_funding_rates()
-            response = "Current funding rates for major cryptocurrency futures markets:\n\n"
+            rates = await client.get_funding_rates(fields=FUNDING_RATE_FIELDS, limit=MAX_ITEMS)
+            parts = ["Current funding rates for major cryptocurrency futures markets:", ""]
             
             for i, rate in enumerate(rates, 1):
-                response += f"{i}. {rate['symbol']} on {rate['exchange']}: {rate['rate']*100:.4f}%\n"
-                response += f"   Next funding time: {rate['next_funding_time']}, Interval: {rate['interval']}\n\n"
+                parts.append(f"{i}. {rate['symbol']} on {rate['exchange']}: {rate['rate']*100:.4f}%")
+                parts.append(f"   Next funding time: {rate['next_funding_time']}, Interval: {rate['interval']}\n")
             
-            return response
+            return "\n".join(parts)
         except Exception as e:
             return f"Error fetching funding rates: {str(e)}"
     
     return Tool.from_function(
-        func=_run,
+        func=_run_sync(_arun),
+        coroutine=_arun,
         name="get_funding_rates",
         description="Get current funding rates for major cryptocurrency futures markets.",
     )
@@ -208,22 +299,23 @@ def get_funding_rates_tool(client: HashScopeClient) -> BaseTool:
 def get_open_interest_tool(client: HashScopeClient) -> BaseTool:
     """Create a tool for getting open interest data."""
     
-    def _run() -> str:
+    async def _arun() -> str:
         try:
-            data = client.get_open_interest()
-            response = "Open interest ratios for major cryptocurrency derivatives:\n\n"
+            data = await client.get_open_interest(fields=OPEN_INTEREST_FIELDS, limit=MAX_ITEMS)
+            parts = ["Open interest ratios for major cryptocurrency derivatives:", ""]
             
             for i, item in enumerate(data, 1):
-                response += f"{i}. {item['symbol']} on {item['exchange']}:\n"
-                response += f"   Open Interest: {item['open_interest']} coins (${item['open_interest_usd']:,.2f})\n"
-                response += f"   24h Change: {item['change_24h']}%\n\n"
+                parts.append(f"{i}. {item['symbol']} on {item['exchange']}:")
+                parts.append(f"   Open Interest: {item['open_interest']} coins (${item['open_interest_usd']:,.2f})")
+                parts.append(f"   24h Change: {item['change_24h']}%\n")
             
-            return response
+            return "\n".join(parts)
         except Exception as e:
             return f"Error fetching open interest data: {str(e)}"
     
     return Tool.from_function(
-        func=_run,
+        func=_run_sync(_arun),
+        coroutine=_arun,
         name="get_open_interest",
         description="Get open interest ratios for major cryptocurrency derivatives.",
     )
@@ -232,23 +324,24 @@ def get_open_interest_tool(client: HashScopeClient) -> BaseTool:
 def get_hsk_updates_tool(client: HashScopeClient) -> BaseTool:
     """Create a tool for getting HashKey Chain updates."""
     
-    def _run() -> str:
+    async def _arun() -> str:
         try:
-            updates = client.get_hsk_updates()
-            response = "Latest updates and developments from HashKey Chain:\n\n"
+            updates = await client.get_hsk_updates(fields=PROJECT_UPDATE_FIELDS, limit=MAX_ITEMS)
+            parts = ["Latest updates and developments from HashKey Chain:", ""]
             
             for i, update in enumerate(updates, 1):
-                response += f"{i}. {update['title']}\n"
-                response += f"   Date: {update['date']}\n"
-                response += f"   Type: {update['type']}\n"
-                response += f"   Description: {update['description']}\n\n"
+                parts.append(f"{i}. {update['title']}")
+                parts.append(f"   Date: {update['date']}")
+                parts.append(f"   Type: {update['type']}")
+                parts.append(f"   Description: {update['description']}\n")
             
-            return response
+            return "\n".join(parts)
         except Exception as e:
             return f"Error fetching HSK updates: {str(e)}"
     
     return Tool.from_function(
-        func=_run,
+        func=_run_sync(_arun),
+        coroutine=_arun,
         name="get_hsk_updates",
         description="Get latest updates and developments from HashKey Chain.",
     )
@@ -256,23 +349,24 @@ def get_hsk_updates_tool(client: HashScopeClient) -> BaseTool:
 def get_ethereum_standards_tool(client: HashScopeClient) -> BaseTool:
     """Create a tool for getting Ethereum standards information."""
     
-    def _run() -> str:
+    async def _arun() -> str:
         try:
-            standards = client.get_ethereum_standards()
-            response = "Information about new Ethereum standards and proposals:\n\n"
+            standards = await client.get_ethereum_standards(fields=ETHEREUM_STANDARD_FIELDS, limit=MAX_ITEMS)
+            parts = ["Information about new Ethereum standards and proposals:", ""]
             
             for i, standard in enumerate(standards, 1):
-                response += f"{i}. EIP-{standard['eip_number']}: {standard['title']}\n"
-                response += f"   Status: {standard['status']}, Type: {standard['type']}, Category: {standard['category']}\n"
-                response += f"   Author: {standard['author']}, Created: {standard['created']}\n"
-                response += f"   Description: {standard['description']}\n\n"
+                parts.append(f"{i}. EIP-{standard['eip_number']}: {standard['title']}")
+                parts.append(f"   Status: {standard['status']}, Type: {standard['type']}, Category: {standard['category']}")
+                parts.append(f"   Author: {standard['author']}, Created: {standard['created']}")
+                parts.append(f"   Description: {standard['description']}\n")
             
-            return response
+            return "\n".join(parts)
         except Exception as e:
             return f"Error fetching Ethereum standards: {str(e)}"
     
     return Tool.from_function(
-        func=_run,
+        func=_run_sync(_arun),
+        coroutine=_arun,
         name="get_ethereum_standards",
         description="Get information about new Ethereum standards and proposals.",
     )
@@ -280,23 +374,24 @@ def get_ethereum_standards_tool(client: HashScopeClient) -> BaseTool:
 def get_solana_updates_tool(client: HashScopeClient) -> BaseTool:
     """Create a tool for getting Solana updates."""
     
-    def _run() -> str:
+    async def _arun() -> str:
         try:
-            updates = client.get_solana_updates()
-            response = "Latest updates and developments from Solana blockchain:\n\n"
+            updates = await client.get_solana_updates(fields=PROJECT_UPDATE_FIELDS, limit=MAX_ITEMS)
+            parts = ["Latest updates and developments from Solana blockchain:", ""]
             
             for i, update in enumerate(updates, 1):
-                response += f"{i}. {update['title']}\n"
-                response += f"   Date: {update['date']}\n"
-                response += f"   Type: {update['type']}\n"
-                response += f"   Description: {update['description']}\n\n"
+                parts.append(f"{i}. {update['title']}")
+                parts.append(f"   Date: {update['date']}")
+                parts.append(f"   Type: {update['type']}")
+                parts.append(f"   Description: {update['description']}\n")
             
-            return response
+            return "\n".join(parts)
         except Exception as e:
             return f"Error fetching Solana updates: {str(e)}"
     
     return Tool.from_function(
-        func=_run,
+        func=_run_sync(_arun),
+        coroutine=_arun,
         name="get_solana_updates",
         description="Get latest updates and developments from Solana blockchain.",
     )
@@ -305,33 +400,35 @@ def get_solana_updates_tool(client: HashScopeClient) -> BaseTool:
 def get_bitcoin_activity_tool(client: HashScopeClient) -> BaseTool:
     """Create a tool for getting Bitcoin Core repository activity."""
     
-    def _run() -> str:
+    async def _arun() -> str:
         try:
-            activity = client.get_bitcoin_activity()
+            activity = await client.get_bitcoin_activity()
             stats = activity['stats']
             prs = activity['pull_requests']
             
-            response = "Latest activities from Bitcoin Core repository:\n\n"
-            response += f"Repository Stats:\n"
-            response += f"- Stars: {stats['stars']:,}\n"
-            response += f"- Forks: {stats['forks']:,}\n"
-            response += f"- Open Issues: {stats['open_issues']:,}\n"
-            response += f"- Last Commit: {stats['last_commit']}\n"
-            response += f"- Release Version: {stats['release_version']}\n\n"
-            
-            response += f"Recent Pull Requests:\n"
+            parts = [
+                "Latest activities from Bitcoin Core repository:",
+                "",
+                "Repository Stats:",
+                REPO_STATS_TEMPLATE.format_map(stats),
+                f"- Last Commit: {stats['last_commit']}",
+                f"- Release Version: {stats['release_version']}",
+                "",
+                "Recent Pull Requests:",
+            ]
             for i, pr in enumerate(prs, 1):
-                response += f"{i}. {pr['title']} (#{pr['id']})\n"
-                response += f"   Author: {pr['author']}, State: {pr['state']}\n"
-                response += f"   Created: {pr['created_at']}, Comments: {pr['comments']}\n"
-                response += f"   Changes: +{pr['additions']}, -{pr['deletions']}\n\n"
+                parts.append(f"{i}. {pr['title']} (#{pr['id']})")
+                parts.append(f"   Author: {pr['author']}, State: {pr['state']}")
+                parts.append(f"   Created: {pr['created_at']}, Comments: {pr['comments']}")
+                parts.append(f"   Changes: +{pr['additions']}, -{pr['deletions']}\n")
             
-            return response
+            return "\n".join(parts)
         except Exception as e:
             return f"Error fetching Bitcoin Core activity: {str(e)}"
     
     return Tool.from_function(
-        func=_run,
+        func=_run_sync(_arun),
+        coroutine=_arun,
         name="get_bitcoin_activity",
         description="Get latest pull requests, stars, and activities from Bitcoin Core repository.",
     )
@@ -339,44 +436,31 @@ def get_bitcoin_activity_tool(client: HashScopeClient) -> BaseTool:
 def get_ethereum_activity_tool(client: HashScopeClient) -> BaseTool:
     """Create a tool for getting Ethereum Core repositories activity."""
     
-    def _run() -> str:
+    async def _arun() -> str:
         try:
-            activity = client.get_ethereum_activity()
-            
-            response = "Latest activities from Ethereum Core repositories:\n\n"
-            
-            # Go-Ethereum
-            go_eth = activity['go-ethereum']
-            response += f"Go-Ethereum Repository:\n"
-            response += f"- Stars: {go_eth['stats']['stars']:,}\n"
-            response += f"- Forks: {go_eth['stats']['forks']:,}\n"
-            response += f"- Open Issues: {go_eth['stats']['open_issues']:,}\n"
-            response += f"- Release Version: {go_eth['stats']['release_version']}\n\n"
-            
-            response += f"Recent Pull Requests:\n"
-            for i, pr in enumerate(go_eth['pull_requests'], 1):
-                response += f"{i}. {pr['title']} (#{pr['id']})\n"
-                response += f"   Author: {pr['author']}, State: {pr['state']}\n\n"
+            activity = await client.get_ethereum_activity()
             
-            # Consensus-Specs
-            cons_specs = activity['consensus-specs']
-            response += f"\nConsensus-Specs Repository:\n"
-            response += f"- Stars: {cons_specs['stats']['stars']:,}\n"
-            response += f"- Forks: {cons_specs['stats']['forks']:,}\n"
-            response += f"- Open Issues: {cons_specs['stats']['open_issues']:,}\n"
-            response += f"- Release Version: {cons_specs['stats']['release_version']}\n\n"
+            parts = ["Latest activities from Ethereum Core repositories:", ""]
             
-            response += f"Recent Pull Requests:\n"
-            for i, pr in enumerate(cons_specs['pull_requests'], 1):
-                response += f"{i}. {pr['title']} (#{pr['id']})\n"
-                response += f"   Author: {pr['author']}, State: {pr['state']}\n\n"
+            for title, key in (("Go-Ethereum", "go-ethereum"), ("Consensus-Specs", "consensus-specs")):
+                repo = activity[key]
+                parts.append(f"{title} Repository:")
+                parts.append(REPO_STATS_TEMPLATE.format_map(repo['stats']))
+                parts.append(f"- Release Version: {repo['stats']['release_version']}")
+                parts.append("")
+                
+                parts.append("Recent Pull Requests:")
+                for i, pr in enumerate(repo['pull_requests'], 1):
+                    parts.append(f"{i}. {pr['title']} (#{pr['id']})")
+                    parts.append(f"   Author: {pr['author']}, State: {pr['state']}\n")
             
-            return response
+            return "\n".join(parts)
         except Exception as e:
             return f"Error fetching Ethereum Core activity: {str(e)}"
     
     return Tool.from_function(
-        func=_run,
+        func=_run_sync(_arun),
+        coroutine=_arun,
         name="get_ethereum_activity",
         description="Get latest pull requests, stars, and activities from Ethereum Core repositories.",
     )
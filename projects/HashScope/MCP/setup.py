@@ -12,7 +12,10 @@ setup(
     author_email="info@hashscope.io",
     packages=find_packages(),
     install_requires=[
-        "requests>=2.25.0",
+        "httpx[http2]>=0.24.0",
+        "cachetools>=5.0.0",
+        "orjson>=3.8.0",
+        "ijson>=3.2.0",
         "langchain>=0.0.267",
         "pydantic>=2.0.0",
     ],
@@ -1,36 +1,147 @@
+from anyio import from_thread
 from fastapi import Depends, HTTPException, Header, status, Request
-from sqlalchemy.orm import Session
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime
 from typing import Optional
+from dataclasses import dataclass
 import hashlib
+import hmac
+import math
+import threading
 import uuid
 import os
+import re
+import secrets
 from dotenv import load_dotenv
+from cachetools import TTLCache
 
-from app.database import get_db
+from app.database import SessionLocal, get_async_db
 from app.models import APIKey, APIUsage, User, Transaction
 from app.blockchain.contracts import deduct_for_usage
+from app.auth.usage import usage_buffer
+from app.utils.api_keys import API_KEY_PEPPER
+from app.utils.log import get_logger
+from app.utils.rate_limit import rate_limiter
 
 # .env 파일 로드
 load_dotenv()
 
-def verify_api_key(
-    api_key_id: str = Header(..., alias="api-key-id"),
-    api_key_secret: str = Header(..., alias="api-key-secret"),
-    request: Request = None,
-    db: Session = Depends(get_db)
-):
+logger = get_logger("api_key")
+
+# 수수료 수취 지갑 주소 - .env 파일에서 가져오거나 기본값 사용 (요청마다 환경 변수를 읽지 않도록 시작 시 한 번만 조회)
+FEE_RECIPIENT_ADDRESS = os.getenv("FEE_RECIPIENT_ADDRESS", "0xf91aAB71fC16dA79c8ACFAD67aF7C9b39588B246")
+
+# API 키 ID 형식 (utils/api_keys.py의 generate_api_key_pair: "hsk_" + 16바이트 hex)
+# 형식이 맞지 않는 ID는 캐시/DB 조회 없이 바로 거부
+_KEY_ID_PATTERN = re.compile(r"hsk_[0-9a-f]{32}")
+
+# 검증에 성공한 Secret 캐시 (key_id -> (프로세스 키로 계산한 Secret digest, secret_digest))
+# 반복 요청에서 pepper/SHA-256 해시 재계산을 생략하며, Secret 원문은 메모리에 보관하지 않음
+_PROCESS_KEY = secrets.token_bytes(32)
+_secret_ok = TTLCache(maxsize=10_000, ttl=300)
+_secret_ok_lock = threading.Lock()
+
+def _decode_secret_hash(secret_key_hash: str) -> Optional[bytes]:
+    """
+    DB에 hex 문자열로 저장된 Secret 해시를 32바이트 digest로 변환 (형식이 다르면 None)
+    """
+    try:
+        digest = bytes.fromhex(secret_key_hash)
+    except (TypeError, ValueError):
+        return None
+    return digest if len(digest) == hashlib.sha256().digest_size else None
+
+def _check_secret(api_key_id: str, api_key_secret: str, secret_digest: Optional[bytes]) -> bool:
     """
-    API 키 검증 함수 (ID와 Secret 모두 검증)
+    API 키 Secret 검증 (HMAC-SHA256 digest 상수 시간 비교, 성공 결과 캐시)
     
-    Args:
-        api_key_id (str): API 키 ID
-        api_key_secret (str): API 키 Secret
-        request (Request): 요청 객체 (경로 및 메서드 추적용)
-        db (Session): 데이터베이스 세션
-        
-    Returns:
-        APIKey: 검증된 API 키 객체
+    pepper 도입 이전에 발급된 키는 SHA-256 digest로 저장되어 있으므로 함께 허용합니다.
+    """
+    if secret_digest is None:
+        return False
+    
+    secret = api_key_secret.encode()
+    process_digest = hmac.digest(_PROCESS_KEY, secret, "sha256")
+    
+    with _secret_ok_lock:
+        cached = _secret_ok.get(api_key_id)
+    if cached is not None and cached[1] == secret_digest \
+            and hmac.compare_digest(cached[0], process_digest):
+        return True
+    
+    if not hmac.compare_digest(hmac.digest(API_KEY_PEPPER, secret, "sha256"), secret_digest) \
+            and not hmac.compare_digest(hashlib.sha256(secret).digest(), secret_digest):
+        return False
+    
+    with _secret_ok_lock:
+        _secret_ok[api_key_id] = (process_digest, secret_digest)
+    return True
+
+@dataclass(frozen=True)
+class APIKeySnapshot:
+    """
+    인증에 필요한 API 키 정보만 담은 읽기 전용 사본 (세션과 무관하게 캐시 가능)
+    """
+    id: int
+    key_id: str
+    user_wallet: str
+    secret_digest: Optional[bytes]
+    rate_limit_per_minute: int
+
+# API 키 조회 캐시 (key_id -> APIKeySnapshot)
+# 자주 쓰이는 키는 DB를 거치지 않고 인증 (삭제/생성 시 invalidate_api_key로 제거)
+_api_key_cache = TTLCache(maxsize=100_000, ttl=60)
+_api_key_cache_lock = threading.Lock()
+
+async def _load_api_key(db: AsyncSession, api_key_id: str) -> Optional[APIKeySnapshot]:
+    """
+    API 키 조회 (캐시 우선, 활성 키만 조회하며 없으면 None)
+    """
+    with _api_key_cache_lock:
+        snapshot = _api_key_cache.get(api_key_id)
+    if snapshot is not None:
+        return snapshot
+    
+    # 인증에 필요한 컬럼만 조회 (ORM 객체 생성 없음)
+    # 활성 키만 조회하여 PostgreSQL에서 부분 인덱스 ix_apikey_key_id_active 사용
+    result = await db.execute(
+        select(
+            APIKey.id,
+            APIKey.secret_key_hash,
+            APIKey.user_wallet,
+            APIKey.rate_limit_per_minute
+        ).where(APIKey.key_id == api_key_id, APIKey.is_active.is_(True))
+    )
+    row = result.first()
+    # 읽기 트랜잭션을 끝내 라우트가 외부 API/RPC를 기다리는 동안 DB 연결을 풀에 돌려줌
+    await db.commit()
+    if row is None:
+        return None
+    
+    snapshot = APIKeySnapshot(
+        id=row.id,
+        key_id=api_key_id,
+        user_wallet=row.user_wallet,
+        secret_digest=_decode_secret_hash(row.secret_key_hash),
+        rate_limit_per_minute=row.rate_limit_per_minute or 60
+    )
+    with _api_key_cache_lock:
+        _api_key_cache[api_key_id] = snapshot
+    return snapshot
+
+def invalidate_api_key(api_key_id: str):
+    """
+    API 키 변경(생성, 삭제, 비활성화 등) 시 캐시된 조회 결과와 Secret 검증 결과 제거
+    """
+    with _api_key_cache_lock:
+        _api_key_cache.pop(api_key_id, None)
+    with _secret_ok_lock:
+        _secret_ok.pop(api_key_id, None)
+
+async def _authenticate(api_key_id: str, api_key_secret: str, db: AsyncSession) -> APIKeySnapshot:
+    """
+    API 키 ID와 Secret을 검증하고 API 키 객체를 반환 (DB 쓰기 없음)
     """
     if not api_key_id or not api_key_secret:
         raise HTTPException(
@@ -38,160 +149,182 @@ def verify_api_key(
             detail="API 키 ID와 Secret이 모두 필요합니다"
         )
     
-    # 데이터베이스에서 API 키 조회
-    db_api_key = db.query(APIKey).filter(APIKey.key_id == api_key_id).first()
-    
-    if not db_api_key:
+    # 형식이 잘못된 API 키 ID는 조회하지 않음
+    if not _KEY_ID_PATTERN.fullmatch(api_key_id):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="유효하지 않은 API 키입니다"
         )
     
-    # Secret 키 검증
-    hashed_secret = hashlib.sha256(api_key_secret.encode()).hexdigest()
-    if db_api_key.secret_key_hash != hashed_secret:
+    # API 키 조회 (캐시 우선, 비활성화된 키도 없는 키와 같은 401로 거부)
+    db_api_key = await _load_api_key(db, api_key_id)
+    
+    if not db_api_key:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="유효하지 않은 API 키 Secret입니다"
+            detail="유효하지 않은 API 키입니다"
         )
     
-    if not db_api_key.is_active:
+    # Secret 키 검증
+    if not _check_secret(api_key_id, api_key_secret, db_api_key.secret_digest):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="비활성화된 API 키입니다"
+            detail="유효하지 않은 API 키 Secret입니다"
         )
     
-    # API 키 사용량 업데이트
-    db_api_key.call_count += 1
-    db_api_key.last_used_at = datetime.utcnow()
+    return db_api_key
+
+# 청구가 진행 중인 API 키 (동일 사용량의 중복 차감 방지)
+_billing_in_progress = set()
+_billing_lock = threading.Lock()
+
+def _bill_unbilled_usage(api_key_id: int):
+    """
+    미청구 사용량이 10개 이상이면 온체인 차감 실행 (사용 기록 저장 후 스레드풀에서 실행)
     
-    # 요청 경로 및 메서드 추적 (요청 객체가 제공된 경우)
-    if request:
-        # API 사용 기록 저장
-        endpoint = request.url.path
-        method = request.method
-        
-        # 새 API 사용 기록 생성
-        api_usage = APIUsage(
-            api_key_id=db_api_key.id,
-            endpoint=endpoint,
-            method=method,
-            timestamp=datetime.utcnow()
-        )
-        db.add(api_usage)
+    미청구 건수와 비용 합계는 SQL로 집계하며, 사용 기록 버퍼와 분리된 자체 세션을 사용합니다.
     
-    db.commit()
+    Args:
+        api_key_id (int): API 키의 내부 ID
+    """
+    with _billing_lock:
+        if api_key_id in _billing_in_progress:
+            return
+        _billing_in_progress.add(api_key_id)
     
-    return db_api_key
+    db = SessionLocal()
+    try:
+        # 미청구 사용량 집계 (집계 이후 저장된 기록은 다음 청구에 포함되도록 마지막 ID까지만 청구)
+        unbilled = db.execute(
+            select(
+                func.count(APIUsage.id).label("count"),
+                func.coalesce(func.sum(APIUsage.cost), 0).label("total_cost"),
+                func.max(APIUsage.id).label("last_id")
+            ).where(
+                APIUsage.api_key_id == api_key_id,
+                APIUsage.is_billed == False
+            )
+        ).one()
+        
+        # 미청구 사용량이 10개 이상이면 실제 차감 진행
+        if unbilled.count < 10:
+            return
+        
+        # 사용자 지갑 주소 가져오기
+        user_wallet = db.execute(
+            select(User.wallet_address)
+            .join(APIKey, APIKey.user_wallet == User.wallet_address)
+            .where(APIKey.id == api_key_id)
+        ).scalar()
+        if not user_wallet:
+            return
+        
+        # 총 차감 비용
+        total_cost = unbilled.total_cost
+        
+        try:
+            # 관리자 주소 (수수료 수취 주소)
+            admin_address = FEE_RECIPIENT_ADDRESS
+            
+            # 로그 기록 - 정확한 HSK 값 표시
+            logger.info("Deducting %.6f HSK (%s wei) from %s to %s", total_cost / 10**18, total_cost, user_wallet, admin_address)
+            
+            # 온체인에서 직접 차감 실행 (스레드풀에서 이벤트 루프의 비동기 함수 호출)
+            success, result = from_thread.run(
+                deduct_for_usage, user_wallet, total_cost, admin_address
+            )
+            
+            if success:
+                tx_hash = result
+                tx_status = "pending"
+                logger.info("Successfully deducted usage fee. Transaction hash: %s", tx_hash)
+            else:
+                # 실패 시 고유한 ID 생성 (중복 방지)
+                tx_hash = f"failed-{uuid.uuid4()}"
+                tx_status = "failed"
+                logger.warning("Failed to deduct usage fee: %s", result)
+            
+            # Transaction 모델에 차감 요청 기록
+            tx = Transaction(
+                user_wallet=user_wallet,
+                tx_hash=tx_hash,
+                amount=total_cost,
+                tx_type="usage_deduct",
+                status=tx_status,
+                created_at=datetime.utcnow()
+            )
+            db.add(tx)
+            
+            # 청구 완료로 표시 (성공 여부와 관계없이)
+            db.execute(
+                update(APIUsage.__table__).where(
+                    APIUsage.api_key_id == api_key_id,
+                    APIUsage.is_billed == False,
+                    APIUsage.id <= unbilled.last_id
+                ).values(is_billed=True)
+            )
+            
+            # 변경사항 저장
+            db.commit()
+            
+        except Exception as e:
+            db.rollback()
+            logger.exception("Error deducting usage cost: %s", e)
+    finally:
+        db.close()
+        with _billing_lock:
+            _billing_in_progress.discard(api_key_id)
 
-def get_api_key_with_tracking(
+def _bill_flushed_keys(api_key_ids):
+    """
+    사용 기록이 저장된 API 키별로 미청구 사용량 차감 (UsageBuffer.flush 후 호출)
+    """
+    for api_key_id in sorted(api_key_ids):
+        _bill_unbilled_usage(api_key_id)
+
+# 요청마다 청구 작업을 예약하지 않고, 사용 기록이 저장된 키만 저장 직후 청구
+usage_buffer.on_flush = _bill_flushed_keys
+
+async def verify_api_key(
     api_key_id: str = Header(..., alias="api-key-id"),
     api_key_secret: str = Header(..., alias="api-key-secret"),
     request: Request = None,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
-    API 키 검증 및 사용량 추적 함수
+    API 키 검증 및 사용량 추적 함수 (ID와 Secret 모두 검증)
+    
+    모든 데이터 API가 사용하는 단일 인증 의존성입니다. FastAPI의 의존성 캐시로
+    한 요청 안에서는 한 번만 실행됩니다.
+    사용량 기록은 버퍼에 적재되고, 차감 처리는 버퍼가 사용 기록을 저장한 뒤 실행됩니다.
     
     Args:
         api_key_id (str): API 키 ID
         api_key_secret (str): API 키 Secret
         request (Request): 요청 객체
-        db (Session): 데이터베이스 세션
+        db (AsyncSession): 비동기 데이터베이스 세션
         
     Returns:
-        APIKey: 검증된 API 키 객체
+        APIKeySnapshot: 검증된 API 키 정보
     """
     # API 키 검증
-    api_key = verify_api_key(api_key_id, api_key_secret, request, db)
+    api_key = await _authenticate(api_key_id, api_key_secret, db)
     
-    # 현재 시간 기록
-    now = datetime.utcnow()
+    # 분당 요청 한도 확인 (RATE_LIMIT_STRATEGY에 따라 슬라이딩 윈도우(기본) 또는 토큰 버킷)
+    allowed, retry_after = await rate_limiter.allow(api_key.key_id, api_key.rate_limit_per_minute)
+    if not allowed:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="요청 한도를 초과했습니다",
+            headers={"Retry-After": str(math.ceil(retry_after))}
+        )
     
     # API 사용량 추적
     if request:
-        # 엔드포인트 및 메서드 정보 추출
-        path = request.url.path
-        method = request.method
-        
         # 콜당 비용 설정 (0.001 HSK = 10^15 wei)
         cost_per_call = 10**14  # 0.001 HSK in wei
         
-        # API 사용량 기록
-        usage = APIUsage(
-            api_key_id=api_key.id,
-            endpoint=path,
-            method=method,
-            timestamp=now,
-            cost=cost_per_call,
-            is_billed=False
-        )
-        db.add(usage)
-        
-        # API 키 사용 횟수 증가 및 마지막 사용 시간 업데이트
-        api_key.call_count += 1
-        api_key.last_used_at = now
-        
-        # 사용자 정보 가져오기 - user_id로 조회
-        user = db.query(User).filter(User.wallet_address == api_key.user.wallet_address).first()
-        
-        if user:
-            # 미청구된 사용량 계산
-            unbilled_usages = db.query(APIUsage).filter(
-                APIUsage.api_key_id == api_key.id,
-                APIUsage.is_billed == False
-            ).all()
-            
-            # 미청구 사용량이 10개 이상이면 실제 차감 진행
-            if len(unbilled_usages) >= 10:
-                # 총 차감 비용 계산
-                total_cost = sum(usage.cost for usage in unbilled_usages)
-                
-                try:
-                    # 관리자 주소 (수수료 수취 주소) - .env 파일에서 가져오거나 기본값 사용
-                    admin_address = os.getenv("FEE_RECIPIENT_ADDRESS", "0xf91aAB71fC16dA79c8ACFAD67aF7C9b39588B246")  # 수수료 수취 지갑 주소
-                    
-                    # 로그 기록 - 정확한 HSK 값 표시
-                    print(f"Deducting {total_cost / 10**18:.6f} HSK from {user.wallet_address}")
-                    print(f"Total cost in wei: {total_cost}")
-                    print(f"Fee recipient: {admin_address}")
-                    
-                    # 온체인에서 직접 차감 실행
-                    success, result = deduct_for_usage(user.wallet_address, total_cost, admin_address)
-                    
-                    if success:
-                        tx_hash = result
-                        status = "pending"
-                        print(f"Successfully deducted usage fee. Transaction hash: {tx_hash}")
-                    else:
-                        # 실패 시 고유한 ID 생성 (중복 방지)
-                        tx_hash = f"failed-{uuid.uuid4()}"
-                        status = "failed"
-                        print(f"Failed to deduct usage fee: {result}")
-                    
-                    # Transaction 모델에 차감 요청 기록
-                    tx = Transaction(
-                        user_wallet=user.wallet_address,
-                        tx_hash=tx_hash,
-                        amount=total_cost,
-                        tx_type="usage_deduct",
-                        status=status,
-                        created_at=now
-                    )
-                    db.add(tx)
-                    
-                    # 청구 완료로 표시 (성공 여부와 관계없이)
-                    for usage in unbilled_usages:
-                        usage.is_billed = True
-                    
-                    # 변경사항 저장
-                    db.commit()
-                    
-                except Exception as e:
-                    print(f"Error deducting usage cost: {str(e)}")
-                    # 오류가 발생해도 API 키는 반환
-            else:
-                # 변경사항 저장
-                db.commit()
+        # API 사용량 기록 및 call_count 증가는 버퍼를 통해 일괄 저장
+        usage_buffer.record(api_key.id, request.url.path, request.method, cost=cost_per_call)
     
     return api_key
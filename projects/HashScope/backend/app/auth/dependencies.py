@@ -1,18 +1,77 @@
 from fastapi import Depends, HTTPException, status, Header
 from fastapi.security import OAuth2PasswordBearer, HTTPBearer
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from jose import jwt, JWTError
 from typing import Optional
+from dataclasses import dataclass
+import json
+import threading
+from cachetools import TTLCache
 
-from app.database import get_db
-from app.models import User, APIKey
+from app.database import get_async_db
+from app.models import User
 from app.auth.jwt import verify_token, SECRET_KEY, ALGORITHM
+from app.utils.cache import response_cache
 
 # OAuth2 scheme for JWT token authentication - auto_error=False로 설정하여 Swagger UI에서 자동 인증 요구를 비활성화
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login", auto_error=False)
 security = HTTPBearer(auto_error=False)
 
-async def get_current_user(token: Optional[str] = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+@dataclass(frozen=True)
+class UserSnapshot:
+    """
+    Read-only copy of the user fields needed by route handlers (safe to cache across sessions)
+    """
+    wallet_address: str
+    is_admin: bool
+
+# Authenticated users (wallet_address -> UserSnapshot)
+_user_cache = TTLCache(maxsize=1_000, ttl=300)
+_user_cache_lock = threading.Lock()
+
+# How long a user snapshot stays in the shared cache (seconds), so other workers skip the DB as well
+SHARED_USER_CACHE_TTL = 60
+
+def _shared_user_cache_key(wallet_address: str) -> str:
+    return f"user:{wallet_address}"
+
+async def _load_user(db: AsyncSession, wallet_address: str) -> Optional[UserSnapshot]:
+    """
+    Look up a user by wallet address, serving repeat lookups from the process cache
+    and then the shared (Redis) cache before querying the database
+    """
+    with _user_cache_lock:
+        user = _user_cache.get(wallet_address)
+    if user is not None:
+        return user
+    
+    cached = await response_cache.get(_shared_user_cache_key(wallet_address))
+    if cached is not None:
+        user = UserSnapshot(**json.loads(cached))
+    else:
+        result = await db.execute(
+            select(User.wallet_address, User.is_admin).where(User.wallet_address == wallet_address)
+        )
+        row = result.one_or_none()
+        # End the read transaction so the pooled connection is returned
+        # before the route handler waits on RPC calls
+        await db.commit()
+        if row is None:
+            return None
+        
+        user = UserSnapshot(wallet_address=row.wallet_address, is_admin=bool(row.is_admin))
+        await response_cache.set(
+            _shared_user_cache_key(wallet_address),
+            json.dumps({"wallet_address": user.wallet_address, "is_admin": user.is_admin}).encode(),
+            SHARED_USER_CACHE_TTL
+        )
+    
+    with _user_cache_lock:
+        _user_cache[wallet_address] = user
+    return user
+
+async def get_current_user(token: Optional[str] = Depends(oauth2_scheme), db: AsyncSession = Depends(get_async_db)):
     """
     Get the current user from the JWT token
     """
@@ -39,8 +98,8 @@ async def get_current_user(token: Optional[str] = Depends(oauth2_scheme), db: Se
     if wallet_address is None:
         raise credentials_exception
     
-    # Get user from database
-    user = db.query(User).filter(User.wallet_address == wallet_address).first()
+    # Get user (cached lookup)
+    user = await _load_user(db, wallet_address)
     if user is None:
         raise credentials_exception
     
@@ -58,18 +117,3 @@ async def get_current_admin_user(current_user: User = Depends(get_current_user))
             detail="Not enough permissions"
         )
     return current_user
-
-async def get_api_key(api_key: str, db: Session = Depends(get_db)):
-    """
-    Validate API key and return the associated API key object
-    """
-    # Find API key in database
-    api_key_obj = db.query(APIKey).filter(APIKey.key_id == api_key, APIKey.is_active == True).first()
-    
-    if not api_key_obj:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid API key",
-        )
-    
-    return api_key_obj
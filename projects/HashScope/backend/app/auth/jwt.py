@@ -1,8 +1,11 @@
 from datetime import datetime, timedelta
 from typing import Optional
 import os
+import threading
+import time
 from jose import JWTError, jwt
 from dotenv import load_dotenv
+from cachetools import TLRUCache
 
 # Load environment variables
 load_dotenv()
@@ -28,12 +31,37 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     
     return encoded_jwt
 
+# Maximum time a verified token payload is reused without re-checking the signature
+TOKEN_CACHE_TTL = 60
+
+def _token_ttu(token: str, payload: dict, now: float) -> float:
+    """
+    Expire cached payloads after TOKEN_CACHE_TTL seconds or when the token expires, whichever is sooner
+    """
+    remaining = payload.get("exp", 0) - time.time()
+    return now + max(0, min(TOKEN_CACHE_TTL, remaining))
+
+# Verified token payloads (token -> payload)
+_token_cache = TLRUCache(maxsize=10_000, ttu=_token_ttu)
+_token_cache_lock = threading.Lock()
+
 def verify_token(token: str) -> Optional[dict]:
     """
     Verify a JWT token and return the payload
+    
+    Successfully verified payloads are cached, so repeat requests with the same
+    token skip the signature check until the cache entry or the token expires.
     """
+    with _token_cache_lock:
+        payload = _token_cache.get(token)
+    if payload is not None:
+        return payload
+    
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        return payload
     except JWTError:
         return None
+    
+    with _token_cache_lock:
+        _token_cache[token] = payload
+    return payload
@@ -0,0 +1,209 @@
+import asyncio
+import os
+import threading
+from collections import Counter
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Set
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import Boolean, DateTime, Float, Integer, String, bindparam, case, exists, func, insert, select, update
+
+from app.database import SessionLocal
+from app.models import APIKey, APIUsage
+from app.utils.log import get_logger
+
+logger = get_logger("usage")
+
+# 한 번의 커밋에 기록할 최대 사용 기록 수
+FLUSH_BATCH_SIZE = 500
+
+# 버퍼를 비우는 주기 (초)
+FLUSH_INTERVAL = float(os.getenv("USAGE_FLUSH_INTERVAL", "1.0"))
+
+# 저장에 연속으로 실패한 배치를 버리기 전까지의 재시도 횟수
+MAX_FLUSH_RETRIES = 5
+
+# 버퍼에 보관할 최대 사용 기록 수 (DB 장애가 길어져도 메모리가 무한히 늘지 않도록 제한)
+MAX_PENDING = int(os.getenv("USAGE_MAX_PENDING", "100000"))
+
+# API 키 호출 수/마지막 사용 시각 일괄 갱신 문
+# 여러 워커가 순서 없이 저장해도 last_used_at이 과거로 돌아가지 않도록 더 큰 값만 반영 (greatest)
+_api_keys = APIKey.__table__
+_api_usages = APIUsage.__table__
+
+# 사용 기록 일괄 삽입 문 (INSERT ... SELECT)
+# 기록 후 삭제된 API 키의 사용 기록은 EXISTS 조건으로 건너뛰어 외래 키 오류로 배치 전체가 실패하지 않도록 함
+_USAGE_COLUMNS = {
+    "api_key_id": Integer(),
+    "endpoint": String(),
+    "method": String(),
+    "timestamp": DateTime(timezone=True),
+    "cost": Float(),
+    "is_billed": Boolean(),
+}
+_USAGE_INSERT = insert(_api_usages).from_select(
+    list(_USAGE_COLUMNS),
+    select(*(bindparam(name, type_=type_) for name, type_ in _USAGE_COLUMNS.items())).where(
+        exists().where(_api_keys.c.id == bindparam("api_key_id"))
+    )
+)
+_CALL_COUNT_UPDATE = (
+    update(_api_keys)
+    .where(_api_keys.c.id == bindparam("key_pk"))
+    .values(
+        call_count=func.coalesce(_api_keys.c.call_count, 0) + bindparam("calls"),
+        last_used_at=case(
+            (_api_keys.c.last_used_at > bindparam("used_at"), _api_keys.c.last_used_at),
+            else_=bindparam("used_at")
+        )
+    )
+)
+
+class UsageBuffer:
+    """
+    API 사용 기록 버퍼
+
+    요청마다 APIUsage 행을 추가하고 커밋하는 대신, 사용 기록을 메모리에 모아 두었다가
+    주기적으로 한 번의 bulk insert와 call_count 업데이트, 단일 커밋으로 저장합니다.
+    record는 이벤트 루프에서, flush는 스레드풀에서 실행되므로 버퍼는 락으로 보호합니다.
+    저장에 계속 실패하는 배치는 MAX_FLUSH_RETRIES번 재시도 후 버리고,
+    버퍼가 MAX_PENDING을 넘으면 새 기록을 버립니다.
+    저장이 끝나면 사용 기록이 저장된 API 키 ID 집합으로 on_flush를 호출합니다. (미청구 사용량 차감 등)
+    """
+
+    def __init__(
+        self,
+        session_factory=SessionLocal,
+        batch_size: int = FLUSH_BATCH_SIZE,
+        max_pending: int = MAX_PENDING,
+        on_flush: Optional[Callable[[Set[int]], None]] = None
+    ):
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.max_pending = max_pending
+        self.on_flush = on_flush
+        # 맨 앞 배치가 연속으로 저장에 실패한 횟수
+        self._failures = 0
+        self._pending: List[Dict] = []
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    def record(self, api_key_id: int, endpoint: str, method: str, cost: float = 0.0):
+        """
+        사용 기록을 버퍼에 추가 (DB 접근 없음)
+
+        Args:
+            api_key_id (int): API 키의 내부 ID
+            endpoint (str): 호출된 엔드포인트 경로
+            method (str): HTTP 메서드
+            cost (float): 호출 비용 (wei)
+        """
+        row = {
+            "api_key_id": api_key_id,
+            "endpoint": endpoint,
+            "method": method,
+            "timestamp": datetime.utcnow(),
+            "cost": cost,
+            "is_billed": False,
+        }
+        with self._lock:
+            if len(self._pending) >= self.max_pending:
+                dropped = True
+            else:
+                dropped = False
+                self._pending.append(row)
+        if dropped:
+            logger.warning("API usage buffer is full (%d records), dropping usage record for key %s", self.max_pending, api_key_id)
+
+    def pending_count(self) -> int:
+        with self._lock:
+            return len(self._pending)
+
+    def flush(self) -> int:
+        """
+        버퍼에 쌓인 사용 기록을 DB에 저장
+
+        Returns:
+            int: 저장된 사용 기록 수
+        """
+        written = 0
+        flushed_keys: Set[int] = set()
+        with self._flush_lock:
+            while True:
+                with self._lock:
+                    rows = self._pending[:self.batch_size]
+                    del self._pending[:self.batch_size]
+                if not rows:
+                    break
+
+                counts = Counter(row["api_key_id"] for row in rows)
+                last_used = {}
+                for row in rows:
+                    last_used[row["api_key_id"]] = row["timestamp"]
+
+                db = self.session_factory()
+                try:
+                    db.connection().execute(_USAGE_INSERT, rows)
+                    # 키별 카운터를 하나의 UPDATE 문으로 일괄 실행 (executemany)
+                    # 워커 간 행 잠금 순서를 맞추도록 키 ID 순으로 갱신
+                    db.connection().execute(
+                        _CALL_COUNT_UPDATE,
+                        [
+                            {"key_pk": api_key_id, "calls": counts[api_key_id], "used_at": last_used[api_key_id]}
+                            for api_key_id in sorted(counts)
+                        ]
+                    )
+                    db.commit()
+                    written += len(rows)
+                    flushed_keys.update(counts)
+                    self._failures = 0
+                except Exception as e:
+                    db.rollback()
+                    self._failures += 1
+                    if self._failures >= MAX_FLUSH_RETRIES:
+                        # 같은 배치가 계속 실패하면 버려서 이후 기록 저장이 막히지 않도록 함
+                        logger.error("Dropping %d API usage records after %d failed flushes: %s", len(rows), self._failures, e)
+                        self._failures = 0
+                        continue
+                    logger.warning("Error flushing API usage records (attempt %d/%d): %s", self._failures, MAX_FLUSH_RETRIES, e)
+                    # 저장에 실패한 기록은 다음 주기에 다시 시도 (최대 보관 수를 넘는 최근 기록은 버림)
+                    with self._lock:
+                        self._pending[:0] = rows
+                        del self._pending[self.max_pending:]
+                    break
+                finally:
+                    db.close()
+
+        # 다음 저장을 막지 않도록 저장 락을 놓은 뒤 호출
+        if flushed_keys and self.on_flush is not None:
+            try:
+                self.on_flush(flushed_keys)
+            except Exception as e:
+                logger.exception("Error in usage flush callback: %s", e)
+        return written
+
+    async def _run(self, interval: float):
+        while True:
+            await asyncio.sleep(interval)
+            if self.pending_count():
+                await run_in_threadpool(self.flush)
+
+    def start(self, interval: float = FLUSH_INTERVAL):
+        """주기적으로 버퍼를 비우는 백그라운드 작업 시작"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run(interval))
+
+    async def stop(self):
+        """백그라운드 작업을 중지하고 남은 기록을 모두 저장"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await run_in_threadpool(self.flush)
+
+# 애플리케이션 전역 사용 기록 버퍼
+usage_buffer = UsageBuffer()
@@ -1,16 +1,43 @@
-import secrets
-import string
-from eth_account.messages import encode_defunct
+import os
+import threading
+from eth_account.messages import defunct_hash_message, encode_defunct
+from eth_utils import keccak
 from web3 import Web3
 from eth_account import Account
 from typing import Optional
 
+try:
+    # libsecp256k1 C bindings (optional; falls back to eth_account recovery)
+    from coincurve import PublicKey
+except ImportError:
+    PublicKey = None
+
+# Entropy pool for nonces: one os.urandom call is sliced into many nonces
+# instead of a getrandom syscall per character
+_NONCE_POOL_SIZE = 65536
+_nonce_pool = b""
+_nonce_pool_offset = 0
+_nonce_pool_lock = threading.Lock()
+
+def _reset_nonce_pool():
+    # Forked workers must not hand out the parent's remaining pool bytes
+    global _nonce_pool, _nonce_pool_offset
+    _nonce_pool, _nonce_pool_offset = b"", 0
+
+os.register_at_fork(after_in_child=_reset_nonce_pool)
+
 def generate_nonce(length: int = 32) -> str:
     """
-    Generate a random nonce for wallet authentication
+    Generate a random nonce (hex string of the given length) for wallet authentication
     """
-    alphabet = string.ascii_letters + string.digits
-    return ''.join(secrets.choice(alphabet) for _ in range(length))
+    global _nonce_pool, _nonce_pool_offset
+    size = (length + 1) // 2
+    with _nonce_pool_lock:
+        if _nonce_pool_offset + size > len(_nonce_pool):
+            _nonce_pool, _nonce_pool_offset = os.urandom(max(_NONCE_POOL_SIZE, size)), 0
+        chunk = _nonce_pool[_nonce_pool_offset:_nonce_pool_offset + size]
+        _nonce_pool_offset += size
+    return chunk.hex()[:length]
 
 def create_auth_message(wallet_address: str, nonce: str) -> str:
     """
@@ -18,11 +45,43 @@ def create_auth_message(wallet_address: str, nonce: str) -> str:
     """
     return f"Sign this message to authenticate with HashScope API\n\nWallet: {wallet_address}\nNonce: {nonce}"
 
-def verify_signature(message: str, signature: str, wallet_address: str) -> bool:
+def auth_message_hash(message: str) -> bytes:
+    """
+    EIP-191 personal message hash of an auth message (what the wallet actually signs)
+    """
+    return bytes(defunct_hash_message(text=message))
+
+def _recover_address_bytes(message_hash: bytes, signature: str) -> bytes:
+    """
+    Recover the 20-byte signer address of an EIP-191 message hash with libsecp256k1
+    """
+    sig = bytes.fromhex(signature[2:] if signature.startswith("0x") else signature)
+    if len(sig) != 65:
+        raise ValueError("signature must be 65 bytes")
+    
+    # r || s || v (27/28) -> r || s || recovery id (0/1)
+    v = sig[64] - 27 if sig[64] >= 27 else sig[64]
+    if v not in (0, 1):
+        raise ValueError(f"invalid recovery id: {sig[64]}")
+    
+    public_key = PublicKey.from_signature_and_message(sig[:64] + bytes([v]), message_hash, hasher=None)
+    return keccak(public_key.format(compressed=False)[1:])[-20:]
+
+def verify_signature(message: str, signature: str, wallet_address: str,
+                     message_hash: Optional[bytes] = None) -> bool:
     """
     Verify that the signature was signed by the wallet address
+    
+    message_hash may be passed when the EIP-191 hash of the message was precomputed.
     """
     try:
+        if PublicKey is not None:
+            # Compare raw address bytes (no checksum encoding needed)
+            expected = bytes.fromhex(wallet_address[2:] if wallet_address.startswith("0x") else wallet_address)
+            if message_hash is None:
+                message_hash = auth_message_hash(message)
+            return _recover_address_bytes(message_hash, signature) == expected
+        
         # Convert wallet address to checksum address
         wallet_address = Web3.to_checksum_address(wallet_address)
         
@@ -1,15 +1,87 @@
 import os
 import json
-from web3 import Web3
+import asyncio
+import functools
+import aiohttp
+from web3 import AsyncWeb3, Web3
 from dotenv import load_dotenv
 from eth_account import Account
-from typing import Dict, Any, Optional
+from eth_utils import event_abi_to_log_topic
+from web3._utils.events import get_event_data
+from cachetools import LRUCache, TTLCache
+from decimal import Decimal
+from typing import Dict, Any, List, Optional, Tuple, Union
+
+from app.blockchain.resilience import CircuitBreaker, RPCLimiter, call_with_retry
+from app.utils.cache import single_flight
+from app.utils.log import get_logger
 
 load_dotenv()
 
+logger = get_logger("blockchain")
+
 # HSK 네트워크 연결 설정
 HSK_RPC_URL = os.getenv("HSK_RPC_URL", "https://mainnet.hsk.xyz")
-w3 = Web3(Web3.HTTPProvider(HSK_RPC_URL))
+# AsyncWeb3: RPC 대기 중에도 이벤트 루프가 다른 요청을 처리할 수 있음
+w3 = AsyncWeb3(AsyncWeb3.AsyncHTTPProvider(HSK_RPC_URL))
+
+# 결과가 바뀌지 않는 RPC 메서드 (확정된 트랜잭션 조회, 체인 ID)
+IMMUTABLE_RPC_METHODS = frozenset({"eth_chainId", "eth_getTransactionReceipt", "eth_getTransactionByHash"})
+_immutable_rpc_cache = LRUCache(maxsize=4096)
+
+async def immutable_rpc_cache_middleware(make_request, async_w3):
+    """
+    결과가 바뀌지 않는 RPC 응답을 캐시하는 web3 미들웨어
+    
+    같은 트랜잭션을 반복 검증하거나 폴링할 때 RPC 왕복을 생략합니다.
+    아직 블록에 포함되지 않은 트랜잭션(결과 없음 또는 blockNumber 없음)은 캐시하지 않습니다.
+    """
+    async def middleware(method, params):
+        if method not in IMMUTABLE_RPC_METHODS:
+            return await make_request(method, params)
+        
+        key = (method, str(params))
+        cached = _immutable_rpc_cache.get(key)
+        if cached is not None:
+            return cached
+        
+        response = await make_request(method, params)
+        result = response.get("result")
+        if "error" not in response and result is not None and (
+            method == "eth_chainId" or result.get("blockNumber") is not None
+        ):
+            _immutable_rpc_cache[key] = response
+        return response
+    return middleware
+
+w3.middleware_onion.add(immutable_rpc_cache_middleware, "immutable_rpc_cache")
+
+# RPC 노드 장애 시 빠르게 실패하기 위한 서킷 브레이커 (연속 5회 실패 시 30초간 차단)
+rpc_breaker = CircuitBreaker(fail_max=5, reset_timeout=30)
+
+# 동시에 진행할 수 있는 최대 RPC 호출 수 (노드의 요청 제한에 맞춰 조정)
+RPC_MAX_CONCURRENCY = int(os.getenv("RPC_MAX_CONCURRENCY", "20"))
+rpc_limiter = RPCLimiter(RPC_MAX_CONCURRENCY)
+
+# 재전송하면 안 되는 RPC 메서드 (트랜잭션 전송)
+NON_RETRYABLE_RPC_METHODS = frozenset({"eth_sendRawTransaction", "eth_sendTransaction"})
+
+async def rpc_resilience_middleware(make_request, async_w3):
+    """
+    모든 RPC 호출의 동시 실행 수를 제한하고 서킷 브레이커로 감싸며,
+    일시적인 전송 오류는 지수 백오프로 재시도하는 web3 미들웨어
+    """
+    async def middleware(method, params):
+        async def send():
+            async with rpc_limiter:
+                return await make_request(method, params)
+        
+        attempts = 1 if method in NON_RETRYABLE_RPC_METHODS else 3
+        return await call_with_retry(rpc_breaker, send, attempts=attempts)
+    return middleware
+
+# 가장 안쪽 계층에 두어 캐시 적중 시에는 서킷 상태와 무관하게 응답
+w3.middleware_onion.inject(rpc_resilience_middleware, "rpc_resilience", layer=0)
 
 # 예치 컨트랙트 주소 설정
 DEPOSIT_CONTRACT_ADDRESS = os.getenv("DEPOSIT_CONTRACT_ADDRESS")
@@ -17,25 +89,196 @@ DEPOSIT_CONTRACT_ADDRESS = os.getenv("DEPOSIT_CONTRACT_ADDRESS")
 # 컨트랙트 소유자 개인키 설정
 CONTRACT_OWNER_PRIVATE_KEY = os.getenv("CONTRACT_OWNER_PRIVATE_KEY")
 
+# ABI 파일 디렉터리 (실행 위치와 무관하게 모듈 기준으로 찾음)
+ABI_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "abi")
+
+@functools.lru_cache(maxsize=None)
+def _load_abi(name: str) -> List[Dict[str, Any]]:
+    """
+    ABI JSON 파일을 읽어 반환합니다. (파일별로 프로세스당 한 번만 파싱)
+    """
+    with open(os.path.join(ABI_DIR, name), "r") as f:
+        return json.load(f)
+
 # 예치 컨트랙트 ABI 로드
-with open("app/blockchain/abi/HSKDeposit.json", "r") as f:
-    DEPOSIT_CONTRACT_ABI = json.load(f)
+DEPOSIT_CONTRACT_ABI = _load_abi("HSKDeposit.json")
 
 # 예치 컨트랙트 인스턴스 생성
 deposit_contract = w3.eth.contract(address=DEPOSIT_CONTRACT_ADDRESS, abi=DEPOSIT_CONTRACT_ABI)
 
+# 체크섬 형식의 컨트랙트 주소 (이벤트 로그 비교용, 호출마다 변환하지 않도록 미리 계산)
+DEPOSIT_CONTRACT_CHECKSUM = Web3.to_checksum_address(DEPOSIT_CONTRACT_ADDRESS) if DEPOSIT_CONTRACT_ADDRESS else None
+_DEPOSIT_ADDR_LC = DEPOSIT_CONTRACT_ADDRESS.lower() if DEPOSIT_CONTRACT_ADDRESS else None
+
+# 컨트랙트 이벤트 ABI와 topic0 해시 (로그를 디코딩하기 전에 topic으로 먼저 거름)
+_EVENT_ABIS = {item["name"]: item for item in DEPOSIT_CONTRACT_ABI if item["type"] == "event"}
+_EVENT_TOPICS = {name: event_abi_to_log_topic(abi) for name, abi in _EVENT_ABIS.items()}
+
+def _find_event(tx_receipt, event_name: str):
+    """
+    영수증 로그를 한 번만 순회하여 예치 컨트랙트의 해당 이벤트를 찾아 디코딩합니다.
+    
+    Args:
+        tx_receipt: 트랜잭션 영수증
+        event_name: 이벤트 이름 (Deposit, Withdraw, UsageDeducted)
+        
+    Returns:
+        디코딩된 첫 번째 이벤트 (없으면 None)
+    """
+    topic0 = _EVENT_TOPICS[event_name]
+    for log in tx_receipt["logs"]:
+        topics = log["topics"]
+        if topics and topics[0] == topic0 and log["address"].lower() == _DEPOSIT_ADDR_LC:
+            return get_event_data(w3.codec, _EVENT_ABIS[event_name], log)
+    return None
+
+# RPC 노드와의 HTTP 연결 풀 설정 (keep-alive로 TCP/TLS 핸드셰이크 재사용)
+# 호스트별 연결 수는 RPC 동시 실행 한도에 맞춰, 한도를 올려도 커넥터에서 대기하지 않도록 함
+RPC_POOL_LIMIT_PER_HOST = RPC_MAX_CONCURRENCY
+RPC_POOL_LIMIT = max(50, RPC_POOL_LIMIT_PER_HOST)
+RPC_KEEPALIVE_TIMEOUT = 30
+RPC_TIMEOUT = 10
+
+_http_session: Optional[aiohttp.ClientSession] = None
+_http_session_loop: Optional[asyncio.AbstractEventLoop] = None
+
+async def get_http_session() -> aiohttp.ClientSession:
+    """
+    프로세스 전역에서 공유하는 RPC용 HTTP 세션을 반환합니다.
+    
+    처음 호출될 때 연결 풀 크기를 지정한 세션을 만들어 web3 프로바이더에도 등록하므로,
+    web3 호출과 배치 요청이 같은 keep-alive 연결을 재사용합니다.
+    """
+    global _http_session, _http_session_loop
+    loop = asyncio.get_running_loop()
+    if _http_session is None or _http_session.closed or _http_session_loop is not loop:
+        _http_session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=RPC_POOL_LIMIT,
+                limit_per_host=RPC_POOL_LIMIT_PER_HOST,
+                keepalive_timeout=RPC_KEEPALIVE_TIMEOUT,
+            ),
+            timeout=aiohttp.ClientTimeout(total=RPC_TIMEOUT),
+        )
+        _http_session_loop = loop
+        await w3.provider.cache_async_session(_http_session)
+    return _http_session
+
+async def close_http_session():
+    """
+    공유 HTTP 세션을 닫습니다. (애플리케이션 종료 시 호출)
+    """
+    global _http_session, _http_session_loop
+    if _http_session is not None and not _http_session.closed:
+        await _http_session.close()
+    _http_session = None
+    _http_session_loop = None
+
+async def warm_up():
+    """
+    애플리케이션 시작 시 RPC 연결 풀을 열고 변하지 않는 값을 미리 조회합니다.
+    
+    노드에 연결할 수 없어도 서버 시작은 막지 않습니다. (첫 호출 시 다시 조회)
+    """
+    await get_http_session()
+    if CONTRACT_OWNER_PRIVATE_KEY:
+        get_owner_address()
+    try:
+        await get_chain_id()
+    except Exception as e:
+        logger.warning("Error warming up blockchain connection: %s", e)
+
+@functools.lru_cache(maxsize=1)
+def get_owner_address() -> str:
+    """
+    컨트랙트 소유자 주소를 반환합니다. (개인키로부터 한 번만 계산)
+    """
+    return Account.from_key(CONTRACT_OWNER_PRIVATE_KEY).address
+
+async def rpc_batch(calls: List[Tuple[str, list]]) -> List[Any]:
+    """
+    여러 JSON-RPC 호출을 하나의 배치 요청으로 전송합니다. (왕복 N회 -> 1회)
+    
+    Args:
+        calls: (메서드, 파라미터) 목록
+        
+    Returns:
+        호출 순서와 같은 순서의 결과 목록 (hex 문자열 등 원시 RPC 결과)
+    """
+    payload = [
+        {"jsonrpc": "2.0", "id": i, "method": method, "params": params}
+        for i, (method, params) in enumerate(calls)
+    ]
+    session = await get_http_session()
+    
+    async def send():
+        async with rpc_limiter, session.post(HSK_RPC_URL, json=payload) as response:
+            response.raise_for_status()
+            return await response.json(content_type=None)
+    
+    results = await call_with_retry(rpc_breaker, send)
+    if not isinstance(results, list):
+        # 배치를 지원하지 않는 노드는 단일 오류 객체를 반환
+        raise ValueError(f"JSON-RPC batch not supported: {results}")
+    
+    by_id = {result.get("id"): result for result in results}
+    values = []
+    for i in range(len(payload)):
+        result = by_id.get(i)
+        if result is None or "error" in result:
+            raise ValueError(f"JSON-RPC batch call {calls[i][0]} failed: {result}")
+        values.append(result["result"])
+    return values
+
+# 가스 가격 캐시 유지 시간 (초)
+GAS_PRICE_CACHE_TTL = 5
+_gas_price_cache = TTLCache(maxsize=1, ttl=GAS_PRICE_CACHE_TTL)
+
+# 체인 ID (네트워크별로 변하지 않으므로 프로세스 수명 동안 캐시)
+_chain_id: Optional[int] = None
+
+async def get_chain_id() -> int:
+    """
+    체인 ID를 반환합니다. (최초 1회만 RPC 조회)
+    """
+    global _chain_id
+    if _chain_id is None:
+        _chain_id = await w3.eth.chain_id
+    return _chain_id
+
+async def get_gas_price() -> int:
+    """
+    현재 가스 가격을 반환합니다. (GAS_PRICE_CACHE_TTL초 동안 캐시)
+    """
+    gas_price = _gas_price_cache.get("gas_price")
+    if gas_price is None:
+        gas_price = await w3.eth.gas_price
+        _gas_price_cache["gas_price"] = gas_price
+    return gas_price
+
+async def _resolved(value):
+    return value
+
+# 1 HSK = 10^18 wei
+_WEI = 10**18
+
 # 단위 변환 유틸리티 함수
-def wei_to_hsk(wei_amount: int) -> float:
+def wei_to_hsk(wei_amount: int) -> Decimal:
     """
     Wei 단위를 HSK 단위로 변환합니다. (1 HSK = 10^18 wei)
+    
+    큰 잔액에서도 반올림 오차가 없도록 Decimal로 반환합니다.
     """
-    return float(wei_amount) / 10**18
+    return Decimal(int(wei_amount)) / _WEI
 
-def hsk_to_wei(hsk_amount: float) -> int:
+def hsk_to_wei(hsk_amount: Union[float, str, Decimal]) -> int:
     """
     HSK 단위를 Wei 단위로 변환합니다. (1 HSK = 10^18 wei)
     """
-    return int(hsk_amount * 10**18)
+    if isinstance(hsk_amount, float):
+        # 0.1 같은 값이 이진 부동소수점 오차로 어긋나지 않도록 문자열 표현을 사용
+        hsk_amount = repr(hsk_amount)
+    return int(Decimal(hsk_amount) * _WEI)
 
 def format_wei_to_hsk(wei_amount: int) -> str:
     """
@@ -44,43 +287,130 @@ def format_wei_to_hsk(wei_amount: int) -> str:
     hsk_amount = wei_to_hsk(wei_amount)
     return f"{hsk_amount:.6f} HSK"
 
-def get_balance(address):
+# 잔액 조회 결과 캐시 (대시보드 새로고침 등 반복 조회 시 RPC 호출 생략)
+# BALANCE_CACHE_TTL초가 지난 값은 그대로 반환하면서 백그라운드에서 갱신하고(stale-while-revalidate),
+# BALANCE_STALE_TTL초 동안 갱신되지 않은 값만 버림 (RPC 장애 중에는 마지막으로 조회한 값을 사용)
+BALANCE_CACHE_TTL = 15
+BALANCE_STALE_TTL = int(os.getenv("BALANCE_STALE_TTL", "300"))
+# key -> (갱신이 필요한 시각, 잔액)
+_balance_cache = TTLCache(maxsize=1024, ttl=BALANCE_STALE_TTL)
+# 무효화 이전에 시작된 백그라운드 갱신이 이전 잔액을 다시 저장하지 않도록 구분하는 세대 번호
+_balance_generation = 0
+_balance_refreshes: Dict[Tuple[str, Optional[str]], asyncio.Task] = {}
+
+def invalidate_balance(address: Optional[str] = None):
+    """
+    잔액 캐시를 무효화합니다. (예치/인출/차감 트랜잭션 확인 후 호출)
+    
+    Args:
+        address: 무효화할 주소 (지정하지 않으면 모든 잔액 캐시 삭제)
+    """
+    global _balance_generation
+    _balance_generation += 1
+    
+    if address is None:
+        _balance_cache.clear()
+        return
+    
+    checksum_addr = Web3.to_checksum_address(address)
+    for key in [key for key in list(_balance_cache.keys()) if key[1] == checksum_addr]:
+        _balance_cache.pop(key, None)
+    # 사용자 잔액이 바뀌면 컨트랙트 총 잔액도 바뀜
+    _balance_cache.pop(("contract", None), None)
+
+# 같은 잔액에 대한 동시 캐시 미스는 RPC 호출 하나로 합침
+# generation을 키에 포함하여 invalidate_balance 이후의 호출이 무효화 전에 시작된 조회에 합류하지 않도록 함
+@single_flight
+async def _fetch_deposit_balance(checksum_addr: str, generation: int) -> int:
+    return await deposit_contract.functions.getBalance(checksum_addr).call()
+
+@single_flight
+async def _fetch_contract_balance(generation: int) -> int:
+    return await deposit_contract.functions.getContractBalance().call()
+
+@single_flight
+async def _fetch_wallet_balance(checksum_addr: str, generation: int) -> int:
+    return await w3.eth.get_balance(checksum_addr)
+
+def _store_balance(key, balance: int):
+    _balance_cache[key] = (asyncio.get_running_loop().time() + BALANCE_CACHE_TTL, balance)
+
+async def _refresh_balance(key, fetch, generation: int):
+    try:
+        balance = await fetch(generation)
+    except Exception as e:
+        logger.warning("Error refreshing balance %s, serving last known value: %s", key, e)
+        entry = _balance_cache.get(key)
+        if entry is not None and generation == _balance_generation:
+            # 마지막 값을 유지하고 BALANCE_CACHE_TTL초 뒤에 다시 갱신 시도
+            _store_balance(key, entry[1])
+        return
+    finally:
+        _balance_refreshes.pop(key, None)
+    if generation == _balance_generation:
+        _store_balance(key, balance)
+
+async def _cached_balance(key, fetch) -> int:
+    """
+    캐시된 잔액을 반환합니다. (오래된 값이면 그대로 반환하고 백그라운드에서 갱신)
+    
+    Args:
+        key: 캐시 키 ((종류, 체크섬 주소))
+        fetch: 캐시 세대(generation)를 받아 잔액을 RPC로 조회하는 코루틴 함수
+    """
+    entry = _balance_cache.get(key)
+    if entry is None:
+        generation = _balance_generation
+        balance = await fetch(generation)
+        # 조회 중에 무효화되었으면 무효화 전 값일 수 있으므로 캐시하지 않음
+        if generation == _balance_generation:
+            _store_balance(key, balance)
+        return balance
+    
+    refresh_at, balance = entry
+    if refresh_at <= asyncio.get_running_loop().time() and key not in _balance_refreshes:
+        _balance_refreshes[key] = asyncio.create_task(_refresh_balance(key, fetch, _balance_generation))
+    return balance
+
+async def get_balance(address):
     """
     사용자의 예치된 HSK 잔액을 조회합니다.
     """
     try:
         # 주소를 체크섬 주소로 변환
         checksum_addr = Web3.to_checksum_address(address)
-        print(f"Converting address {address} to checksum format: {checksum_addr}")
-        balance = deposit_contract.functions.getBalance(checksum_addr).call()
-        return balance
+        logger.debug("Converting address %s to checksum format: %s", address, checksum_addr)
+        return await _cached_balance(
+            ("deposit", checksum_addr), functools.partial(_fetch_deposit_balance, checksum_addr)
+        )
     except Exception as e:
-        print(f"Error getting balance: {e}")
+        logger.exception("Error getting balance: %s", e)
         return 0
 
-def get_contract_balance():
+async def get_contract_balance():
     """
     컨트랙트의 총 HSK 잔액을 조회합니다.
     """
     try:
-        balance = deposit_contract.functions.getContractBalance().call()
-        return balance
+        return await _cached_balance(("contract", None), _fetch_contract_balance)
     except Exception as e:
-        print(f"Error getting contract balance: {e}")
+        logger.exception("Error getting contract balance: %s", e)
         return 0
 
-def get_wallet_balance(address):
+async def get_wallet_balance(address):
     """
     지갑의 HSK 잔액을 조회합니다.
     """
     try:
-        balance = w3.eth.get_balance(address)
-        return balance
+        checksum_addr = Web3.to_checksum_address(address)
+        return await _cached_balance(
+            ("wallet", checksum_addr), functools.partial(_fetch_wallet_balance, checksum_addr)
+        )
     except Exception as e:
-        print(f"Error getting wallet balance: {e}")
+        logger.exception("Error getting wallet balance: %s", e)
         return 0
 
-def sign_transaction(private_key: str, transaction: Dict[str, Any]) -> str:
+async def sign_transaction(private_key: str, transaction: Dict[str, Any]) -> str:
     """
     트랜잭션에 서명합니다.
     
@@ -92,18 +422,18 @@ def sign_transaction(private_key: str, transaction: Dict[str, Any]) -> str:
         서명된 트랜잭션의 해시
     """
     try:
-        # 트랜잭션 서명
-        signed_tx = w3.eth.account.sign_transaction(transaction, private_key)
+        # 트랜잭션 서명 (CPU 연산이므로 이벤트 루프를 막지 않도록 스레드에서 실행)
+        signed_tx = await asyncio.to_thread(w3.eth.account.sign_transaction, transaction, private_key)
         
         # 서명된 트랜잭션 전송
-        tx_hash = w3.eth.send_raw_transaction(signed_tx.rawTransaction)
+        tx_hash = await w3.eth.send_raw_transaction(signed_tx.rawTransaction)
         
         return tx_hash.hex()
     except Exception as e:
-        print(f"Error signing transaction: {e}")
+        logger.exception("Error signing transaction: %s", e)
         raise e
 
-def build_deposit_transaction(from_address: str, amount_wei: int, gas_price: Optional[int] = None) -> Dict[str, Any]:
+async def build_deposit_transaction(from_address: str, amount_wei: int, gas_price: Optional[int] = None) -> Dict[str, Any]:
     """
     예치 트랜잭션을 생성합니다.
     
@@ -116,9 +446,12 @@ def build_deposit_transaction(from_address: str, amount_wei: int, gas_price: Opt
         트랜잭션 데이터
     """
     try:
-        # 가스 가격이 지정되지 않은 경우 네트워크에서 가져옴
-        if gas_price is None:
-            gas_price = w3.eth.gas_price
+        # chain ID와 가스 가격은 캐시된 값을 사용하므로 보통 nonce 조회 1회만 발생
+        nonce, chain_id, gas_price = await asyncio.gather(
+            w3.eth.get_transaction_count(from_address),
+            get_chain_id(),
+            get_gas_price() if gas_price is None else _resolved(gas_price),
+        )
         
         # 트랜잭션 데이터 생성
         tx = {
@@ -127,52 +460,44 @@ def build_deposit_transaction(from_address: str, amount_wei: int, gas_price: Opt
             'value': amount_wei,
             'gas': 100000,  # 예상 가스 한도
             'gasPrice': gas_price,
-            'nonce': w3.eth.get_transaction_count(from_address),
-            'chainId': w3.eth.chain_id,
+            'nonce': nonce,
+            'chainId': chain_id,
         }
         
         return tx
     except Exception as e:
-        print(f"Error building deposit transaction: {e}")
+        logger.exception("Error building deposit transaction: %s", e)
         raise e
 
-def verify_deposit_transaction(tx_hash):
+async def verify_deposit_transaction(tx_hash):
     """
     예치 트랜잭션을 검증합니다.
     """
     try:
         # 트랜잭션 정보 가져오기
-        tx_receipt = w3.eth.get_transaction_receipt(tx_hash)
+        tx_receipt = await w3.eth.get_transaction_receipt(tx_hash)
         
         # 트랜잭션이 성공했는지 확인
         if tx_receipt and tx_receipt["status"] == 1:
             # 이벤트 로그에서 Deposit 이벤트 찾기
-            for log in tx_receipt["logs"]:
-                # 체크섬 주소로 변환하여 비교
-                contract_addr = Web3.to_checksum_address(DEPOSIT_CONTRACT_ADDRESS)
-                log_addr = Web3.to_checksum_address(log["address"])
-                if log_addr == contract_addr:
-                    # 이벤트 디코딩
-                    try:
-                        event = deposit_contract.events.Deposit().process_receipt(tx_receipt)
-                        if event:
-                            for ev in event:
-                                return {
-                                    "user": ev["args"]["user"],
-                                    "amount": ev["args"]["amount"],
-                                    "success": True
-                                }
-                    except Exception as e:
-                        print(f"Error decoding event: {e}")
+            try:
+                ev = _find_event(tx_receipt, "Deposit")
+                if ev:
+                    return {
+                        "user": ev["args"]["user"],
+                        "amount": ev["args"]["amount"],
+                        "success": True
+                    }
+            except Exception as e:
+                logger.exception("Error decoding event: %s", e)
             
             # Deposit 이벤트를 찾지 못했지만 트랜잭션이 성공한 경우
             # 일반 전송일 수 있으므로 트랜잭션 정보 확인
-            tx = w3.eth.get_transaction(tx_hash)
+            tx = await w3.eth.get_transaction(tx_hash)
             if tx and tx["to"]:
                 # 체크섬 주소로 변환하여 비교
-                contract_addr = Web3.to_checksum_address(DEPOSIT_CONTRACT_ADDRESS)
                 tx_to_addr = Web3.to_checksum_address(tx["to"])
-                if tx_to_addr == contract_addr:
+                if tx_to_addr == DEPOSIT_CONTRACT_CHECKSUM:
                     return {
                         "user": tx["from"],
                         "amount": tx["value"],
@@ -181,60 +506,57 @@ def verify_deposit_transaction(tx_hash):
         
         return {"success": False, "message": "Transaction failed or no Deposit event found"}
     except Exception as e:
-        print(f"Error verifying deposit transaction: {e}")
-        return {"success": False, "message": str(e)}
+        # 아직 블록에 포함되지 않은 트랜잭션(TransactionNotFound)이나 RPC 오류는 나중에 다시 검증할 수 있음
+        logger.exception("Error verifying deposit transaction: %s", e)
+        return {"success": False, "retryable": True, "message": str(e)}
 
-def verify_withdraw_transaction(tx_hash):
+async def verify_withdraw_transaction(tx_hash):
     """
     인출 트랜잭션을 검증합니다.
     """
     try:
         # 트랜잭션 정보 가져오기
-        tx_receipt = w3.eth.get_transaction_receipt(tx_hash)
+        tx_receipt = await w3.eth.get_transaction_receipt(tx_hash)
         
         # 트랜잭션이 성공했는지 확인
         if tx_receipt and tx_receipt["status"] == 1:
             # 이벤트 로그에서 Withdraw 이벤트 찾기
-            for log in tx_receipt["logs"]:
-                if log["address"].lower() == DEPOSIT_CONTRACT_ADDRESS.lower():
-                    # 이벤트 디코딩
-                    try:
-                        event = deposit_contract.events.Withdraw().process_receipt(tx_receipt)
-                        if event:
-                            for ev in event:
-                                return {
-                                    "user": ev["args"]["user"],
-                                    "amount": ev["args"]["amount"],
-                                    "success": True
-                                }
-                    except Exception as e:
-                        print(f"Error decoding event: {e}")
+            try:
+                ev = _find_event(tx_receipt, "Withdraw")
+                if ev:
+                    return {
+                        "user": ev["args"]["user"],
+                        "amount": ev["args"]["amount"],
+                        "success": True
+                    }
+            except Exception as e:
+                logger.exception("Error decoding event: %s", e)
         
         return {"success": False, "message": "Transaction failed or no Withdraw event found"}
     except Exception as e:
-        print(f"Error verifying withdraw transaction: {e}")
+        logger.exception("Error verifying withdraw transaction: %s", e)
         return {"success": False, "message": str(e)}
 
-def verify_usage_deduction_transaction(tx_hash):
+async def verify_usage_deduction_transaction(tx_hash):
     """
     사용량 차감 트랜잭션을 검증합니다.
     """
     try:
         # 트랜잭션 조회
-        tx_receipt = w3.eth.get_transaction_receipt(tx_hash)
+        tx_receipt = await w3.eth.get_transaction_receipt(tx_hash)
         if not tx_receipt or not tx_receipt.get('status'):
             return False, "트랜잭션이 실패했거나 존재하지 않습니다."
         
         # 이벤트 로그 확인
-        logs = deposit_contract.events.UsageDeducted().process_receipt(tx_receipt)
-        if not logs:
+        ev = _find_event(tx_receipt, "UsageDeducted")
+        if not ev:
             return False, "UsageDeducted 이벤트가 없습니다."
         
-        return True, logs[0].args
+        return True, ev.args
     except Exception as e:
         return False, str(e)
 
-def deduct_for_usage(user_address, amount_wei, recipient_address):
+async def deduct_for_usage(user_address, amount_wei, recipient_address):
     """
     사용자의 예치금에서 API 사용 수수료를 차감합니다.
     
@@ -257,45 +579,62 @@ def deduct_for_usage(user_address, amount_wei, recipient_address):
         # float 타입을 int 타입으로 변환 (Solidity uint256과 호환)
         amount_wei_int = int(amount_wei)
         
+        # 잔액, nonce, 가스 가격, chain ID를 한 번의 배치 요청으로 조회
+        owner_address = get_owner_address()
+        try:
+            balance, nonce, gas_price, chain_id = [int(value, 16) for value in await rpc_batch([
+                ("eth_call", [{
+                    "to": DEPOSIT_CONTRACT_CHECKSUM,
+                    "data": deposit_contract.encodeABI(fn_name="getBalance", args=[user_address])
+                }, "latest"]),
+                ("eth_getTransactionCount", [owner_address, "latest"]),
+                ("eth_gasPrice", []),
+                ("eth_chainId", []),
+            ])]
+        except Exception as e:
+            logger.warning("JSON-RPC batch failed, falling back to concurrent calls: %s", e)
+            balance, nonce, gas_price, chain_id = await asyncio.gather(
+                deposit_contract.functions.getBalance(user_address).call(),
+                w3.eth.get_transaction_count(owner_address),
+                w3.eth.gas_price,
+                w3.eth.chain_id,
+            )
+        
         # 사용자의 현재 잔액 확인
-        balance = deposit_contract.functions.getBalance(user_address).call()
         if balance < amount_wei_int:
             return False, f"잔액 부족: {wei_to_hsk(balance)} HSK (필요: {wei_to_hsk(amount_wei_int)} HSK)"
         
-        # 트랜잭션 생성
-        nonce = w3.eth.get_transaction_count(w3.eth.account.from_key(CONTRACT_OWNER_PRIVATE_KEY).address)
-        gas_price = w3.eth.gas_price
-        
         # deductForUsage 함수 호출 트랜잭션 생성
-        tx = deposit_contract.functions.deductForUsage(
+        tx = await deposit_contract.functions.deductForUsage(
             user_address,
             amount_wei_int,  # int 타입으로 변환된 값 사용
             recipient_address
         ).build_transaction({
-            'chainId': w3.eth.chain_id,
+            'chainId': chain_id,
             'gas': 200000,  # 가스 한도 설정
             'gasPrice': gas_price,
             'nonce': nonce,
         })
         
-        # 트랜잭션 서명
-        signed_tx = w3.eth.account.sign_transaction(tx, CONTRACT_OWNER_PRIVATE_KEY)
+        # 트랜잭션 서명 (CPU 연산이므로 이벤트 루프를 막지 않도록 스레드에서 실행)
+        signed_tx = await asyncio.to_thread(w3.eth.account.sign_transaction, tx, CONTRACT_OWNER_PRIVATE_KEY)
         
         # 트랜잭션 전송
-        tx_hash = w3.eth.send_raw_transaction(signed_tx.rawTransaction)
+        tx_hash = await w3.eth.send_raw_transaction(signed_tx.rawTransaction)
+        invalidate_balance(user_address)
         
         # 트랜잭션 해시 반환
         return True, w3.to_hex(tx_hash)
     except Exception as e:
         return False, f"차감 실패: {str(e)}"
 
-def get_transaction_status(tx_hash):
+async def get_transaction_status(tx_hash):
     """
     트랜잭션 상태를 조회합니다.
     """
     try:
         # 트랜잭션 정보 가져오기
-        tx_receipt = w3.eth.get_transaction_receipt(tx_hash)
+        tx_receipt = await w3.eth.get_transaction_receipt(tx_hash)
         
         if tx_receipt:
             return {
@@ -307,5 +646,5 @@ def get_transaction_status(tx_hash):
             # 트랜잭션이 아직 처리되지 않은 경우
             return {"status": "pending"}
     except Exception as e:
-        print(f"Error getting transaction status: {e}")
+        logger.exception("Error getting transaction status: %s", e)
         return {"status": "error", "message": str(e)}
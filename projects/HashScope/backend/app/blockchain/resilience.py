@@ -0,0 +1,100 @@
+import asyncio
+import time
+from typing import Awaitable, Callable, Optional, Tuple, Type, TypeVar
+
+import aiohttp
+
+T = TypeVar("T")
+
+# 일시적인 전송 오류로 보고 재시도/차단 판단에 사용하는 예외
+TRANSIENT_ERRORS: Tuple[Type[BaseException], ...] = (aiohttp.ClientError, asyncio.TimeoutError, ConnectionError)
+
+class CircuitOpenError(ConnectionError):
+    """RPC 노드 장애로 서킷이 열려 있어 호출하지 않고 바로 실패"""
+
+class CircuitBreaker:
+    """
+    RPC 노드 서킷 브레이커
+    
+    연속 fail_max회 전송 오류가 나면 서킷을 열고 reset_timeout초 동안 호출을 바로 실패시킵니다.
+    시간이 지나면 반개방 상태로 호출을 허용하고, 성공하면 닫고 실패하면 다시 엽니다.
+    """
+
+    def __init__(self, fail_max: int = 5, reset_timeout: float = 30.0):
+        self.fail_max = fail_max
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self._opened_at: Optional[float] = None
+
+    @property
+    def state(self) -> str:
+        if self._opened_at is None:
+            return "closed"
+        if time.monotonic() - self._opened_at >= self.reset_timeout:
+            return "half-open"
+        return "open"
+
+    def before_call(self):
+        if self.state == "open":
+            raise CircuitOpenError("RPC circuit is open; node marked unavailable")
+
+    def record_success(self):
+        self.failures = 0
+        self._opened_at = None
+
+    def record_failure(self):
+        self.failures += 1
+        if self.state == "half-open" or self.failures >= self.fail_max:
+            self._opened_at = time.monotonic()
+
+class RPCLimiter:
+    """
+    동시에 진행 중인 RPC 호출 수를 제한하는 세마포어 (노드 측 429/스로틀링 방지)
+    """
+
+    def __init__(self, max_in_flight: int):
+        self.max_in_flight = max_in_flight
+        self.in_flight = 0
+        self._semaphore = asyncio.Semaphore(max_in_flight)
+
+    async def __aenter__(self):
+        await self._semaphore.acquire()
+        self.in_flight += 1
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.in_flight -= 1
+        self._semaphore.release()
+
+async def call_with_retry(
+    breaker: CircuitBreaker,
+    func: Callable[[], Awaitable[T]],
+    attempts: int = 3,
+    base_delay: float = 0.1,
+    max_delay: float = 1.0,
+) -> T:
+    """
+    서킷 브레이커를 거쳐 호출하고, 일시적인 전송 오류는 지수 백오프로 재시도합니다.
+    
+    Args:
+        breaker: 사용할 서킷 브레이커
+        func: 호출할 코루틴 함수 (인자 없음)
+        attempts: 최대 시도 횟수 (1이면 재시도 없음)
+        base_delay: 첫 재시도 대기 시간 (초)
+        max_delay: 최대 재시도 대기 시간 (초)
+        
+    Returns:
+        func의 반환값
+    """
+    for attempt in range(attempts):
+        breaker.before_call()
+        try:
+            result = await func()
+        except TRANSIENT_ERRORS:
+            breaker.record_failure()
+            if attempt == attempts - 1:
+                raise
+            await asyncio.sleep(min(base_delay * 2 ** attempt, max_delay))
+        else:
+            breaker.record_success()
+            return result
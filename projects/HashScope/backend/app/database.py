@@ -1,6 +1,7 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import configure_mappers, sessionmaker
 import os
 from dotenv import load_dotenv
 from pathlib import Path
@@ -29,6 +30,62 @@ engine = create_engine(
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async driver for each sync URL scheme (used by the request-path dependencies)
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+    "mysql": "mysql+aiomysql",
+    "mysql+pymysql": "mysql+aiomysql",
+}
+
+def get_async_database_url(url: str) -> str:
+    """
+    Convert a sync database URL to the equivalent async driver URL
+    """
+    scheme, sep, rest = url.partition("://")
+    return f"{ASYNC_DRIVERS.get(scheme, scheme)}{sep}{rest}"
+
+ASYNC_DATABASE_URL = get_async_database_url(DATABASE_URL)
+
+# Prepared statements cached per asyncpg connection, so hot lookups (e.g. API key by key_id)
+# skip PostgreSQL's parse/plan step (set to 0 behind a transaction-mode pgbouncer)
+DB_PREPARED_STATEMENT_CACHE_SIZE = int(os.getenv("DB_PREPARED_STATEMENT_CACHE_SIZE", "500"))
+
+# Create async SQLAlchemy engine (SQLite has no server-side pool to size)
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL,
+    **({} if ASYNC_DATABASE_URL.startswith("sqlite") else {
+        "pool_size": int(os.getenv("DB_POOL_SIZE", "20")),
+        "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", "40")),
+        # Fail fast instead of queueing for 30 s when every connection is checked out
+        "pool_timeout": float(os.getenv("DB_POOL_TIMEOUT", "10")),
+        # Replace connections before the server or a proxy drops them as idle
+        "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", "1800")),
+        "pool_pre_ping": os.getenv("DB_POOL_PRE_PING", "false").lower() == "true",
+    }),
+    **({
+        "connect_args": {"prepared_statement_cache_size": DB_PREPARED_STATEMENT_CACHE_SIZE},
+    } if ASYNC_DATABASE_URL.startswith("postgresql+asyncpg") else {})
+)
+
+# Create async session factory
+AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
+def _enable_sqlite_foreign_keys(dbapi_connection, connection_record):
+    """
+    Turn on foreign key enforcement for each new SQLite connection (off by default in SQLite),
+    so ON DELETE CASCADE removes child rows such as a deleted API key's usage records
+    """
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.close()
+
+if DATABASE_URL.startswith("sqlite"):
+    event.listen(engine, "connect", _enable_sqlite_foreign_keys)
+if ASYNC_DATABASE_URL.startswith("sqlite"):
+    event.listen(async_engine.sync_engine, "connect", _enable_sqlite_foreign_keys)
+
 # Base class for models
 Base = declarative_base()
 
@@ -42,6 +99,13 @@ def get_db():
     finally:
         db.close()
 
+async def get_async_db():
+    """
+    Dependency for getting an async DB session
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
+
 def init_db():
     """
     Initialize database tables
@@ -51,3 +115,21 @@ def init_db():
     
     # Create tables
     Base.metadata.create_all(bind=engine)
+    
+    # create_all은 기존 테이블에 새로 선언된 인덱스를 추가하지 않으므로 개별적으로 생성
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
+
+async def warm_up_db():
+    """
+    Configure ORM mappers and open a pooled async connection at startup
+    so the first request does not pay for either
+    """
+    # Import models here to ensure they are registered with Base
+    import app.models  # noqa: F401
+    
+    configure_mappers()
+    
+    async with async_engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
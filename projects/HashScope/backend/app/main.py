@@ -1,13 +1,22 @@
 from fastapi import FastAPI, Depends, HTTPException, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse, Response
 from fastapi.openapi.utils import get_openapi
 from fastapi.openapi.docs import get_swagger_ui_html
 import os
+import asyncio
+import orjson
+from typing import Optional
 
 from app.routers import users, auth, api_keys, crypto, api_catalog, social, derivatives, projects, opensource
-from app.database import engine, Base, init_db, get_db
+from app.database import engine, Base, init_db, get_db, warm_up_db
 from app.auth.dependencies import get_current_user
+from app.auth.usage import usage_buffer
+from app.blockchain import contracts
+from app.blockchain.contracts import DEPOSIT_CONTRACT_ADDRESS, HSK_RPC_URL, close_http_session
+from app.utils.etag import ETagMiddleware
+from app.utils.responses import FastJSONResponse, ImmutableStaticFiles
 
 # 데이터베이스 초기화
 init_db()
@@ -126,6 +135,9 @@ async function fetchUserProfile() {
 
 """,
     version="0.1.0",
+    default_response_class=FastJSONResponse,
+    # /docs는 아래의 커스텀 Swagger UI 핸들러가 제공 (기본 핸들러와 중복 등록 방지)
+    docs_url=None,
 )
 
 # CORS 설정
@@ -137,6 +149,35 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# 조건부 GET 요청 (ETag / If-None-Match) 지원
+app.add_middleware(ETagMiddleware)
+
+# 1KB 이상 응답 gzip 압축 (ETag는 압축 전 본문 기준)
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
+# API 사용 기록 버퍼 주기적 저장
+@app.on_event("startup")
+async def start_usage_buffer():
+    usage_buffer.start()
+
+@app.on_event("startup")
+async def warm_up():
+    # RPC 연결 풀, 체인 ID, DB 연결을 미리 준비하여 첫 요청 지연 방지
+    await asyncio.gather(contracts.warm_up(), warm_up_db())
+
+@app.on_event("shutdown")
+async def stop_usage_buffer():
+    # 종료 전 남은 사용 기록 저장
+    await usage_buffer.stop()
+
+@app.on_event("shutdown")
+async def close_rpc_session():
+    await close_http_session()
+
+@app.on_event("shutdown")
+async def close_crypto_http_client():
+    await crypto.close_http_client()
+
 # 라우터 등록
 app.include_router(auth.router, prefix="/auth", tags=["Authentication"])
 app.include_router(users.router, prefix="/users", tags=["Users"])
@@ -276,19 +317,47 @@ const response = await fetch('https://api.hashscope.io/crypto/btc-price', {
 
 app.openapi = custom_openapi
 
+# 직렬화된 OpenAPI 스키마 캐시 (기본 /openapi.json 핸들러는 요청마다 스키마를 다시 JSON으로 인코딩)
+_openapi_json: Optional[bytes] = None
+
+app.router.routes = [route for route in app.router.routes if getattr(route, "path", None) != app.openapi_url]
+
+@app.get(app.openapi_url, include_in_schema=False)
+async def openapi_json():
+    global _openapi_json
+    if _openapi_json is None:
+        _openapi_json = orjson.dumps(app.openapi())
+    return Response(content=_openapi_json, media_type="application/json")
+
 @app.get("/", tags=["root"])
 async def root():
     return {
         "message": "Welcome to HashScope API",
         "docs": "/docs",
-        "deposit_contract": os.getenv("DEPOSIT_CONTRACT_ADDRESS", "0x0D313B22601E7AD450DC9b8b78aB0b0014022269"),
-        "hsk_rpc_url": os.getenv("HSK_RPC_URL", "https://mainnet.hsk.xyz")
+        "deposit_contract": DEPOSIT_CONTRACT_ADDRESS or "0x0D313B22601E7AD450DC9b8b78aB0b0014022269",
+        "hsk_rpc_url": HSK_RPC_URL
     }
 
 @app.get("/health")
 def health_check():
     return {"status": "healthy"}
 
+# Swagger UI 정적 파일 (swagger-ui-bundle이 설치되어 있으면 같은 출처에서 제공, 없으면 CDN 사용)
+try:
+    from swagger_ui_bundle import swagger_ui_path
+except ImportError:
+    swagger_ui_path = None
+
+if swagger_ui_path is not None:
+    # 경로에 Swagger UI 버전을 포함하여 장기 캐시해도 업그레이드 시 새 파일을 받도록 함
+    SWAGGER_STATIC_URL = f"/static/{swagger_ui_path.name}"
+    app.mount(SWAGGER_STATIC_URL, ImmutableStaticFiles(directory=str(swagger_ui_path)), name="swagger-ui")
+    SWAGGER_JS_URL = f"{SWAGGER_STATIC_URL}/swagger-ui-bundle.js"
+    SWAGGER_CSS_URL = f"{SWAGGER_STATIC_URL}/swagger-ui.css"
+else:
+    SWAGGER_JS_URL = "https://cdn.jsdelivr.net/npm/swagger-ui-dist@5.9.0/swagger-ui-bundle.js"
+    SWAGGER_CSS_URL = "https://cdn.jsdelivr.net/npm/swagger-ui-dist@5.9.0/swagger-ui.css"
+
 # Custom Swagger UI
 @app.get("/docs", include_in_schema=False)
 async def custom_swagger_ui_html():
@@ -296,7 +365,7 @@ async def custom_swagger_ui_html():
         openapi_url=app.openapi_url,
         title=f"{app.title} - API 문서",
         oauth2_redirect_url=app.swagger_ui_oauth2_redirect_url,
-        swagger_js_url="https://cdn.jsdelivr.net/npm/swagger-ui-dist@5.9.0/swagger-ui-bundle.js",
-        swagger_css_url="https://cdn.jsdelivr.net/npm/swagger-ui-dist@5.9.0/swagger-ui.css",
+        swagger_js_url=SWAGGER_JS_URL,
+        swagger_css_url=SWAGGER_CSS_URL,
         swagger_favicon_url="/favicon.ico",
     )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Boolean
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Boolean, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 
@@ -10,7 +10,7 @@ class APIKey(Base):
     id = Column(Integer, primary_key=True, index=True)
     key_id = Column(String, unique=True, index=True, nullable=False)  # Public identifier
     secret_key_hash = Column(String, nullable=False)  # Hashed secret key
-    user_wallet = Column(String, ForeignKey("users.wallet_address"), nullable=False)
+    user_wallet = Column(String, ForeignKey("users.wallet_address", ondelete="CASCADE"), nullable=False)
     name = Column(String, nullable=True)  # Optional name for the API key
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -28,7 +28,22 @@ class APIKey(Base):
     
     # Relationship
     user = relationship("User", back_populates="api_keys")
-    usages = relationship("APIUsage", back_populates="api_key")
+    # 사용 기록은 DB의 ON DELETE CASCADE로 삭제 (ORM이 자식 행을 조회하지 않음)
+    usages = relationship("APIUsage", back_populates="api_key", cascade="all, delete-orphan", passive_deletes=True)
+    
+    __table_args__ = (
+        # 인증 조회용 부분 인덱스 (PostgreSQL에서는 활성 키만, 인증에 필요한 컬럼 포함 Index Only Scan)
+        Index(
+            "ix_apikey_key_id_active",
+            "key_id",
+            "is_active",
+            postgresql_where=is_active.is_(True),
+            postgresql_include=["secret_key_hash", "user_wallet"],
+        ),
+        # 사용자별 API 키 목록 조회 / 소유자 확인 후 단건 조회용 복합 인덱스
+        Index("ix_api_keys_user_active", "user_wallet", "is_active"),
+        Index("ix_api_keys_user_keyid", "user_wallet", "key_id"),
+    )
     
     def __repr__(self):
         return f"<APIKey key_id={self.key_id} user_wallet={self.user_wallet}>"
@@ -37,7 +52,7 @@ class APIUsage(Base):
     __tablename__ = "api_usages"
     
     id = Column(Integer, primary_key=True, index=True)
-    api_key_id = Column(Integer, ForeignKey("api_keys.id"), nullable=False)
+    api_key_id = Column(Integer, ForeignKey("api_keys.id", ondelete="CASCADE"), nullable=False)
     endpoint = Column(String, nullable=False)  # 호출된 API 엔드포인트
     method = Column(String, nullable=False)  # HTTP 메서드 (GET, POST 등)
     timestamp = Column(DateTime(timezone=True), server_default=func.now())
@@ -49,5 +64,10 @@ class APIUsage(Base):
     # Relationship
     api_key = relationship("APIKey", back_populates="usages")
     
+    __table_args__ = (
+        # 미청구 사용량 조회용 복합 인덱스 (api_key_id + is_billed)
+        Index("ix_apiusage_key_billed", "api_key_id", "is_billed"),
+    )
+    
     def __repr__(self):
         return f"<APIUsage id={self.id} endpoint={self.endpoint} api_key_id={self.api_key_id}>"
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Boolean
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Boolean, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 
@@ -17,3 +17,11 @@ class Transaction(Base):
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
     user = relationship("User", back_populates="transactions")
+    
+    __table_args__ = (
+        # 사용자별 트랜잭션 유형/상태 조회용 복합 인덱스
+        Index("ix_tx_user_type_status", "user_wallet", "tx_type", "status"),
+        # 사용자별 유형(예치 등) 거래 내역 최신순 조회용 복합 인덱스
+        # (동등 조건 컬럼 뒤에 created_at을 두어 역순 인덱스 스캔만으로 정렬과 LIMIT 처리)
+        Index("ix_tx_user_type_created", "user_wallet", "tx_type", "created_at"),
+    )
@@ -17,7 +17,8 @@ class User(Base):
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
     transactions = relationship("Transaction", back_populates="user")
-    api_keys = relationship("APIKey", back_populates="user")
+    # API 키는 DB의 ON DELETE CASCADE로 삭제 (ORM이 자식 행을 조회하지 않음)
+    api_keys = relationship("APIKey", back_populates="user", cascade="all, delete-orphan", passive_deletes=True)
     
     def __repr__(self):
         return f"<User wallet_address={self.wallet_address}>"
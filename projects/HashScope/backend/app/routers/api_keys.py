@@ -1,18 +1,26 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Path
-from sqlalchemy.orm import Session
-from typing import List, Optional, Dict
-from datetime import datetime, timedelta
-import secrets
-import hashlib
-from sqlalchemy import func
+from fastapi import APIRouter, Depends, HTTPException, status, Path, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import raiseload
+from typing import List, Optional
+from datetime import datetime
+from sqlalchemy import delete, insert, select
 
-from app.database import get_db
+from app.database import get_async_db
 from app.models import User, APIKey, APIUsage
 from app.auth.dependencies import get_current_user
-from pydantic import BaseModel, Field
+from app.auth.api_key import invalidate_api_key
+from app.utils.api_keys import calculate_expiry_date, generate_api_key_pair
+from app.utils.cache import response_cache
+from pydantic import BaseModel, Field, TypeAdapter
 
 router = APIRouter()
 
+# API 키 목록 응답 캐시 유지 시간 (초, call_count/last_used_at은 최대 이 시간만큼 늦게 반영)
+API_KEY_LIST_CACHE_TTL = 30
+
+def _api_key_list_cache_key(wallet_address: str) -> str:
+    return f"user_keys:{wallet_address}"
+
 # 스키마 정의
 class APIKeyCreate(BaseModel):
     name: str = Field(None, description="Optional name for the API key")
@@ -31,6 +39,10 @@ class APIKeyResponse(BaseModel):
     class Config:
         from_attributes = True
 
+# ORM 객체 검증과 JSON 직렬화를 pydantic-core(Rust)에서 한 번에 처리
+# (FastAPI의 response_model 재검증 + jsonable_encoder 단계를 생략)
+_api_key_list_adapter = TypeAdapter(List[APIKeyResponse])
+
 class APIKeyWithSecret(BaseModel):
     key_id: str
     secret_key: str
@@ -60,28 +72,11 @@ class APIKeyHistoryResponse(BaseModel):
     total_cost: float
     endpoints: List[APIEndpointUsage]
 
-# API 키 생성 및 관리 유틸리티 함수
-def generate_api_key_pair():
-    """Generate a new API key pair (key_id and secret_key)"""
-    key_id = f"hsk_{secrets.token_hex(16)}"
-    secret_key = f"sk_{secrets.token_hex(32)}"
-    secret_key_hash = hashlib.sha256(secret_key.encode()).hexdigest()
-    
-    return {
-        "key_id": key_id,
-        "secret_key": secret_key,
-        "secret_key_hash": secret_key_hash
-    }
-
-def calculate_expiry_date(days=365):
-    """Calculate expiry date for API key"""
-    return datetime.utcnow() + timedelta(days=days)
-
 @router.post("/", response_model=APIKeyWithSecret, summary="Create new API key")
 async def create_api_key(
     api_key_data: APIKeyCreate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Create a new API key for the authenticated user.
@@ -96,35 +91,42 @@ async def create_api_key(
     # Generate API key pair
     key_pair = generate_api_key_pair()
     
-    # Create API key in database
-    api_key = APIKey(
+    expires_at = calculate_expiry_date(days=365)
+    
+    # Create API key in database (INSERT ... RETURNING으로 서버 생성 컬럼을 함께 받아 refresh 조회 생략)
+    created = (await db.execute(
+        insert(APIKey)
+        .values(
+            key_id=key_pair["key_id"],
+            secret_key_hash=key_pair["secret_key_hash"],
+            user_wallet=current_user.wallet_address,
+            name=api_key_data.name,
+            rate_limit_per_minute=api_key_data.rate_limit_per_minute,
+            expires_at=expires_at
+        )
+        .returning(APIKey.is_active, APIKey.created_at)
+    )).one()
+    await db.commit()
+    invalidate_api_key(key_pair["key_id"])
+    await response_cache.delete(_api_key_list_cache_key(current_user.wallet_address))
+    
+    # Return API key with secret (only shown once)
+    # 응답 모델을 한 번만 생성하고 pydantic-core에서 바로 JSON으로 직렬화 (중간 dict 및 재검증 생략)
+    api_key = APIKeyWithSecret(
         key_id=key_pair["key_id"],
-        secret_key_hash=key_pair["secret_key_hash"],
-        user_wallet=current_user.wallet_address,
+        secret_key=key_pair["secret_key"],  # Only returned once
         name=api_key_data.name,
-        rate_limit_per_minute=api_key_data.rate_limit_per_minute,
-        expires_at=calculate_expiry_date(days=365)
+        is_active=created.is_active,
+        created_at=created.created_at,
+        expires_at=expires_at,
+        rate_limit_per_minute=api_key_data.rate_limit_per_minute
     )
-    
-    db.add(api_key)
-    db.commit()
-    db.refresh(api_key)
-    
-    # Return API key with secret (only shown once)
-    return {
-        "key_id": api_key.key_id,
-        "secret_key": key_pair["secret_key"],  # Only returned once
-        "name": api_key.name,
-        "is_active": api_key.is_active,
-        "created_at": api_key.created_at,
-        "expires_at": api_key.expires_at,
-        "rate_limit_per_minute": api_key.rate_limit_per_minute
-    }
+    return Response(content=api_key.model_dump_json(), media_type="application/json")
 
 @router.get("/", response_model=List[APIKeyResponse], summary="List all API keys")
 async def list_api_keys(
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     List all API keys for the authenticated user.
@@ -133,14 +135,30 @@ async def list_api_keys(
     
     Requires authentication via JWT token.
     """
-    api_keys = db.query(APIKey).filter(APIKey.user_wallet == current_user.wallet_address).all()
-    return api_keys
+    # 직렬화된 목록을 캐시하여 대시보드 반복 조회 시 DB 조회와 직렬화 생략 (생성/삭제 시 제거)
+    cache_key = _api_key_list_cache_key(current_user.wallet_address)
+    cached = await response_cache.get(cache_key)
+    if cached is not None:
+        return Response(content=cached, media_type="application/json")
+    
+    # 응답에는 컬럼만 사용하므로 관계 지연 로딩(N+1)이 일어나면 오류로 드러나도록 차단
+    api_keys = (await db.execute(
+        select(APIKey).options(raiseload("*")).where(
+            APIKey.user_wallet == current_user.wallet_address
+        )
+    )).scalars().all()
+    
+    content = _api_key_list_adapter.dump_json(
+        _api_key_list_adapter.validate_python(api_keys, from_attributes=True)
+    )
+    await response_cache.set(cache_key, content, ttl=API_KEY_LIST_CACHE_TTL)
+    return Response(content=content, media_type="application/json")
 
 @router.get("/{key_id}", response_model=APIKeyResponse, summary="Get API key details")
 async def get_api_key(
     key_id: str = Path(..., description="The ID of the API key"),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get details of a specific API key.
@@ -151,10 +169,12 @@ async def get_api_key(
     
     Requires authentication via JWT token.
     """
-    api_key = db.query(APIKey).filter(
-        APIKey.key_id == key_id,
-        APIKey.user_wallet == current_user.wallet_address
-    ).first()
+    api_key = (await db.execute(
+        select(APIKey).options(raiseload("*")).where(
+            APIKey.key_id == key_id,
+            APIKey.user_wallet == current_user.wallet_address
+        )
+    )).scalar_one_or_none()
     
     if not api_key:
         raise HTTPException(
@@ -162,13 +182,16 @@ async def get_api_key(
             detail="API key not found"
         )
     
-    return api_key
+    return Response(
+        content=APIKeyResponse.model_validate(api_key).model_dump_json(),
+        media_type="application/json"
+    )
 
 @router.get("/{key_id}/usage", response_model=APIKeyUsage, summary="Get API key usage")
 async def get_api_key_usage(
     key_id: str = Path(..., description="The ID of the API key"),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get usage statistics for a specific API key.
@@ -179,10 +202,19 @@ async def get_api_key_usage(
     
     Requires authentication via JWT token.
     """
-    api_key = db.query(APIKey).filter(
-        APIKey.key_id == key_id,
-        APIKey.user_wallet == current_user.wallet_address
-    ).first()
+    # 응답에 필요한 컬럼만 조회 (ORM 객체 생성 없음)
+    api_key = (await db.execute(
+        select(
+            APIKey.key_id,
+            APIKey.call_count,
+            APIKey.last_used_at,
+            APIKey.rate_limit_per_minute,
+            APIKey.token_consumption_rate
+        ).where(
+            APIKey.key_id == key_id,
+            APIKey.user_wallet == current_user.wallet_address
+        )
+    )).first()
     
     if not api_key:
         raise HTTPException(
@@ -190,19 +222,13 @@ async def get_api_key_usage(
             detail="API key not found"
         )
     
-    return {
-        "key_id": api_key.key_id,
-        "call_count": api_key.call_count,
-        "last_used_at": api_key.last_used_at,
-        "rate_limit_per_minute": api_key.rate_limit_per_minute,
-        "token_consumption_rate": api_key.token_consumption_rate
-    }
+    return api_key._asdict()
 
 @router.get("/{key_id}/history", response_model=APIKeyHistoryResponse, summary="Get API key usage history")
 async def get_api_key_history(
     key_id: str = Path(..., description="The ID of the API key"),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get the usage history for a specific API key.
@@ -217,10 +243,12 @@ async def get_api_key_history(
     Requires authentication via JWT token.
     """
     # API 키 존재 여부 확인
-    api_key = db.query(APIKey).filter(
-        APIKey.key_id == key_id,
-        APIKey.user_wallet == current_user.wallet_address
-    ).first()
+    api_key = (await db.execute(
+        select(APIKey.id, APIKey.key_id).where(
+            APIKey.key_id == key_id,
+            APIKey.user_wallet == current_user.wallet_address
+        )
+    )).first()
     
     if not api_key:
         raise HTTPException(
@@ -229,9 +257,11 @@ async def get_api_key_history(
         )
     
     # API 키 ID로 API 사용량 기록 조회
-    api_usages = db.query(APIUsage).filter(
-        APIUsage.api_key_id == api_key.id
-    ).all()
+    api_usages = (await db.execute(
+        select(APIUsage.endpoint, APIUsage.method, APIUsage.timestamp, APIUsage.cost).where(
+            APIUsage.api_key_id == api_key.id
+        )
+    )).all()
     
     # 엔드포인트별 통계 계산
     endpoint_stats = {}
@@ -278,7 +308,7 @@ async def get_api_key_history(
 async def delete_api_key(
     key_id: str = Path(..., description="The ID of the API key"),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Delete a specific API key.
@@ -289,18 +319,25 @@ async def delete_api_key(
     
     Requires authentication via JWT token.
     """
-    api_key = db.query(APIKey).filter(
-        APIKey.key_id == key_id,
-        APIKey.user_wallet == current_user.wallet_address
-    ).first()
+    # 소유자 확인과 삭제를 한 번의 DELETE ... RETURNING으로 처리
+    deleted = (await db.execute(
+        delete(APIKey)
+        .where(
+            APIKey.key_id == key_id,
+            APIKey.user_wallet == current_user.wallet_address
+        )
+        .returning(APIKey.id)
+    )).first()
     
-    if not api_key:
+    if not deleted:
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="API key not found"
         )
     
-    db.delete(api_key)
-    db.commit()
+    await db.commit()
+    invalidate_api_key(key_id)
+    await response_cache.delete(_api_key_list_cache_key(current_user.wallet_address))
     
     return {"message": "API key deleted successfully"}
@@ -1,19 +1,28 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
-import secrets
-import string
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from datetime import datetime
 
-from app.database import get_db
+from app.database import get_async_db
 from app.models import User
-from app.auth.wallet import create_auth_message, verify_signature, generate_nonce
+from app.auth.wallet import auth_message_hash, create_auth_message, verify_signature, generate_nonce
 from app.auth.jwt import create_access_token
 from app.utils.wallet import normalize_address, checksum_address, is_valid_address
+from app.utils.cache import response_cache
 from pydantic import BaseModel
 
 router = APIRouter()
 
+# 서명할 메시지의 EIP-191 해시 캐시 유지 시간 (초)
+NONCE_HASH_TTL = 300
+
+def _nonce_hash_key(wallet_address: str, nonce: str) -> str:
+    # nonce를 키에 포함하여 현재 DB nonce의 해시만 사용되도록 함
+    return f"nonce_hash:{wallet_address}:{nonce}"
+
 # 스키마 정의
 class NonceRequest(BaseModel):
     wallet_address: str
@@ -48,8 +57,34 @@ class TokenResponse(BaseModel):
             data['wallet_address'] = checksum_address(data['wallet_address'])
         return data
 
+# Dialects that support INSERT ... ON CONFLICT DO UPDATE
+_UPSERT_INSERTS = {
+    "postgresql": postgresql_insert,
+    "sqlite": sqlite_insert,
+}
+
+async def _upsert_nonce(db: AsyncSession, wallet_address: str, nonce: str):
+    """
+    Insert the wallet with the given nonce, or update the nonce if the wallet exists.
+    """
+    insert = _UPSERT_INSERTS.get(db.get_bind().dialect.name)
+    if insert is None:
+        # Fallback for databases without ON CONFLICT support
+        user = (await db.execute(select(User).where(User.wallet_address == wallet_address))).scalar_one_or_none()
+        if user:
+            user.nonce = nonce
+        else:
+            db.add(User(wallet_address=wallet_address, nonce=nonce))
+        return
+    
+    stmt = insert(User).values(wallet_address=wallet_address, nonce=nonce)
+    await db.execute(stmt.on_conflict_do_update(
+        index_elements=[User.wallet_address],
+        set_={"nonce": stmt.excluded.nonce}
+    ))
+
 @router.post("/nonce", response_model=NonceResponse, summary="Get authentication nonce")
-async def get_nonce(request: NonceRequest, db: Session = Depends(get_db)):
+async def get_nonce(request: NonceRequest, db: AsyncSession = Depends(get_async_db)):
     """
     Get a nonce for wallet authentication.
     
@@ -60,25 +95,21 @@ async def get_nonce(request: NonceRequest, db: Session = Depends(get_db)):
     # Normalize wallet address
     wallet_address = normalize_address(request.wallet_address)
     
-    # Check if user exists
-    user = db.query(User).filter(User.wallet_address == wallet_address).first()
-    
     # Generate new nonce
     nonce = generate_nonce()
     
-    if user:
-        # Update existing user's nonce
-        user.nonce = nonce
-    else:
-        # Create new user with wallet address only
-        user = User(wallet_address=wallet_address, nonce=nonce)
-        db.add(user)
-    
-    db.commit()
+    # Create the user or rotate its nonce in a single statement
+    await _upsert_nonce(db, wallet_address, nonce)
+    await db.commit()
     
     # Create message to be signed
     message = create_auth_message(wallet_address, nonce)
     
+    # /verify에서 메시지 재생성과 keccak 계산을 생략하도록 해시를 미리 저장
+    await response_cache.set(
+        _nonce_hash_key(wallet_address, nonce), auth_message_hash(message), ttl=NONCE_HASH_TTL
+    )
+    
     return NonceResponse(
         wallet_address=wallet_address,
         nonce=nonce,
@@ -86,7 +117,7 @@ async def get_nonce(request: NonceRequest, db: Session = Depends(get_db)):
     )
 
 @router.post("/verify", response_model=TokenResponse, summary="Verify wallet signature")
-async def verify_wallet_signature(request: VerifySignatureRequest, db: Session = Depends(get_db)):
+async def verify_wallet_signature(request: VerifySignatureRequest, db: AsyncSession = Depends(get_async_db)):
     """
     Verify wallet signature and issue JWT token.
     
@@ -98,31 +129,42 @@ async def verify_wallet_signature(request: VerifySignatureRequest, db: Session =
     # Normalize wallet address
     wallet_address = normalize_address(request.wallet_address)
     
-    # Get user from database
-    user = db.query(User).filter(User.wallet_address == wallet_address).first()
+    # Get the user's current nonce from database
+    user = (await db.execute(select(User.nonce).where(User.wallet_address == wallet_address))).first()
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid wallet address"
         )
+    used_nonce = user.nonce
     
     # Create message that should have been signed
-    message = create_auth_message(wallet_address, user.nonce)
+    message = create_auth_message(wallet_address, used_nonce)
+    message_hash = await response_cache.get(_nonce_hash_key(wallet_address, used_nonce))
     
     # Verify signature
-    if not verify_signature(message, request.signature, wallet_address):
+    if not verify_signature(message, request.signature, wallet_address, message_hash=message_hash):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid signature"
         )
     
-    # Generate new nonce for security (prevent replay attacks)
-    user.nonce = generate_nonce()
-    
-    # Update last login time
-    user.last_login_at = datetime.utcnow()
+    # Generate new nonce for security (prevent replay attacks) and update last login time
+    # Only rotate the nonce that was signed, so a concurrent verify with the same signature fails
+    rotated = await db.execute(
+        update(User)
+        .where(User.wallet_address == wallet_address, User.nonce == used_nonce)
+        .values(nonce=generate_nonce(), last_login_at=datetime.utcnow())
+    )
+    if rotated.rowcount != 1:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid signature"
+        )
     
-    db.commit()
+    await db.commit()
+    await response_cache.delete(_nonce_hash_key(wallet_address, used_nonce))
     
     # Create access token
     access_token = create_access_token(data={"sub": wallet_address})
@@ -1,39 +1,26 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Header, Request
-from sqlalchemy.orm import Session
-from typing import Dict, Optional, List
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request
+from typing import Dict, Optional
 import os
-import time
-import hmac
-import hashlib
-import requests
-import json
+import asyncio
+import httpx
+import orjson
+import re
 from datetime import datetime
-import logging
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
-import yfinance as yf
-from bs4 import BeautifulSoup
-import concurrent.futures
-
-from app.database import get_db
-from app.models import User, APIKey, APIUsage
-from app.auth.dependencies import get_current_user
-from app.auth.api_key import verify_api_key, get_api_key_with_tracking
+from cachetools import TTLCache
+
+from app.models import APIKey
+from app.auth.api_key import verify_api_key
+from app.utils.cache import async_ttl_cache, single_flight
+from app.utils.log import get_logger
+from app.utils.responses import FastJSONResponse
 from pydantic import BaseModel, Field
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler()
-    ]
-)
-logger = logging.getLogger('crypto_api')
+# 로그 출력은 QueueListener 스레드에서 수행 (요청 처리 중 stderr I/O 없음)
+logger = get_logger('crypto_api')
 
 router = APIRouter()
 
-# 스키마 정의
+# 스키마 정의 (OpenAPI 문서용, 가격 엔드포인트는 검증 없이 딕셔너리를 바로 직렬화해 반환)
 class CryptoPrice(BaseModel):
     price: float
     currency: str
@@ -51,53 +38,107 @@ class KimchiPremium(BaseModel):
     exchange_rate: float
     timestamp: datetime = Field(default_factory=datetime.utcnow)
 
-# 요청 세션 생성 함수
-def get_session_with_retries(
-    retries=3,
-    backoff_factor=0.3,
-    status_forcelist=(500, 502, 504),
-    allowed_methods=None
-):
+# 응답 가격의 유효 자릿수 (지정하지 않으면 원본 값 그대로 반환)
+PrecisionQuery = Query(None, ge=1, le=15, description="가격 값의 유효 자릿수 (예: 6). 생략하면 원본 값을 반환합니다.")
+
+def round_significant(value: Optional[float], precision: Optional[int]) -> Optional[float]:
     """
-    Create a request session with retry functionality
+    값을 지정한 유효 자릿수로 반올림 (응답 JSON의 숫자 길이 단축)
     
     Args:
-        retries: Number of retry attempts
-        backoff_factor: Time delay factor between retries
-        status_forcelist: HTTP status codes to retry
-        allowed_methods: HTTP methods to retry
+        value: 반올림할 값
+        precision: 유효 자릿수 (None이면 원본 값 반환)
         
     Returns:
-        requests.Session: Session with retry functionality
+        float: 반올림된 값
     """
-    if allowed_methods is None:
-        allowed_methods = ["HEAD", "GET", "OPTIONS"]
-    
-    retry = Retry(
-        total=retries,
-        read=retries,
-        connect=retries,
-        backoff_factor=backoff_factor,
-        status_forcelist=status_forcelist,
-        allowed_methods=allowed_methods,
-    )
+    if value is None or precision is None:
+        return value
+    return float(f"{value:.{precision}g}")
+
+try:
+    import h2  # noqa: F401  (httpx HTTP/2 지원)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# 외부 시세 API 연결 풀 설정
+HTTP_TIMEOUT = 10
+HTTP_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=20)
+
+# 시세 캐시 유지 시간 (초, 암호화폐 가격은 초 단위, 환율은 분 단위로 변함)
+CRYPTO_TTL = float(os.getenv("CRYPTO_TTL", "3"))
+FX_TTL = float(os.getenv("FX_TTL", "300"))
+
+# 조회 함수별 캐시 (반복 요청과 동시 요청이 외부 API를 다시 호출하지 않도록 함)
+_binance_price_cache = TTLCache(maxsize=64, ttl=CRYPTO_TTL)
+_upbit_price_cache = TTLCache(maxsize=8, ttl=CRYPTO_TTL)
+_fx_rate_cache = TTLCache(maxsize=4, ttl=FX_TTL)
+
+# 재시도 설정 (연결 오류는 전송 계층에서, 429/5xx 응답은 _get에서 재시도)
+RETRY_TOTAL = 3
+RETRY_BACKOFF = 0.3
+RETRY_AFTER_MAX = 5.0
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+_http_client: Optional[httpx.AsyncClient] = None
+_http_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    모든 조회 함수가 공유하는 비동기 HTTP 클라이언트를 반환합니다.
     
-    adapter = HTTPAdapter(max_retries=retry)
-    session = requests.Session()
-    session.mount("http://", adapter)
-    session.mount("https://", adapter)
+    호스트별 keep-alive 연결(HTTP/2를 지원하면 하나의 연결에서 다중화)을 재사용하므로
+    호출마다 TCP/TLS 핸드셰이크를 하지 않고, 스레드 없이 이벤트 루프에서 동시에 조회합니다.
+    """
+    global _http_client, _http_client_loop
+    loop = asyncio.get_running_loop()
+    if _http_client is None or _http_client.is_closed or _http_client_loop is not loop:
+        _http_client = httpx.AsyncClient(
+            transport=httpx.AsyncHTTPTransport(http2=HTTP2_AVAILABLE, limits=HTTP_LIMITS, retries=RETRY_TOTAL),
+            timeout=HTTP_TIMEOUT
+        )
+        _http_client_loop = loop
+    return _http_client
+
+async def close_http_client():
+    """
+    공유 HTTP 클라이언트를 닫습니다. (애플리케이션 종료 시 호출)
+    """
+    global _http_client
+    if _http_client is not None and not _http_client.is_closed:
+        await _http_client.aclose()
+    _http_client = None
+
+async def _get(url, **kwargs) -> httpx.Response:
+    """
+    GET 요청 (429/5xx 응답은 Retry-After 또는 지수 백오프만큼 기다린 뒤 재시도)
     
-    return session
+    Raises:
+        httpx.HTTPError: 연결 실패 또는 재시도 후에도 오류 응답인 경우
+    """
+    client = get_http_client()
+    for attempt in range(RETRY_TOTAL + 1):
+        response = await client.get(url, **kwargs)
+        if response.status_code not in RETRY_STATUSES or attempt == RETRY_TOTAL:
+            response.raise_for_status()
+            return response
+        
+        delay = RETRY_BACKOFF * (2 ** attempt)
+        retry_after = response.headers.get("Retry-After", "")
+        if retry_after.isdigit():
+            delay = min(float(retry_after), RETRY_AFTER_MAX)
+        logger.debug("%s 응답 %s, %s초 후 재시도...", url, response.status_code, delay)
+        await asyncio.sleep(delay)
 
 # 바이낸스 API에서 암호화폐 가격 조회
-def get_binance_price(symbol, max_retries=3, retry_delay=2):
+@async_ttl_cache(_binance_price_cache)
+async def get_binance_price(symbol):
     """
     Get the recent trading price of a specific cryptocurrency symbol from Binance API
     
     Args:
         symbol (str): Trading pair symbol (e.g., 'BTCUSDT', 'ETHUSDT')
-        max_retries (int): Maximum number of retry attempts
-        retry_delay (int): Delay between retries in seconds
         
     Returns:
         float: Latest price of the cryptocurrency
@@ -110,267 +151,221 @@ def get_binance_price(symbol, max_retries=3, retry_delay=2):
         'limit': 1  # 가장 최근 거래만 필요
     }
     
-    # 세션 생성
-    session = get_session_with_retries()
-    
-    for attempt in range(max_retries + 1):
-        try:
-            logger.info(f"{symbol} 가격 조회 중 (시도 {attempt + 1}/{max_retries + 1})")
-            response = session.get(endpoint, params=params, timeout=10)
-            response.raise_for_status()
+    try:
+        logger.debug("%s 가격 조회 중", symbol)
+        response = await _get(endpoint, params=params)
+        
+        trades = orjson.loads(response.content)
+        if not trades:
+            logger.warning("%s에 대한 거래 정보가 없습니다", symbol)
+            return None
+        
+        price = float(trades[0]['price'])
+        logger.info("%s 가격 조회 성공: %s", symbol, price)
+        return price
             
-            trades = response.json()
-            if trades and len(trades) > 0:
-                price = float(trades[0]['price'])
-                logger.info(f"{symbol} 가격 조회 성공: {price}")
-                return price
-            else:
-                logger.warning(f"{symbol}에 대한 거래 정보가 없습니다")
-                if attempt < max_retries:
-                    logger.info(f"{retry_delay}초 후 재시도...")
-                    time.sleep(retry_delay)
-                    continue
-                return None
-                
-        except requests.exceptions.RequestException as e:
-            logger.error(f"{symbol} 가격 조회 오류: {e}")
-            if attempt < max_retries:
-                logger.info(f"{retry_delay}초 후 재시도...")
-                time.sleep(retry_delay)
-            else:
-                logger.error(f"{symbol}에 대한 최대 재시도 횟수에 도달했습니다. 포기합니다.")
-                return None
-        except (ValueError, KeyError, TypeError) as e:
-            logger.error(f"{symbol} 응답 파싱 오류: {e}")
-            if attempt < max_retries:
-                logger.info(f"{retry_delay}초 후 재시도...")
-                time.sleep(retry_delay)
-            else:
-                logger.error(f"{symbol}에 대한 최대 재시도 횟수에 도달했습니다. 포기합니다.")
-                return None
+    except httpx.HTTPError as e:
+        logger.error("%s 가격 조회 오류: %s", symbol, e)
+        return None
+    except (ValueError, KeyError, TypeError) as e:
+        logger.error("%s 응답 파싱 오류: %s", symbol, e)
+        return None
 
-# 업비트 API에서 BTC 가격 조회
-def get_upbit_btc_price(max_retries=3, retry_delay=2):
+# 바이낸스 API에서 여러 암호화폐 가격을 한 번에 조회
+@async_ttl_cache(_binance_price_cache)
+async def get_binance_prices(symbols):
     """
-    Get BTC price from Upbit API
+    Get the latest prices of several symbols from Binance API in a single request
     
     Args:
-        max_retries (int): Maximum number of retry attempts
-        retry_delay (int): Delay between retries in seconds
+        symbols (tuple): Trading pair symbols (e.g., ('BTCUSDT', 'ETHUSDT'))
         
     Returns:
-        float: BTC price in KRW
+        dict: Latest price per symbol (None if the request failed)
     """
-    endpoint = "https://api.upbit.com/v1/ticker"
-    params = {'markets': 'KRW-BTC'}
-    headers = {'Accept': 'application/json'}
+    endpoint = "https://api.binance.com/api/v3/ticker/price"
     
-    # 세션 생성
-    session = get_session_with_retries()
+    # 요청 파라미터 (심볼 목록은 공백 없는 JSON 배열)
+    params = {'symbols': orjson.dumps(list(symbols)).decode()}
     
-    for attempt in range(max_retries + 1):
-        try:
-            logger.info(f"업비트에서 BTC 가격 조회 중 (시도 {attempt + 1}/{max_retries + 1})")
-            response = session.get(endpoint, params=params, headers=headers, timeout=10)
-            response.raise_for_status()
+    try:
+        logger.debug("%s 가격 조회 중", symbols)
+        response = await _get(endpoint, params=params)
+        
+        prices = {row['symbol']: float(row['price']) for row in orjson.loads(response.content)}
+        logger.info("%s 가격 조회 성공", symbols)
+        return prices
             
-            data = response.json()
-            if data and len(data) > 0:
-                price = float(data[0]['trade_price'])
-                logger.info(f"업비트 BTC 가격 조회 성공: {price} KRW")
-                return price
-            else:
-                logger.warning("업비트에서 데이터를 찾을 수 없습니다")
-                if attempt < max_retries:
-                    logger.info(f"{retry_delay}초 후 재시도...")
-                    time.sleep(retry_delay)
-                    continue
-                return None
-                
-        except requests.exceptions.RequestException as e:
-            logger.error(f"업비트 BTC 가격 조회 오류: {e}")
-            if attempt < max_retries:
-                logger.info(f"{retry_delay}초 후 재시도...")
-                time.sleep(retry_delay)
-            else:
-                logger.error(f"업비트 BTC 가격에 대한 최대 재시도 횟수에 도달했습니다. 포기합니다.")
-                return None
-        except (ValueError, KeyError, TypeError) as e:
-            logger.error(f"업비트 응답 파싱 오류: {e}")
-            if attempt < max_retries:
-                logger.info(f"{retry_delay}초 후 재시도...")
-                time.sleep(retry_delay)
-            else:
-                logger.error(f"업비트 BTC 가격에 대한 최대 재시도 횟수에 도달했습니다. 포기합니다.")
-                return None
+    except httpx.HTTPError as e:
+        logger.error("%s 가격 조회 오류: %s", symbols, e)
+        return None
+    except (ValueError, KeyError, TypeError) as e:
+        logger.error("%s 응답 파싱 오류: %s", symbols, e)
+        return None
 
-# 업비트 API에서 USDT 가격 조회
-def get_upbit_usdt_price(max_retries=3, retry_delay=2):
+async def _get_upbit_price(market):
     """
-    Get USDT price from Upbit API
+    Get the latest trade price of an Upbit KRW market
     
     Args:
-        max_retries (int): Maximum number of retry attempts
-        retry_delay (int): Delay between retries in seconds
+        market (str): Upbit market code (e.g., 'KRW-BTC')
         
     Returns:
-        float: USDT price in KRW
+        float: Latest price in KRW
     """
     endpoint = "https://api.upbit.com/v1/ticker"
-    params = {'markets': 'KRW-USDT'}
+    params = {'markets': market}
     headers = {'Accept': 'application/json'}
     
-    # 세션 생성
-    session = get_session_with_retries()
-    
-    for attempt in range(max_retries + 1):
-        try:
-            logger.info(f"업비트에서 USDT 가격 조회 중 (시도 {attempt + 1}/{max_retries + 1})")
-            response = session.get(endpoint, params=params, headers=headers, timeout=10)
-            response.raise_for_status()
+    try:
+        logger.debug("업비트에서 %s 가격 조회 중", market)
+        response = await _get(endpoint, params=params, headers=headers)
+        
+        data = orjson.loads(response.content)
+        if not data:
+            logger.warning("업비트에서 %s 데이터를 찾을 수 없습니다", market)
+            return None
+        
+        price = float(data[0]['trade_price'])
+        logger.info("업비트 %s 가격 조회 성공: %s KRW", market, price)
+        return price
             
-            data = response.json()
-            if data and len(data) > 0:
-                price = float(data[0]['trade_price'])
-                logger.info(f"업비트 USDT 가격 조회 성공: {price} KRW")
-                return price
-            else:
-                logger.warning("업비트에서 USDT 데이터를 찾을 수 없습니다")
-                if attempt < max_retries:
-                    logger.info(f"{retry_delay}초 후 재시도...")
-                    time.sleep(retry_delay)
-                    continue
-                return None
-                
-        except requests.exceptions.RequestException as e:
-            logger.error(f"업비트 USDT 가격 조회 오류: {e}")
-            if attempt < max_retries:
-                logger.info(f"{retry_delay}초 후 재시도...")
-                time.sleep(retry_delay)
-            else:
-                logger.error(f"업비트 USDT 가격에 대한 최대 재시도 횟수에 도달했습니다. 포기합니다.")
-                return None
-        except (ValueError, KeyError, TypeError) as e:
-            logger.error(f"업비트 USDT 응답 파싱 오류: {e}")
-            if attempt < max_retries:
-                logger.info(f"{retry_delay}초 후 재시도...")
-                time.sleep(retry_delay)
-            else:
-                logger.error(f"업비트 USDT 가격에 대한 최대 재시도 횟수에 도달했습니다. 포기합니다.")
-                return None
+    except httpx.HTTPError as e:
+        logger.error("업비트 %s 가격 조회 오류: %s", market, e)
+        return None
+    except (ValueError, KeyError, TypeError) as e:
+        logger.error("업비트 %s 응답 파싱 오류: %s", market, e)
+        return None
+
+# 업비트 API에서 BTC 가격 조회
+@async_ttl_cache(_upbit_price_cache)
+async def get_upbit_btc_price():
+    """
+    Get BTC price from Upbit API
+    
+    Returns:
+        float: BTC price in KRW
+    """
+    return await _get_upbit_price('KRW-BTC')
+
+# 업비트 API에서 USDT 가격 조회
+@async_ttl_cache(_upbit_price_cache)
+async def get_upbit_usdt_price():
+    """
+    Get USDT price from Upbit API
+    
+    Returns:
+        float: USDT price in KRW
+    """
+    return await _get_upbit_price('KRW-USDT')
+
+# 네이버 파이낸스 환율 페이지에서 USD 환율 값 추출
+# (#exchangeList 의 첫 번째 a.head.usd 안의 span.value, DOM을 만들지 않고 정규식으로 바로 추출)
+_NAVER_USD_RATE_RE = re.compile(
+    r'id="exchangeList".*?class="head usd".*?class="value">\s*([\d,.]+)\s*<',
+    re.S
+)
+
+# 네이버 파이낸스 요청 헤더 (브라우저 User-Agent)
+_NAVER_HEADERS = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/58.0.3029.110 Safari/537.3'}
 
 # 네이버 파이낸스에서 USD/KRW 환율 조회
-def get_usd_krw_rate_naver(max_retries=3, retry_delay=2):
+async def get_usd_krw_rate_naver():
     """
     Get USD/KRW exchange rate from Naver Finance
     
-    Args:
-        max_retries (int): Maximum number of retry attempts
-        retry_delay (int): Delay between retries in seconds
-        
     Returns:
         float: USD/KRW exchange rate
     """
-    for attempt in range(max_retries + 1):
-        try:
-            logger.info(f"네이버 파이낸스에서 USD/KRW 환율 조회 중 (시도 {attempt + 1}/{max_retries + 1})")
-            
-            # 네이버 파이낸스 환율 페이지 URL
-            url = 'https://finance.naver.com/marketindex/'
-            
-            # 브라우저 User-Agent 헤더 추가
-            headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/58.0.3029.110 Safari/537.3'}
-            
-            # 세션 생성
-            session = get_session_with_retries()
-            
-            # 웹 페이지 요청
-            response = session.get(url, headers=headers, timeout=10)
-            response.raise_for_status()
-            
-            # BeautifulSoup으로 HTML 파싱
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # 환율 정보가 포함된 요소 찾기
-            exchange_rate_element = soup.select_one('#exchangeList > li.on > a.head.usd > div > span.value')
+    try:
+        logger.debug("네이버 파이낸스에서 USD/KRW 환율 조회 중")
+        
+        # 네이버 파이낸스 환율 페이지 URL
+        url = 'https://finance.naver.com/marketindex/'
+        
+        # 웹 페이지 요청
+        response = await _get(url, headers=_NAVER_HEADERS)
+        
+        # 환율 정보가 포함된 요소 찾기
+        exchange_rate_match = _NAVER_USD_RATE_RE.search(response.text)
+        if not exchange_rate_match:
+            logger.warning("네이버 파이낸스 페이지에서 환율 요소를 찾을 수 없습니다")
+            return None
+        
+        # 환율 텍스트 추출 및 float로 변환
+        exchange_rate = float(exchange_rate_match.group(1).replace(',', ''))
+        logger.info("네이버 파이낸스에서 USD/KRW 환율 조회 성공: %s", exchange_rate)
+        return exchange_rate
             
-            if exchange_rate_element:
-                # 환율 텍스트 추출 및 float로 변환
-                exchange_rate_text = exchange_rate_element.text.strip().replace(',', '')
-                exchange_rate = float(exchange_rate_text)
-                logger.info(f"네이버 파이낸스에서 USD/KRW 환율 조회 성공: {exchange_rate}")
-                return exchange_rate
-            else:
-                logger.warning("네이버 파이낸스 페이지에서 환율 요소를 찾을 수 없습니다")
-                if attempt < max_retries:
-                    logger.info(f"{retry_delay}초 후 재시도...")
-                    time.sleep(retry_delay)
-                    continue
-                return None
-                
-        except Exception as e:
-            logger.error(f"네이버 파이낸스에서 USD/KRW 환율 조회 오류: {e}")
-            if attempt < max_retries:
-                logger.info(f"{retry_delay}초 후 재시도...")
-                time.sleep(retry_delay)
-            else:
-                logger.error("네이버 파이낸스에서 USD/KRW 환율에 대한 최대 재시도 횟수에 도달했습니다. 포기합니다.")
-                return None
+    except Exception as e:
+        logger.error("네이버 파이낸스에서 USD/KRW 환율 조회 오류: %s", e)
+        return None
 
 # Yahoo Finance에서 USD/KRW 환율 조회
-def get_usd_krw_rate_yahoo(max_retries=3, retry_delay=2):
+async def get_usd_krw_rate_yahoo():
     """
     Get USD/KRW exchange rate from Yahoo Finance
     
-    Args:
-        max_retries (int): Maximum number of retry attempts
-        retry_delay (int): Delay between retries in seconds
-        
     Returns:
         float: USD/KRW exchange rate
     """
-    for attempt in range(max_retries + 1):
-        try:
-            logger.info(f"Yahoo Finance에서 USD/KRW 환율 조회 중 (시도 {attempt + 1}/{max_retries + 1})")
-            ticker = 'USDKRW=X'
-            data = yf.Ticker(ticker)
-            
-            # 현재 환율 조회
-            exchange_rate = data.info['regularMarketPrice']
-            logger.info(f"Yahoo Finance에서 USD/KRW 환율 조회 성공: {exchange_rate}")
-            return exchange_rate
-            
-        except Exception as e:
-            logger.error(f"Yahoo Finance에서 USD/KRW 환율 조회 오류: {e}")
-            if attempt < max_retries:
-                logger.info(f"{retry_delay}초 후 재시도...")
-                time.sleep(retry_delay)
-            else:
-                logger.error("Yahoo Finance에서 USD/KRW 환율에 대한 최대 재시도 횟수에 도달했습니다. 네이버 파이낸스로 시도합니다...")
-                return None
+    # 차트 API의 meta에 현재 시세가 포함됨 (yfinance처럼 여러 요청으로 메타데이터 전체를 만들지 않음)
+    endpoint = "https://query1.finance.yahoo.com/v8/finance/chart/USDKRW=X"
+    params = {'interval': '1d', 'range': '1d'}
+    headers = {'User-Agent': 'Mozilla/5.0'}
+    
+    try:
+        logger.debug("Yahoo Finance에서 USD/KRW 환율 조회 중")
+        
+        # 현재 환율 조회
+        response = await _get(endpoint, params=params, headers=headers)
+        
+        data = orjson.loads(response.content)
+        exchange_rate = float(data['chart']['result'][0]['meta']['regularMarketPrice'])
+        logger.info("Yahoo Finance에서 USD/KRW 환율 조회 성공: %s", exchange_rate)
+        return exchange_rate
+        
+    except Exception as e:
+        logger.error("Yahoo Finance에서 USD/KRW 환율 조회 오류: %s", e)
+        return None
 
 # USD/KRW 환율 조회 (네이버 및 Yahoo 폴백 메커니즘)
-def get_usd_krw_rate(max_retries=3, retry_delay=2):
+@async_ttl_cache(_fx_rate_cache)
+async def get_usd_krw_rate():
     """
     Get USD/KRW exchange rate (using fallback mechanism)
     First tries Naver Finance, then falls back to Yahoo Finance if that fails
     
-    Args:
-        max_retries (int): Maximum number of retry attempts
-        retry_delay (int): Delay between retries in seconds
-        
     Returns:
         float: USD/KRW exchange rate
     """
     # 먼저 네이버 파이낸스 시도
-    rate = get_usd_krw_rate_naver(max_retries, retry_delay)
+    rate = await get_usd_krw_rate_naver()
     
     # 네이버 파이낸스가 실패하면 Yahoo Finance 시도
     if rate is None:
-        rate = get_usd_krw_rate_yahoo(max_retries, retry_delay)
+        rate = await get_usd_krw_rate_yahoo()
     
     return rate
 
+# 김치 프리미엄 계산에 필요한 시세 조회
+@single_flight
+async def get_kimchi_premium_inputs():
+    """
+    Get the Binance BTC price (USD), Upbit BTC price (KRW) and USD/KRW rate concurrently
+    
+    Concurrent callers share one in-flight fetch, so a burst of requests
+    makes at most one set of upstream calls.
+    
+    Returns:
+        tuple: (binance_price, upbit_price_krw, exchange_rate)
+    """
+    return tuple(await asyncio.gather(
+        get_binance_price('BTCUSDT'),
+        get_upbit_btc_price(),
+        get_usd_krw_rate()
+    ))
+
 # 김치 프리미엄 계산
 def calculate_premium(binance_price, upbit_price_krw, exchange_rate):
     """
@@ -398,15 +393,19 @@ def calculate_premium(binance_price, upbit_price_krw, exchange_rate):
     return premium_percentage
 
 # API 엔드포인트: BTC 달러 가격
-@router.get("/btc/usd", response_model=CryptoPrice, summary="Get BTC price in USD")
-async def get_btc_usd_price(request: Request, api_key: APIKey = Depends(get_api_key_with_tracking)):
+@router.get("/btc/usd", response_model=None, responses={200: {"model": CryptoPrice}}, summary="Get BTC price in USD")
+async def get_btc_usd_price(
+    request: Request,
+    precision: Optional[int] = PrecisionQuery,
+    api_key: APIKey = Depends(verify_api_key)
+):
     """
     Get BTC price in USD from Binance API
     
     Returns:
         CryptoPrice: BTC price information in USD
     """
-    price = get_binance_price('BTCUSDT')
+    price = await get_binance_price('BTCUSDT')
     
     if price is None:
         raise HTTPException(
@@ -414,22 +413,26 @@ async def get_btc_usd_price(request: Request, api_key: APIKey = Depends(get_api_
             detail="Failed to retrieve BTC price from Binance API"
         )
     
-    return CryptoPrice(
-        price=price,
-        currency="USD",
-        timestamp=datetime.utcnow()
-    )
+    return FastJSONResponse({
+        "price": round_significant(price, precision),
+        "currency": "USD",
+        "timestamp": datetime.utcnow()
+    })
 
 # API 엔드포인트: BTC 원화 가격
-@router.get("/btc/krw", response_model=CryptoPrice, summary="Get BTC price in KRW")
-async def get_btc_krw_price(request: Request, api_key: APIKey = Depends(get_api_key_with_tracking)):
+@router.get("/btc/krw", response_model=None, responses={200: {"model": CryptoPrice}}, summary="Get BTC price in KRW")
+async def get_btc_krw_price(
+    request: Request,
+    precision: Optional[int] = PrecisionQuery,
+    api_key: APIKey = Depends(verify_api_key)
+):
     """
     Get BTC price in KRW from Upbit API
     
     Returns:
         CryptoPrice: BTC price information in KRW
     """
-    price = get_upbit_btc_price()
+    price = await get_upbit_btc_price()
     
     if price is None:
         raise HTTPException(
@@ -437,22 +440,26 @@ async def get_btc_krw_price(request: Request, api_key: APIKey = Depends(get_api_
             detail="Failed to retrieve BTC price from Upbit API"
         )
     
-    return CryptoPrice(
-        price=price,
-        currency="KRW",
-        timestamp=datetime.utcnow()
-    )
+    return FastJSONResponse({
+        "price": round_significant(price, precision),
+        "currency": "KRW",
+        "timestamp": datetime.utcnow()
+    })
 
 # API 엔드포인트: USDT 원화 가격
-@router.get("/usdt/krw", response_model=CryptoPrice, summary="Get USDT price in KRW")
-async def get_usdt_krw_price(request: Request, api_key: APIKey = Depends(get_api_key_with_tracking)):
+@router.get("/usdt/krw", response_model=None, responses={200: {"model": CryptoPrice}}, summary="Get USDT price in KRW")
+async def get_usdt_krw_price(
+    request: Request,
+    precision: Optional[int] = PrecisionQuery,
+    api_key: APIKey = Depends(verify_api_key)
+):
     """
     Get USDT price in KRW from Upbit API
     
     Returns:
         CryptoPrice: USDT price information in KRW
     """
-    price = get_upbit_usdt_price()
+    price = await get_upbit_usdt_price()
     
     if price is None:
         raise HTTPException(
@@ -460,32 +467,27 @@ async def get_usdt_krw_price(request: Request, api_key: APIKey = Depends(get_api
             detail="Failed to retrieve USDT price from Upbit API"
         )
     
-    return CryptoPrice(
-        price=price,
-        currency="KRW",
-        timestamp=datetime.utcnow()
-    )
+    return FastJSONResponse({
+        "price": round_significant(price, precision),
+        "currency": "KRW",
+        "timestamp": datetime.utcnow()
+    })
 
 # API 엔드포인트: 김치 프리미엄 비율
-@router.get("/kimchi-premium", response_model=KimchiPremium, summary="Get kimchi premium percentage")
-async def get_kimchi_premium(request: Request, api_key: APIKey = Depends(get_api_key_with_tracking)):
+@router.get("/kimchi-premium", response_model=None, responses={200: {"model": KimchiPremium}}, summary="Get kimchi premium percentage")
+async def get_kimchi_premium(
+    request: Request,
+    precision: Optional[int] = PrecisionQuery,
+    api_key: APIKey = Depends(verify_api_key)
+):
     """
     Get kimchi premium percentage between Upbit and Binance prices
     
     Returns:
         KimchiPremium: Kimchi premium information
     """
-    # ThreadPoolExecutor를 사용하여 모든 가격을 병렬로 조회
-    with concurrent.futures.ThreadPoolExecutor() as executor:
-        # 모든 작업을 executor에 제출
-        binance_btc_future = executor.submit(get_binance_price, 'BTCUSDT')
-        upbit_btc_future = executor.submit(get_upbit_btc_price)
-        usd_krw_future = executor.submit(get_usd_krw_rate)
-        
-        # futures에서 결과 가져오기
-        binance_btc_price = binance_btc_future.result()
-        upbit_btc_price = upbit_btc_future.result()
-        usd_krw_rate = usd_krw_future.result()
+    # 모든 가격을 동시에 조회 (동시 요청은 진행 중인 하나의 조회 결과를 공유)
+    binance_btc_price, upbit_btc_price, usd_krw_rate = await get_kimchi_premium_inputs()
     
     # 필요한 값 중 하나라도 None인지 확인
     if None in [binance_btc_price, upbit_btc_price, usd_krw_rate]:
@@ -503,44 +505,39 @@ async def get_kimchi_premium(request: Request, api_key: APIKey = Depends(get_api
             detail="Failed to calculate kimchi premium"
         )
     
-    return KimchiPremium(
-        premium_percentage=premium,
-        binance_price_usd=binance_btc_price,
-        upbit_price_krw=upbit_btc_price,
-        exchange_rate=usd_krw_rate,
-        timestamp=datetime.utcnow()
-    )
+    return FastJSONResponse({
+        "premium_percentage": round_significant(premium, precision),
+        "binance_price_usd": round_significant(binance_btc_price, precision),
+        "upbit_price_krw": round_significant(upbit_btc_price, precision),
+        "exchange_rate": round_significant(usd_krw_rate, precision),
+        "timestamp": datetime.utcnow()
+    })
 
 # API 엔드포인트: 주요 암호화폐 가격 목록
-@router.get("/prices", response_model=CryptoPriceList, summary="Get major cryptocurrency prices")
-async def get_crypto_prices(request: Request, api_key: APIKey = Depends(get_api_key_with_tracking)):
+@router.get("/prices", response_model=None, responses={200: {"model": CryptoPriceList}}, summary="Get major cryptocurrency prices")
+async def get_crypto_prices(
+    request: Request,
+    precision: Optional[int] = PrecisionQuery,
+    api_key: APIKey = Depends(verify_api_key)
+):
     """
     Get major cryptocurrency prices (BTC, ETH, XRP) from Binance API
     
     Returns:
         CryptoPriceList: Major cryptocurrency price list
     """
-    # ThreadPoolExecutor를 사용하여 모든 가격을 병렬로 조회
-    with concurrent.futures.ThreadPoolExecutor() as executor:
-        # 모든 작업을 executor에 제출
-        btc_future = executor.submit(get_binance_price, 'BTCUSDT')
-        eth_future = executor.submit(get_binance_price, 'ETHUSDT')
-        xrp_future = executor.submit(get_binance_price, 'XRPUSDT')
-        
-        # futures에서 결과 가져오기
-        btc_price = btc_future.result()
-        eth_price = eth_future.result()
-        xrp_price = xrp_future.result()
+    # 모든 가격을 한 번의 요청으로 조회
+    binance_prices = await get_binance_prices(('BTCUSDT', 'ETHUSDT', 'XRPUSDT')) or {}
     
     # 결과 딕셔너리 생성
     prices = {
-        'BTC': btc_price,
-        'ETH': eth_price,
-        'XRP': xrp_price
+        'BTC': binance_prices.get('BTCUSDT'),
+        'ETH': binance_prices.get('ETHUSDT'),
+        'XRP': binance_prices.get('XRPUSDT')
     }
     
     # None 값 필터링
-    prices = {k: v for k, v in prices.items() if v is not None}
+    prices = {k: round_significant(v, precision) for k, v in prices.items() if v is not None}
     
     if not prices:
         raise HTTPException(
@@ -548,8 +545,8 @@ async def get_crypto_prices(request: Request, api_key: APIKey = Depends(get_api_
             detail="Failed to retrieve cryptocurrency prices"
         )
     
-    return CryptoPriceList(
-        prices=prices,
-        currency="USD",
-        timestamp=datetime.utcnow()
-    )
+    return FastJSONResponse({
+        "prices": prices,
+        "currency": "USD",
+        "timestamp": datetime.utcnow()
+    })
@@ -1,10 +1,11 @@
-from fastapi import APIRouter, Depends, Request
-from typing import Dict, List
+from fastapi import APIRouter, Depends, Query, Request
+from typing import Dict, List, Optional, Set
 from datetime import datetime
 from pydantic import BaseModel
 
 from app.models import APIKey
-from app.auth.api_key import get_api_key_with_tracking
+from app.auth.api_key import verify_api_key
+from app.utils.sparse import parse_fields, select_fields
 
 router = APIRouter()
 
@@ -24,7 +25,12 @@ class OpenInterest(BaseModel):
 
 # Funding rates for cryptocurrency futures
 @router.get("/funding-rates", summary="Get current funding rates for major cryptocurrency futures markets")
-async def get_funding_rates(request: Request, api_key: APIKey = Depends(get_api_key_with_tracking)):
+async def get_funding_rates(
+    request: Request,
+    fields: Optional[Set[str]] = Depends(parse_fields),
+    limit: Optional[int] = Query(None, ge=1, le=100, description="반환할 최대 항목 수"),
+    api_key: APIKey = Depends(verify_api_key)
+):
     """
     Get current funding rates for major cryptocurrency futures markets
     
@@ -32,7 +38,7 @@ async def get_funding_rates(request: Request, api_key: APIKey = Depends(get_api_
         List[FundingRate]: List of funding rates for different cryptocurrency pairs
     """
     # Dummy data
-    return [
+    items = [
         FundingRate(
             symbol="BTC/USDT",
             exchange="Binance",
@@ -69,10 +75,16 @@ async def get_funding_rates(request: Request, api_key: APIKey = Depends(get_api_
             interval="8h"
         )
     ]
+    return select_fields(items[:limit], fields)
 
 # Open interest for cryptocurrency derivatives
 @router.get("/open-interest", summary="Get open interest ratios for major cryptocurrency derivatives")
-async def get_open_interest(request: Request, api_key: APIKey = Depends(get_api_key_with_tracking)):
+async def get_open_interest(
+    request: Request,
+    fields: Optional[Set[str]] = Depends(parse_fields),
+    limit: Optional[int] = Query(None, ge=1, le=100, description="반환할 최대 항목 수"),
+    api_key: APIKey = Depends(verify_api_key)
+):
     """
     Get open interest ratios for major cryptocurrency derivatives
     
@@ -80,7 +92,7 @@ async def get_open_interest(request: Request, api_key: APIKey = Depends(get_api_
         List[OpenInterest]: List of open interest data for different cryptocurrency pairs
     """
     # Dummy data
-    return [
+    items = [
         OpenInterest(
             symbol="BTC/USDT",
             exchange="Binance",
@@ -117,3 +129,4 @@ async def get_open_interest(request: Request, api_key: APIKey = Depends(get_api_
             change_24h=4.2
         )
     ]
+    return select_fields(items[:limit], fields)
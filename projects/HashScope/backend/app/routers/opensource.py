@@ -4,7 +4,7 @@ from datetime import datetime
 from pydantic import BaseModel
 
 from app.models import APIKey
-from app.auth.api_key import get_api_key_with_tracking
+from app.auth.api_key import verify_api_key
 
 router = APIRouter()
 
@@ -32,7 +32,7 @@ class RepositoryStats(BaseModel):
 
 # Bitcoin Core repository activity
 @router.get("/bitcoin", summary="Get latest pull requests, stars, and activities from Bitcoin Core repository")
-async def get_bitcoin_activity(request: Request, api_key: APIKey = Depends(get_api_key_with_tracking)):
+async def get_bitcoin_activity(request: Request, api_key: APIKey = Depends(verify_api_key)):
     """
     Get latest pull requests, stars, and activities from Bitcoin Core repository
     
@@ -105,7 +105,7 @@ async def get_bitcoin_activity(request: Request, api_key: APIKey = Depends(get_a
 
 # Ethereum Core repositories activity
 @router.get("/ethereum", summary="Get latest pull requests, stars, and activities from Ethereum Core repositories")
-async def get_ethereum_activity(request: Request, api_key: APIKey = Depends(get_api_key_with_tracking)):
+async def get_ethereum_activity(request: Request, api_key: APIKey = Depends(verify_api_key)):
     """
     Get latest pull requests, stars, and activities from Ethereum Core repositories
     
@@ -1,10 +1,11 @@
-from fastapi import APIRouter, Depends, Request
-from typing import Dict, List
+from fastapi import APIRouter, Depends, Query, Request
+from typing import Dict, List, Optional, Set
 from datetime import datetime
 from pydantic import BaseModel
 
 from app.models import APIKey
-from app.auth.api_key import get_api_key_with_tracking
+from app.auth.api_key import verify_api_key
+from app.utils.sparse import parse_fields, select_fields
 
 router = APIRouter()
 
@@ -28,7 +29,12 @@ class EthereumStandard(BaseModel):
 
 # HashKey Chain updates
 @router.get("/hsk", summary="Get latest updates and developments from HashKey Chain")
-async def get_hsk_updates(request: Request, api_key: APIKey = Depends(get_api_key_with_tracking)):
+async def get_hsk_updates(
+    request: Request,
+    fields: Optional[Set[str]] = Depends(parse_fields),
+    limit: Optional[int] = Query(None, ge=1, le=100, description="반환할 최대 항목 수"),
+    api_key: APIKey = Depends(verify_api_key)
+):
     """
     Get latest updates and developments from HashKey Chain
     
@@ -36,7 +42,7 @@ async def get_hsk_updates(request: Request, api_key: APIKey = Depends(get_api_ke
         List[ProjectUpdate]: List of recent updates from HashKey Chain
     """
     # Dummy data
-    return [
+    items = [
         ProjectUpdate(
             title="HashKey Chain Mainnet Upgrade v1.2.0",
             description="Major network upgrade improving transaction throughput and reducing gas fees",
@@ -66,10 +72,16 @@ async def get_hsk_updates(request: Request, api_key: APIKey = Depends(get_api_ke
             type="integration"
         )
     ]
+    return select_fields(items[:limit], fields)
 
 # Ethereum standards
 @router.get("/ethereum/standards", summary="Get information about new Ethereum standards and proposals")
-async def get_ethereum_standards(request: Request, api_key: APIKey = Depends(get_api_key_with_tracking)):
+async def get_ethereum_standards(
+    request: Request,
+    fields: Optional[Set[str]] = Depends(parse_fields),
+    limit: Optional[int] = Query(None, ge=1, le=100, description="반환할 최대 항목 수"),
+    api_key: APIKey = Depends(verify_api_key)
+):
     """
     Get information about new Ethereum standards and proposals
     
@@ -77,7 +89,7 @@ async def get_ethereum_standards(request: Request, api_key: APIKey = Depends(get
         List[EthereumStandard]: List of recent Ethereum Improvement Proposals (EIPs)
     """
     # Dummy data
-    return [
+    items = [
         EthereumStandard(
             eip_number=4844,
             title="Shard Blob Transactions",
@@ -112,10 +124,16 @@ async def get_ethereum_standards(request: Request, api_key: APIKey = Depends(get
             description="A standard for NFTs to own assets and execute transactions, allowing them to function like traditional accounts."
         )
     ]
+    return select_fields(items[:limit], fields)
 
 # Solana updates
 @router.get("/solana", summary="Get latest updates and developments from Solana blockchain")
-async def get_solana_updates(request: Request, api_key: APIKey = Depends(get_api_key_with_tracking)):
+async def get_solana_updates(
+    request: Request,
+    fields: Optional[Set[str]] = Depends(parse_fields),
+    limit: Optional[int] = Query(None, ge=1, le=100, description="반환할 최대 항목 수"),
+    api_key: APIKey = Depends(verify_api_key)
+):
     """
     Get latest updates and developments from Solana blockchain
     
@@ -123,7 +141,7 @@ async def get_solana_updates(request: Request, api_key: APIKey = Depends(get_api
         List[ProjectUpdate]: List of recent updates from Solana blockchain
     """
     # Dummy data
-    return [
+    items = [
         ProjectUpdate(
             title="Solana Mainnet Beta Upgrade to v1.16",
             description="Major network upgrade improving transaction processing and reducing network congestion",
@@ -153,3 +171,4 @@ async def get_solana_updates(request: Request, api_key: APIKey = Depends(get_api
             type="announcement"
         )
     ]
+    return select_fields(items[:limit], fields)
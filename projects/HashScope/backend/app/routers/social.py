@@ -1,10 +1,11 @@
-from fastapi import APIRouter, Depends, Request
-from typing import Dict, List
+from fastapi import APIRouter, Depends, Query, Request
+from typing import Dict, List, Optional, Set
 from datetime import datetime
 from pydantic import BaseModel
 
 from app.models import APIKey
-from app.auth.api_key import get_api_key_with_tracking
+from app.auth.api_key import verify_api_key
+from app.utils.sparse import parse_fields, select_fields
 
 router = APIRouter()
 
@@ -26,7 +27,12 @@ class TrendingTopic(BaseModel):
 
 # Trump's latest posts from Truth Social
 @router.get("/trump", summary="Get Donald Trump's latest posts from Truth Social")
-async def get_trump_posts(request: Request, api_key: APIKey = Depends(get_api_key_with_tracking)):
+async def get_trump_posts(
+    request: Request,
+    fields: Optional[Set[str]] = Depends(parse_fields),
+    limit: Optional[int] = Query(None, ge=1, le=100, description="반환할 최대 항목 수"),
+    api_key: APIKey = Depends(verify_api_key)
+):
     """
     Get Donald Trump's latest posts from Truth Social
     
@@ -34,7 +40,7 @@ async def get_trump_posts(request: Request, api_key: APIKey = Depends(get_api_ke
         List[SocialPost]: List of Trump's latest posts
     """
     # Dummy data
-    return [
+    items = [
         SocialPost(
             id="ts_123456789",
             username="realDonaldTrump",
@@ -63,10 +69,16 @@ async def get_trump_posts(request: Request, api_key: APIKey = Depends(get_api_ke
             comments=14000
         )
     ]
+    return select_fields(items[:limit], fields)
 
 # Elon Musk's latest posts from X (Twitter)
 @router.get("/elon", summary="Get Elon Musk's latest posts from X (Twitter)")
-async def get_elon_posts(request: Request, api_key: APIKey = Depends(get_api_key_with_tracking)):
+async def get_elon_posts(
+    request: Request,
+    fields: Optional[Set[str]] = Depends(parse_fields),
+    limit: Optional[int] = Query(None, ge=1, le=100, description="반환할 최대 항목 수"),
+    api_key: APIKey = Depends(verify_api_key)
+):
     """
     Get Elon Musk's latest posts from X (Twitter)
     
@@ -74,7 +86,7 @@ async def get_elon_posts(request: Request, api_key: APIKey = Depends(get_api_key
         List[SocialPost]: List of Elon Musk's latest posts
     """
     # Dummy data
-    return [
+    items = [
         SocialPost(
             id="x_987654321",
             username="elonmusk",
@@ -103,10 +115,16 @@ async def get_elon_posts(request: Request, api_key: APIKey = Depends(get_api_key
             comments=40000
         )
     ]
+    return select_fields(items[:limit], fields)
 
 # X (Twitter) trending topics
 @router.get("/x/trends", summary="Get current trending topics on X (Twitter)")
-async def get_x_trends(request: Request, api_key: APIKey = Depends(get_api_key_with_tracking)):
+async def get_x_trends(
+    request: Request,
+    fields: Optional[Set[str]] = Depends(parse_fields),
+    limit: Optional[int] = Query(None, ge=1, le=100, description="반환할 최대 항목 수"),
+    api_key: APIKey = Depends(verify_api_key)
+):
     """
     Get current trending topics on X (Twitter)
     
@@ -114,7 +132,7 @@ async def get_x_trends(request: Request, api_key: APIKey = Depends(get_api_key_w
         List[TrendingTopic]: List of trending topics on X (Twitter)
     """
     # Dummy data
-    return [
+    items = [
         TrendingTopic(
             id="trend_1",
             name="#Crypto",
@@ -146,3 +164,4 @@ async def get_x_trends(request: Request, api_key: APIKey = Depends(get_api_key_w
             category="Business & Finance"
         )
     ]
+    return select_fields(items[:limit], fields)
@@ -1,13 +1,21 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Body
-from sqlalchemy.orm import Session
-from typing import List, Optional
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status, Body, Query, Request, Response
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import bindparam, case, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from typing import Dict, List, Optional, Set
 from pydantic import BaseModel, Field
-import os
+import asyncio
+import functools
+import hashlib
+import math
 from datetime import datetime
 
-from app.database import get_db
+from app.database import AsyncSessionLocal, get_async_db
 from app.models import User, Transaction
 from app.blockchain.contracts import (
+    DEPOSIT_CONTRACT_ADDRESS,
     get_balance, 
     get_contract_balance,
     get_wallet_balance,
@@ -15,6 +23,7 @@ from app.blockchain.contracts import (
     verify_withdraw_transaction,
     verify_usage_deduction_transaction,
     get_transaction_status,
+    invalidate_balance,
     build_deposit_transaction,
     sign_transaction,
     wei_to_hsk,
@@ -22,13 +31,37 @@ from app.blockchain.contracts import (
     format_wei_to_hsk
 )
 from app.auth.dependencies import get_current_user, get_current_admin_user
+from app.utils.cache import response_cache
+from app.utils.log import get_logger
+from app.utils.rate_limit import rate_limiter
+from app.utils.responses import FastJSONResponse
 from app.utils.wallet import normalize_address, checksum_address, is_valid_address
 
+logger = get_logger("users")
+
 router = APIRouter(
     tags=["users"],
     responses={404: {"description": "Not found"}},
 )
 
+# 잔액 응답 캐시 유지 시간 (초, 지갑 UI의 반복 폴링을 RPC 호출 없이 처리하고 예치/인출 확인 시 제거)
+BALANCE_RESPONSE_CACHE_TTL = 5
+
+# 예치/인출 안내 응답의 브라우저/프록시 캐시 시간 (초, 환경 변수로 정해지는 값만 포함)
+INFO_RESPONSE_MAX_AGE = 3600
+
+# 같은 트랜잭션의 예치 알림 재전송을 거부하는 시간 (초)
+NOTIFY_DEDUPE_TTL = 60
+
+# 확인할 수 없는 예치 트랜잭션(블록 미포함, RPC 오류)을 다시 검증하기 전 대기 시간 (초)
+SETTLE_RETRY_DELAYS = (2, 5, 15, 30)
+
+# 클라이언트(IP)별 분당 예치 알림 허용 건수 (일괄 알림은 트랜잭션 수만큼 차감)
+NOTIFY_RATE_LIMIT_PER_MINUTE = 120
+
+def _balance_cache_key(wallet_address: str) -> str:
+    return f"balance:{wallet_address}"
+
 # 사용자 스키마
 class UserResponse(BaseModel):
     wallet_address: str
@@ -38,7 +71,7 @@ class UserResponse(BaseModel):
     last_login_at: Optional[datetime] = None
 
     class Config:
-        orm_mode = True
+        from_attributes = True
         
     def dict(self, *args, **kwargs):
         # 기본 dict 메서드 호출
@@ -110,53 +143,187 @@ class TransactionNotify(BaseModel):
     tx_hash: str
     tx_type: str = "deposit"  # deposit, withdraw, usage
 
+# 트랜잭션 일괄 알림 스키마
+class TransactionNotifyBatch(BaseModel):
+    items: List[TransactionNotify] = Field(..., min_length=1, max_length=100)
+
 # 트랜잭션 상태 응답 스키마
 class TransactionStatusResponse(BaseModel):
     status: str
     message: Optional[str] = None
 
+# 트랜잭션 내역 응답 스키마
+class TransactionResponse(BaseModel):
+    id: int
+    tx_hash: str
+    amount: int
+    tx_type: str
+    status: str
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+# 예치 내역 응답 스키마
+class DepositHistoryResponse(BaseModel):
+    items: List[TransactionResponse]
+    total: int
+
+# INSERT ... ON CONFLICT DO NOTHING을 지원하는 방언
+_INSERT_IGNORE_INSERTS = {
+    "postgresql": postgresql_insert,
+    "sqlite": sqlite_insert,
+}
+
+async def _insert_transaction_if_new(db: AsyncSession, **values) -> Optional[int]:
+    """
+    tx_hash가 처음 들어온 트랜잭션만 기록합니다.
+    
+    tx_hash 유니크 제약에 맡겨 중복 확인과 삽입을 한 번의 왕복으로 처리하므로
+    같은 트랜잭션 알림이 동시에 들어와도 한 번만 기록됩니다.
+    
+    Returns:
+        새로 기록된 트랜잭션 ID (이미 기록된 tx_hash인 경우 None)
+    """
+    insert = _INSERT_IGNORE_INSERTS.get(db.get_bind().dialect.name)
+    if insert is None:
+        # ON CONFLICT를 지원하지 않는 데이터베이스용 폴백
+        if (await db.execute(select(Transaction.id).where(Transaction.tx_hash == values["tx_hash"]))).first():
+            return None
+        tx = Transaction(**values)
+        db.add(tx)
+        await db.flush()
+        return tx.id
+    
+    stmt = insert(Transaction).values(**values)
+    return (await db.execute(
+        stmt.on_conflict_do_nothing(index_elements=[Transaction.tx_hash]).returning(Transaction.id)
+    )).scalar()
+
+async def _insert_transactions_if_new(db: AsyncSession, rows: List[Dict]) -> Set[str]:
+    """
+    여러 트랜잭션을 한 번의 INSERT 문으로 기록합니다. (이미 기록된 tx_hash는 건너뜀)
+    
+    Returns:
+        새로 기록된 트랜잭션의 tx_hash 집합
+    """
+    insert = _INSERT_IGNORE_INSERTS.get(db.get_bind().dialect.name)
+    if insert is None:
+        # ON CONFLICT를 지원하지 않는 데이터베이스용 폴백
+        return {row["tx_hash"] for row in rows if await _insert_transaction_if_new(db, **row) is not None}
+    
+    stmt = insert(Transaction).values(rows)
+    return set((await db.execute(
+        stmt.on_conflict_do_nothing(index_elements=[Transaction.tx_hash]).returning(Transaction.tx_hash)
+    )).scalars())
+
+async def _create_missing_users(db: AsyncSession, wallet_addresses: Set[str]):
+    """
+    등록되지 않은 지갑 주소의 사용자를 한 번의 INSERT 문으로 생성합니다.
+    """
+    rows = [
+        {"wallet_address": wallet_address, "balance": 0, "is_admin": False, "created_at": datetime.utcnow()}
+        for wallet_address in wallet_addresses
+    ]
+    insert = _INSERT_IGNORE_INSERTS.get(db.get_bind().dialect.name)
+    if insert is None:
+        # ON CONFLICT를 지원하지 않는 데이터베이스용 폴백
+        existing = set((await db.execute(
+            select(User.wallet_address).where(User.wallet_address.in_(wallet_addresses))
+        )).scalars())
+        db.add_all(User(**row) for row in rows if row["wallet_address"] not in existing)
+        await db.flush()
+        return
+    
+    await db.execute(insert(User).values(rows).on_conflict_do_nothing(index_elements=[User.wallet_address]))
+
+# 예치 확인 후 사용자 잔액 일괄 갱신 문
+# 블록체인 잔액을 조회했으면 그 값을, 아니면 현재 DB 잔액에 예치 금액을 더한 값을 저장
+_users = User.__table__
+_DEPOSIT_BALANCE_UPDATE = (
+    update(_users)
+    .where(_users.c.wallet_address == bindparam("wallet"))
+    .values(
+        balance=case(
+            (bindparam("chain_balance") > 0, bindparam("chain_balance")),
+            else_=func.coalesce(_users.c.balance, 0) + bindparam("deposit_amount")
+        )
+    )
+)
+
 # 사용자 목록 조회
 @router.get("/", response_model=List[UserResponse])
-def read_users(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    users = db.query(User).offset(skip).limit(limit).all()
+async def read_users(skip: int = 0, limit: int = 100, db: AsyncSession = Depends(get_async_db)):
+    users = (await db.execute(select(User).offset(skip).limit(limit))).scalars().all()
     return users
 
 # 사용자 상세 조회
 @router.get("/{wallet_address}", response_model=UserResponse)
-def read_user(wallet_address: str, db: Session = Depends(get_db)):
+async def read_user(wallet_address: str, db: AsyncSession = Depends(get_async_db)):
     wallet_address = normalize_address(wallet_address)
-    user = db.query(User).filter(User.wallet_address == wallet_address).first()
+    user = (await db.execute(select(User).where(User.wallet_address == wallet_address))).scalar_one_or_none()
     if user is None:
         raise HTTPException(status_code=404, detail="User not found")
     return user
 
 # 사용자 잔액 조회
 @router.get("/{wallet_address}/balance")
-def read_user_balance(wallet_address: str, db: Session = Depends(get_db)):
+async def read_user_balance(wallet_address: str, db: AsyncSession = Depends(get_async_db)):
     wallet_address = normalize_address(wallet_address)
-    user = db.query(User).filter(User.wallet_address == wallet_address).first()
-    if user is None:
-        raise HTTPException(status_code=404, detail="User not found")
     
-    # 블록체인에서 실제 잔액 조회
-    balance = get_balance(wallet_address)
+    # 직렬화된 잔액 응답 캐시 확인 (짧은 시간 동안 RPC 호출과 DB 조회 생략)
+    cache_key = _balance_cache_key(wallet_address)
+    cached = await response_cache.get(cache_key)
+    if cached is not None:
+        return Response(content=cached, media_type="application/json")
     
-    return {
+    # 사용자 확인(DB)과 블록체인 실제 잔액 조회(RPC)를 동시에 수행
+    user_result, balance = await asyncio.gather(
+        db.execute(select(User.wallet_address).where(User.wallet_address == wallet_address)),
+        get_balance(wallet_address)
+    )
+    if user_result.first() is None:
+        raise HTTPException(status_code=404, detail="User not found")
+    
+    response = FastJSONResponse(jsonable_encoder({
         "wallet_address": checksum_address(wallet_address),
         "balance_wei": balance,
         "balance_hsk": wei_to_hsk(balance),
         "formatted_balance": format_wei_to_hsk(balance)
-    }
+    }))
+    await response_cache.set(cache_key, response.body, ttl=BALANCE_RESPONSE_CACHE_TTL)
+    return response
+
+@functools.lru_cache(maxsize=None)
+def _strong_etag(body: str) -> str:
+    return f'"{hashlib.sha256(body.encode()).hexdigest()}"'
+
+def _info_response(request: Request, body: str) -> Response:
+    """
+    미리 직렬화된 안내 응답을 강한 ETag, 공개 캐시 헤더와 함께 반환합니다.
+    
+    클라이언트/CDN이 보낸 If-None-Match가 일치하면 본문 없이 304로 응답합니다.
+    """
+    etag = _strong_etag(body)
+    headers = {"Cache-Control": f"public, max-age={INFO_RESPONSE_MAX_AGE}", "ETag": etag}
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and etag in [tag.strip() for tag in if_none_match.split(",")]:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+# 예치 정보 응답 (환경 변수로 정해지므로 처음 요청 시 한 번만 직렬화)
+@functools.lru_cache(maxsize=1)
+def _deposit_info_json() -> str:
+    return DepositResponse(
+        message="아래 주소로 HSK를 전송하여 예치할 수 있습니다.",
+        deposit_address=DEPOSIT_CONTRACT_ADDRESS,
+        amount=0
+    ).model_dump_json()
 
 # 예치 정보 조회
 @router.get("/deposit/info", response_model=DepositResponse)
-def get_deposit_info():
-    deposit_contract = os.getenv("DEPOSIT_CONTRACT_ADDRESS")
-    return {
-        "message": "아래 주소로 HSK를 전송하여 예치할 수 있습니다.",
-        "deposit_address": deposit_contract,
-        "amount": 0
-    }
+async def get_deposit_info(request: Request):
+    return _info_response(request, _deposit_info_json())
 
 # 트랜잭션 서명 및 전송
 @router.post("/deposit/sign", response_model=SignTransactionResponse)
@@ -186,10 +353,10 @@ async def sign_deposit_transaction(
     
     try:
         # 예치 트랜잭션 생성
-        unsigned_tx = build_deposit_transaction(wallet_address, request.amount)
+        unsigned_tx = await build_deposit_transaction(wallet_address, request.amount)
         
         # 트랜잭션 서명
-        tx_hash = sign_transaction(unsigned_tx, request.private_key)
+        tx_hash = await sign_transaction(unsigned_tx, request.private_key)
         
         return {
             "tx_hash": tx_hash,
@@ -202,119 +369,336 @@ async def sign_deposit_transaction(
             detail=f"Failed to sign transaction: {str(e)}"
         )
 
+# 백그라운드에서 검증 중인 예치 트랜잭션 해시 (같은 트랜잭션을 중복 검증하지 않음)
+_settling_deposits: Set[str] = set()
+
+async def _release_notify(tx_hash: str):
+    """
+    트랜잭션 알림 처리 권한을 해제하여 클라이언트가 바로 다시 알릴 수 있도록 합니다.
+    """
+    await response_cache.delete(f"notify:{tx_hash}")
+
+async def settle_deposits(tx_hashes: List[str]):
+    """
+    pending 상태로 기록된 예치 트랜잭션들을 검증하고 잔액에 반영합니다. (응답 이후 백그라운드에서 실행)
+    
+    검증과 잔액 조회는 동시에 수행하고, 트랜잭션 확정, 사용자 생성, 잔액 갱신은 한 번에 커밋합니다.
+    아직 블록에 포함되지 않았거나 RPC 오류로 확인할 수 없으면 SETTLE_RETRY_DELAYS 간격으로 다시 검증하고,
+    실패한 트랜잭션이 확실하면 failed로 기록합니다.
+    재시도 후에도 확인할 수 없는 트랜잭션은 pending으로 남겨 다음 알림에서 다시 검증합니다.
+    """
+    _settling_deposits.update(tx_hashes)
+    try:
+        # 트랜잭션 동시 검증 (확인할 수 없는 트랜잭션만 간격을 늘려 재시도)
+        verified: Dict[str, dict] = {}
+        failed: List[str] = []
+        unresolved = list(tx_hashes)
+        for delay in (0,) + tuple(SETTLE_RETRY_DELAYS):
+            if not unresolved:
+                break
+            if delay:
+                await asyncio.sleep(delay)
+            tx_infos = await asyncio.gather(*(verify_deposit_transaction(tx_hash) for tx_hash in unresolved))
+            retry = []
+            for tx_hash, tx_info in zip(unresolved, tx_infos):
+                if tx_info.get("success", False):
+                    verified[tx_hash] = tx_info
+                elif tx_info.get("retryable", False):
+                    retry.append(tx_hash)
+                else:
+                    # 실패했거나 예치가 아닌 트랜잭션
+                    failed.append(tx_hash)
+            unresolved = retry
+        
+        if not verified and not failed:
+            return
+        
+        # 지갑 주소 정규화
+        for tx_info in verified.values():
+            tx_info["user"] = normalize_address(tx_info["user"])
+        wallet_addresses = list({tx_info["user"] for tx_info in verified.values()})
+        
+        # 블록체인에서 최신 잔액 조회 (캐시된 예치 전 잔액을 쓰지 않도록 무효화)
+        for wallet_address in wallet_addresses:
+            invalidate_balance(wallet_address)
+        balances = await asyncio.gather(*(get_balance(wallet_address) for wallet_address in wallet_addresses))
+        blockchain_balances = dict(zip(wallet_addresses, balances))
+        
+        async with AsyncSessionLocal() as db:
+            if failed:
+                await db.execute(
+                    update(Transaction.__table__).where(
+                        Transaction.tx_hash.in_(failed),
+                        Transaction.status == "pending"
+                    ).values(status="failed")
+                )
+            
+            await _create_missing_users(db, set(wallet_addresses))
+            
+            # 아직 pending인 트랜잭션만 확정하고 지갑별 예치 금액 합산
+            deposit_amounts: Dict[str, int] = {}
+            for tx_hash, tx_info in verified.items():
+                confirmed = await db.execute(
+                    update(Transaction.__table__).where(
+                        Transaction.tx_hash == tx_hash,
+                        Transaction.status == "pending"
+                    ).values(user_wallet=tx_info["user"], amount=tx_info["amount"], status="confirmed")
+                )
+                if confirmed.rowcount:
+                    deposit_amounts[tx_info["user"]] = deposit_amounts.get(tx_info["user"], 0) + tx_info["amount"]
+            
+            if deposit_amounts:
+                await db.execute(_DEPOSIT_BALANCE_UPDATE, [
+                    {"wallet": wallet, "chain_balance": blockchain_balances[wallet], "deposit_amount": amount}
+                    for wallet, amount in deposit_amounts.items()
+                ])
+            
+            # 트랜잭션 확정, 사용자 생성, 잔액 갱신을 한 번에 커밋
+            await db.commit()
+        await asyncio.gather(*(response_cache.delete(_balance_cache_key(wallet)) for wallet in deposit_amounts))
+    except Exception as e:
+        logger.exception("Error in settle_deposits: %s", e)
+    finally:
+        _settling_deposits.difference_update(tx_hashes)
+        # 처리가 끝났으므로 다시 알리면 현재 상태를 바로 응답하거나 pending 기록을 다시 검증
+        await asyncio.gather(*(_release_notify(tx_hash) for tx_hash in tx_hashes))
+
+def _schedule_settlement(background_tasks: BackgroundTasks, tx_hashes: List[str]):
+    """
+    검증 중이 아닌 트랜잭션들을 모아 응답 이후 settle_deposits 한 번으로 검증하도록 예약합니다.
+    """
+    tx_hashes = [tx_hash for tx_hash in dict.fromkeys(tx_hashes) if tx_hash not in _settling_deposits]
+    if tx_hashes:
+        _settling_deposits.update(tx_hashes)
+        background_tasks.add_task(settle_deposits, tx_hashes)
+
+async def _check_notify_rate(request: Request, cost: int):
+    """
+    클라이언트(IP)별 예치 알림 한도를 차감하고, 초과하면 429로 거부합니다.
+    """
+    client = request.client.host if request.client else "unknown"
+    allowed, retry_after = await rate_limiter.allow(f"notify:{client}", NOTIFY_RATE_LIMIT_PER_MINUTE, cost=cost)
+    if not allowed:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="요청 한도를 초과했습니다",
+            headers={"Retry-After": str(math.ceil(retry_after))}
+        )
+
+async def _claim_notify(tx_hash: str) -> bool:
+    """
+    트랜잭션 알림 처리 권한을 NOTIFY_DEDUPE_TTL초 동안 선점합니다. (이미 처리 중이면 False)
+    """
+    return await response_cache.add(f"notify:{tx_hash}", b"1", NOTIFY_DEDUPE_TTL)
+
 # 예치 트랜잭션 알림
 @router.post("/deposit/notify", response_model=TransactionStatusResponse)
-def notify_deposit_transaction(tx_data: TransactionNotify, db: Session = Depends(get_db)):
+async def notify_deposit_transaction(
+    tx_data: TransactionNotify,
+    background_tasks: BackgroundTasks,
+    request: Request,
+    db: AsyncSession = Depends(get_async_db)
+):
     """
     예치 트랜잭션이 완료되었음을 알립니다.
     
     - **tx_hash**: 트랜잭션 해시
     
+    트랜잭션을 pending 상태로 기록하고 바로 응답하며, 블록체인 검증과 잔액 반영은
+    응답 이후 백그라운드에서 수행합니다.
+    같은 트랜잭션의 재전송은 NOTIFY_DEDUPE_TTL초 동안 409로, 클라이언트별 과도한 알림은 429로 거부합니다.
+    
     Returns:
         트랜잭션 상태
     """
+    # 클라이언트별 알림 속도 제한
+    await _check_notify_rate(request, 1)
+    
+    # 같은 트랜잭션 알림이 짧은 시간 안에 반복되면 DB 조회 없이 거부 (SET NX)
+    if not await _claim_notify(tx_data.tx_hash):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Notification for this transaction is already in progress"
+        )
+    
     try:
-        # 트랜잭션 검증
-        tx_info = verify_deposit_transaction(tx_data.tx_hash)
+        # pending 상태로 기록 (사용자와 금액은 검증 후 채움, 이미 기록된 tx_hash면 삽입하지 않음)
+        tx_id = await _insert_transaction_if_new(
+            db,
+            user_wallet=None,
+            tx_hash=tx_data.tx_hash,
+            amount=0,
+            tx_type="deposit",
+            status="pending",
+            created_at=datetime.utcnow()
+        )
         
-        if not tx_info or not tx_info.get("success", False):
-            return {"status": "pending", "message": tx_info.get("message", "Transaction not found or still pending")}
+        if tx_id is None:
+            tx_status = (await db.execute(
+                select(Transaction.status).where(Transaction.tx_hash == tx_data.tx_hash)
+            )).scalar()
+            if tx_status != "pending":
+                # 이미 처리된 트랜잭션
+                await _release_notify(tx_data.tx_hash)
+                return {"status": tx_status, "message": "Transaction already processed"}
+        else:
+            await db.commit()
         
-        # 지갑 주소 정규화
-        wallet_address = normalize_address(tx_info["user"])
+        # 검증 중이 아니면 백그라운드 검증 예약 (이전 검증이 중단된 pending 기록도 다시 검증)
+        _schedule_settlement(background_tasks, [tx_data.tx_hash])
         
-        # 사용자 조회
-        user = db.query(User).filter(User.wallet_address == wallet_address).first()
+        return {"status": "pending", "message": "Deposit received, verification in progress"}
+            
+    except Exception as e:
+        logger.exception("Error in notify_deposit_transaction: %s", e)
+        # 기록하지 못했으므로 클라이언트가 바로 다시 알릴 수 있도록 처리 권한 해제
+        await db.rollback()
+        await _release_notify(tx_data.tx_hash)
+        return {"status": "error", "message": f"Error processing transaction: {str(e)}"}
+
+# 예치 트랜잭션 일괄 알림
+@router.post("/deposit/notify/batch", response_model=List[TransactionStatusResponse])
+async def notify_deposit_transactions(
+    batch: TransactionNotifyBatch,
+    background_tasks: BackgroundTasks,
+    request: Request,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    여러 예치 트랜잭션이 완료되었음을 한 번에 알립니다.
+    
+    - **items**: 트랜잭션 알림 목록 (최대 100건)
+    
+    단건 알림과 같이 새 트랜잭션을 하나의 INSERT 문으로 pending 상태로 기록하고 바로 응답하며,
+    각 트랜잭션의 블록체인 검증과 잔액 반영은 응답 이후 백그라운드에서 수행합니다.
+    클라이언트별 알림 한도는 트랜잭션 수만큼 차감하고, NOTIFY_DEDUPE_TTL초 안에 다시 알린
+    트랜잭션은 DB 조회 없이 처리 중으로 응답합니다.
+    
+    Returns:
+        요청 순서대로 각 트랜잭션의 상태
+    """
+    tx_hashes = list(dict.fromkeys(item.tx_hash for item in batch.items))
+    results: Dict[str, Dict] = {}
+    
+    # 클라이언트별 알림 속도 제한 (트랜잭션 수만큼 차감)
+    await _check_notify_rate(request, len(tx_hashes))
+    
+    # 트랜잭션별 처리 권한 선점 (SET NX), 이미 처리 중인 트랜잭션은 제외
+    claimed = await asyncio.gather(*(_claim_notify(tx_hash) for tx_hash in tx_hashes))
+    for tx_hash, is_claimed in zip(tx_hashes, claimed):
+        if not is_claimed:
+            results[tx_hash] = {"status": "pending", "message": "Notification for this transaction is already in progress"}
+    tx_hashes = [tx_hash for tx_hash in tx_hashes if tx_hash not in results]
+    if not tx_hashes:
+        return [results[item.tx_hash] for item in batch.items]
+    
+    try:
+        # pending 상태로 기록 (사용자와 금액은 검증 후 채움, 이미 기록된 tx_hash는 건너뜀)
+        new_tx_hashes = await _insert_transactions_if_new(db, [
+            {
+                "user_wallet": None,
+                "tx_hash": tx_hash,
+                "amount": 0,
+                "tx_type": "deposit",
+                "status": "pending",
+                "created_at": datetime.utcnow()
+            }
+            for tx_hash in tx_hashes
+        ])
         
-        if not user:
-            # 새 사용자 생성
-            user = User(
-                wallet_address=wallet_address,
-                balance=0,
-                is_admin=False,
-                created_at=datetime.utcnow(),
-                last_login_at=None
-            )
-            db.add(user)
-            db.commit()
-            db.refresh(user)  # 이 부분이 중요합니다 - ID를 가져오기 위해 refresh 필요
+        # 이미 기록된 트랜잭션의 상태 조회
+        duplicates = [tx_hash for tx_hash in tx_hashes if tx_hash not in new_tx_hashes]
+        statuses = dict((await db.execute(
+            select(Transaction.tx_hash, Transaction.status).where(Transaction.tx_hash.in_(duplicates))
+        )).all()) if duplicates else {}
         
-        # 트랜잭션 기록
-        tx = db.query(Transaction).filter(Transaction.tx_hash == tx_data.tx_hash).first()
+        await db.commit()
         
-        if not tx:
-            # 새 트랜잭션 생성 - user_id 필드 제외
-            tx = Transaction(
-                user_wallet=wallet_address,
-                tx_hash=tx_data.tx_hash,
-                amount=tx_info["amount"],
-                tx_type="deposit",
-                status="confirmed",
-                created_at=datetime.utcnow()
-            )
-            db.add(tx)
-            
-            # 사용자 잔액 업데이트 (블록체인에서 최신 잔액 조회)
-            try:
-                # 블록체인에서 잔액 조회
-                blockchain_balance = get_balance(wallet_address)
-                print(f"Blockchain balance for {wallet_address}: {blockchain_balance}")
-                
-                # 현재 DB에 저장된 잔액 확인
-                current_db_balance = user.balance or 0
-                print(f"Current DB balance for {wallet_address}: {current_db_balance}")
-                
-                # 트랜잭션 금액
-                deposit_amount = tx_info["amount"]
-                print(f"Deposit amount: {deposit_amount}")
-                
-                # 두 가지 방법으로 잔액 업데이트 시도
-                # 1. 블록체인 잔액 사용
-                if blockchain_balance > 0:
-                    user.balance = blockchain_balance
-                    print(f"Updated balance from blockchain: {blockchain_balance}")
-                # 2. 현재 DB 잔액 + 트랜잭션 금액
-                else:
-                    new_balance = current_db_balance + deposit_amount
-                    user.balance = new_balance
-                    print(f"Updated balance by adding deposit amount: {new_balance}")
-                
-                db.commit()
-                print(f"Final user balance after commit: {user.balance}")
-            except Exception as e:
-                print(f"Error updating balance: {str(e)}")
-                # 오류가 발생해도 트랜잭션은 기록
-                db.commit()
+        pending = []
+        for tx_hash in tx_hashes:
+            tx_status = statuses.get(tx_hash, "pending")
+            if tx_status != "pending":
+                # 이미 처리된 트랜잭션
+                await _release_notify(tx_hash)
+                results[tx_hash] = {"status": tx_status, "message": "Transaction already processed"}
+                continue
             
-            return {
-                "status": "confirmed", 
-                "message": f"Deposit confirmed: {format_wei_to_hsk(tx_info['amount'])} HSK"
-            }
-        else:
-            # 이미 처리된 트랜잭션
-            return {"status": tx.status, "message": "Transaction already processed"}
+            pending.append(tx_hash)
+            results[tx_hash] = {"status": "pending", "message": "Deposit received, verification in progress"}
+        
+        # 검증 중이 아닌 트랜잭션을 모아 한 번의 백그라운드 작업으로 검증 (이전 검증이 중단된 pending 기록도 다시 검증)
+        _schedule_settlement(background_tasks, pending)
+        
+        return [results[item.tx_hash] for item in batch.items]
             
     except Exception as e:
-        import traceback
-        print(f"Error in notify_deposit_transaction: {str(e)}")
-        print(traceback.format_exc())
-        return {"status": "error", "message": f"Error processing transaction: {str(e)}"}
+        logger.exception("Error in notify_deposit_transactions: %s", e)
+        # 기록하지 못했으므로 클라이언트가 바로 다시 알릴 수 있도록 처리 권한 해제
+        await db.rollback()
+        await asyncio.gather(*(_release_notify(tx_hash) for tx_hash in tx_hashes))
+        error = {"status": "error", "message": f"Error processing transaction: {str(e)}"}
+        return [results.get(item.tx_hash, error) for item in batch.items]
+
+# 예치 내역 조회
+@router.get("/deposit/history", response_model=None, responses={200: {"model": DepositHistoryResponse}})
+async def get_deposit_history(
+    skip: int = Query(0, ge=0, description="건너뛸 건수"),
+    limit: int = Query(50, ge=1, le=200, description="조회할 최대 건수"),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    현재 사용자의 예치 내역을 최신순으로 조회합니다.
+    
+    - **skip**: 건너뛸 건수
+    - **limit**: 조회할 최대 건수 (최대 200)
+    
+    Returns:
+        예치 트랜잭션 목록과 전체 건수
+    """
+    user_deposits = (
+        Transaction.user_wallet == current_user.wallet_address,
+        Transaction.tx_type == "deposit"
+    )
+    
+    # (user_wallet, tx_type, created_at) 인덱스로 사용자의 예치 범위만 역순 스캔하고 필요한 만큼만 조회
+    # 응답 컬럼만 조회하여 ORM 객체 생성과 pydantic 재검증 없이 orjson으로 바로 직렬화
+    items = (await db.execute(
+        select(
+            Transaction.id,
+            Transaction.tx_hash,
+            Transaction.amount,
+            Transaction.tx_type,
+            Transaction.status,
+            Transaction.created_at
+        ).where(*user_deposits)
+        .order_by(Transaction.created_at.desc()).offset(skip).limit(limit)
+    )).mappings().all()
+    
+    # 전체 건수는 행을 가져오지 않고 DB에서 계산
+    total = await db.scalar(select(func.count()).select_from(Transaction).where(*user_deposits))
+    
+    return FastJSONResponse({"items": [dict(item) for item in items], "total": total})
+
+# 인출 정보 응답 (환경 변수로 정해지므로 처음 요청 시 한 번만 직렬화)
+@functools.lru_cache(maxsize=1)
+def _withdraw_info_json() -> str:
+    return WithdrawInfoResponse(
+        message="인출은 관리자만 수행할 수 있습니다. 인출 요청을 제출하면 관리자가 처리합니다.",
+        deposit_contract=DEPOSIT_CONTRACT_ADDRESS
+    ).model_dump_json()
 
 # 인출 정보 조회
 @router.get("/withdraw/info", response_model=WithdrawInfoResponse)
-def get_withdraw_info():
-    deposit_contract = os.getenv("DEPOSIT_CONTRACT_ADDRESS")
-    return {
-        "message": "인출은 관리자만 수행할 수 있습니다. 인출 요청을 제출하면 관리자가 처리합니다.",
-        "deposit_contract": deposit_contract
-    }
+async def get_withdraw_info(request: Request):
+    return _info_response(request, _withdraw_info_json())
 
 # 인출 요청
 @router.post("/withdraw/request", response_model=WithdrawResponse)
-def request_withdraw(
+async def request_withdraw(
     request: WithdrawRequest, 
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     인출 요청을 생성합니다.
@@ -336,7 +720,7 @@ def request_withdraw(
         )
     
     # 잔액 확인
-    balance = get_balance(wallet_address)
+    balance = await get_balance(wallet_address)
     
     if balance < request.amount:
         raise HTTPException(
@@ -354,8 +738,8 @@ def request_withdraw(
         created_at=datetime.utcnow()
     )
     db.add(tx)
-    db.commit()
-    db.refresh(tx)
+    # expire_on_commit=False 세션이므로 커밋 후 tx.id를 다시 조회하지 않고 사용
+    await db.commit()
     
     return {
         "message": f"Withdraw request created for {format_wei_to_hsk(request.amount)} HSK",
@@ -364,10 +748,10 @@ def request_withdraw(
 
 # 인출 트랜잭션 알림
 @router.post("/withdraw/notify", response_model=TransactionStatusResponse)
-def notify_withdraw_transaction(
+async def notify_withdraw_transaction(
     tx_data: TransactionNotify, 
     current_user: User = Depends(get_current_admin_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     인출 트랜잭션이 완료되었음을 알립니다. (관리자 전용)
@@ -379,7 +763,7 @@ def notify_withdraw_transaction(
     """
     try:
         # 트랜잭션 검증
-        tx_info = verify_withdraw_transaction(tx_data.tx_hash)
+        tx_info = await verify_withdraw_transaction(tx_data.tx_hash)
         
         if not tx_info:
             return {"status": "pending", "message": "Transaction not found or still pending"}
@@ -388,44 +772,47 @@ def notify_withdraw_transaction(
         wallet_address = normalize_address(tx_info["to"])
         
         # 사용자 조회
-        user = db.query(User).filter(User.wallet_address == wallet_address).first()
+        user = (await db.execute(select(User.wallet_address).where(User.wallet_address == wallet_address))).first()
         
         if not user:
             return {"status": "error", "message": "User not found"}
         
-        # 트랜잭션 기록
-        tx = db.query(Transaction).filter(Transaction.tx_hash == tx_data.tx_hash).first()
+        # 새 트랜잭션 기록 (이미 기록된 tx_hash면 삽입하지 않음)
+        tx_id = await _insert_transaction_if_new(
+            db,
+            user_wallet=wallet_address,
+            tx_hash=tx_data.tx_hash,
+            amount=tx_info["value"],
+            tx_type="withdraw",
+            status="confirmed",
+            created_at=datetime.utcnow()
+        )
         
-        if not tx:
-            # 새 트랜잭션 생성
-            tx = Transaction(
-                user_wallet=wallet_address,
-                tx_hash=tx_data.tx_hash,
-                amount=tx_info["value"],
-                tx_type="withdraw",
-                status="confirmed",
-                created_at=datetime.utcnow()
-            )
-            db.add(tx)
-            db.commit()
-            
-            return {
-                "status": "confirmed", 
-                "message": f"Withdraw confirmed: {format_wei_to_hsk(tx_info['value'])} HSK"
-            }
-        else:
+        if tx_id is None:
             # 이미 처리된 트랜잭션
-            return {"status": tx.status, "message": "Transaction already processed"}
+            tx_status = (await db.execute(
+                select(Transaction.status).where(Transaction.tx_hash == tx_data.tx_hash)
+            )).scalar()
+            return {"status": tx_status, "message": "Transaction already processed"}
+        
+        await db.commit()
+        invalidate_balance(wallet_address)
+        await response_cache.delete(_balance_cache_key(wallet_address))
+        
+        return {
+            "status": "confirmed", 
+            "message": f"Withdraw confirmed: {format_wei_to_hsk(tx_info['value'])} HSK"
+        }
             
     except Exception as e:
         return {"status": "error", "message": f"Error processing transaction: {str(e)}"}
 
 # 사용량 차감 요청
 @router.post("/usage/deduct", response_model=UsageDeductResponse)
-def deduct_for_usage(
+async def deduct_for_usage(
     request: UsageDeductRequest, 
     current_user: User = Depends(get_current_admin_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     사용량에 따른 차감 요청을 생성합니다. (관리자 전용)
@@ -442,7 +829,7 @@ def deduct_for_usage(
     recipient_address = normalize_address(request.recipient_address)
     
     # 사용자 조회
-    user = db.query(User).filter(User.wallet_address == wallet_address).first()
+    user = (await db.execute(select(User).where(User.wallet_address == wallet_address))).scalar_one_or_none()
     
     if not user:
         raise HTTPException(
@@ -451,7 +838,7 @@ def deduct_for_usage(
         )
     
     # 잔액 확인
-    balance = get_balance(wallet_address)
+    balance = await get_balance(wallet_address)
     
     if balance < request.amount:
         raise HTTPException(
@@ -470,8 +857,8 @@ def deduct_for_usage(
         recipient=recipient_address
     )
     db.add(tx)
-    db.commit()
-    db.refresh(tx)
+    # expire_on_commit=False 세션이므로 커밋 후 tx.id를 다시 조회하지 않고 사용
+    await db.commit()
     
     return {
         "message": f"Usage deduction request created for {format_wei_to_hsk(request.amount)} HSK",
@@ -480,10 +867,10 @@ def deduct_for_usage(
 
 # 사용량 차감 트랜잭션 알림
 @router.post("/usage/notify", response_model=TransactionStatusResponse)
-def notify_usage_deduction_transaction(
+async def notify_usage_deduction_transaction(
     tx_data: TransactionNotify, 
     current_user: User = Depends(get_current_admin_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     사용량 차감 트랜잭션이 완료되었음을 알립니다. (관리자 전용)
@@ -495,7 +882,7 @@ def notify_usage_deduction_transaction(
     """
     try:
         # 트랜잭션 검증
-        tx_info = verify_usage_deduction_transaction(tx_data.tx_hash)
+        tx_info = await verify_usage_deduction_transaction(tx_data.tx_hash)
         
         if not tx_info:
             return {"status": "pending", "message": "Transaction not found or still pending"}
@@ -505,35 +892,38 @@ def notify_usage_deduction_transaction(
         to_address = normalize_address(tx_info["to"])
         
         # 사용자 조회
-        user = db.query(User).filter(User.wallet_address == from_address).first()
+        user = (await db.execute(select(User.wallet_address).where(User.wallet_address == from_address))).first()
         
         if not user:
             return {"status": "error", "message": "User not found"}
         
-        # 트랜잭션 기록
-        tx = db.query(Transaction).filter(Transaction.tx_hash == tx_data.tx_hash).first()
+        # 새 트랜잭션 기록 (이미 기록된 tx_hash면 삽입하지 않음)
+        tx_id = await _insert_transaction_if_new(
+            db,
+            user_wallet=from_address,
+            tx_hash=tx_data.tx_hash,
+            amount=tx_info["value"],
+            tx_type="usage_deduct",
+            status="confirmed",
+            created_at=datetime.utcnow(),
+            recipient=to_address
+        )
         
-        if not tx:
-            # 새 트랜잭션 생성
-            tx = Transaction(
-                user_wallet=from_address,
-                tx_hash=tx_data.tx_hash,
-                amount=tx_info["value"],
-                tx_type="usage_deduct",
-                status="confirmed",
-                created_at=datetime.utcnow(),
-                recipient=to_address
-            )
-            db.add(tx)
-            db.commit()
-            
-            return {
-                "status": "confirmed", 
-                "message": f"Usage deduction confirmed: {format_wei_to_hsk(tx_info['value'])} HSK"
-            }
-        else:
+        if tx_id is None:
             # 이미 처리된 트랜잭션
-            return {"status": tx.status, "message": "Transaction already processed"}
+            tx_status = (await db.execute(
+                select(Transaction.status).where(Transaction.tx_hash == tx_data.tx_hash)
+            )).scalar()
+            return {"status": tx_status, "message": "Transaction already processed"}
+        
+        await db.commit()
+        invalidate_balance(from_address)
+        await response_cache.delete(_balance_cache_key(from_address))
+        
+        return {
+            "status": "confirmed", 
+            "message": f"Usage deduction confirmed: {format_wei_to_hsk(tx_info['value'])} HSK"
+        }
             
     except Exception as e:
         return {"status": "error", "message": f"Error processing transaction: {str(e)}"}
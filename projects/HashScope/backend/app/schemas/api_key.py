@@ -15,7 +15,7 @@ class APIKeyResponse(BaseModel):
     rate_limit_per_minute: int
     
     class Config:
-        orm_mode = True
+        from_attributes = True
 
 class APIKeyWithSecret(APIKeyResponse):
     secret_key: str = Field(..., description="Secret key (only shown once)")
@@ -26,4 +26,4 @@ class APIKeyUsage(APIKeyResponse):
     token_consumption_rate: float
     
     class Config:
-        orm_mode = True
+        from_attributes = True
@@ -17,4 +17,4 @@ class DepositTransactionResponse(DepositTransactionBase):
     updated_at: Optional[datetime]
     
     class Config:
-        orm_mode = True
+        from_attributes = True
@@ -15,11 +15,11 @@ class UserResponse(UserBase):
     created_at: datetime
     
     class Config:
-        orm_mode = True
+        from_attributes = True
 
 class UserWithBalance(UserResponse):
     token_balance: float
     deposit_contract_address: Optional[str] = None
     
     class Config:
-        orm_mode = True
+        from_attributes = True
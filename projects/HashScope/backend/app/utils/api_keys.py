@@ -1,24 +1,36 @@
 import secrets
-import string
 import hashlib
+import hmac
+import os
 from datetime import datetime, timedelta
-from passlib.context import CryptContext
+from dotenv import load_dotenv
 
-# Password context for hashing API keys
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Load environment variables
+load_dotenv()
+
+# Server-side pepper for hashing API key secrets.
+# Secrets are high-entropy random tokens, so a keyed SHA-256 (HMAC) is enough;
+# a slow adaptive hash such as bcrypt would only add CPU cost to every request.
+API_KEY_PEPPER = os.getenv("API_KEY_PEPPER", "your-api-key-pepper-for-development").encode()
+
+def hash_api_secret(secret_key: str) -> str:
+    """
+    Hash an API key secret for storage (HMAC-SHA256 with the server pepper, hex encoded)
+    """
+    return hmac.new(API_KEY_PEPPER, secret_key.encode(), hashlib.sha256).hexdigest()
 
 def generate_api_key_pair():
     """
     Generate a new API key pair (key_id and secret_key)
     """
     # Generate a random key_id (public identifier)
-    key_id = ''.join(secrets.choice(string.ascii_letters + string.digits) for _ in range(16))
+    key_id = f"hsk_{secrets.token_hex(16)}"
     
     # Generate a random secret_key
-    secret_key = ''.join(secrets.choice(string.ascii_letters + string.digits) for _ in range(32))
+    secret_key = f"sk_{secrets.token_hex(32)}"
     
     # Hash the secret key for storage
-    secret_key_hash = pwd_context.hash(secret_key)
+    secret_key_hash = hash_api_secret(secret_key)
     
     return {
         "key_id": key_id,
@@ -28,9 +40,9 @@ def generate_api_key_pair():
 
 def verify_api_key(plain_secret_key, hashed_secret_key):
     """
-    Verify an API key against its hash
+    Verify an API key against its hash (constant-time comparison)
     """
-    return pwd_context.verify(plain_secret_key, hashed_secret_key)
+    return hmac.compare_digest(hash_api_secret(plain_secret_key), hashed_secret_key)
 
 def calculate_expiry_date(days=365):
     """
@@ -0,0 +1,161 @@
+"""
+직렬화된 응답(JSON 바이트) 캐시 (Redis, Redis를 사용할 수 없으면 프로세스 내 캐시)와
+비동기 함수 결과 TTL 캐시
+"""
+
+import asyncio
+import functools
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+from cachetools import TTLCache
+from dotenv import load_dotenv
+
+try:
+    import redis.asyncio as aioredis
+    from redis.exceptions import RedisError
+except ImportError:  # redis 패키지가 없으면 프로세스 내 캐시만 사용
+    aioredis = None
+    RedisError = Exception
+
+load_dotenv()
+
+REDIS_URL = os.getenv("REDIS_URL")
+
+class ResponseCache:
+    """
+    키별로 직렬화된 응답 바이트를 TTL과 함께 저장합니다.
+
+    REDIS_URL이 설정되어 있으면 모든 워커가 Redis 캐시를 공유하고,
+    Redis가 없거나 오류가 나면 프로세스 내 캐시를 사용합니다.
+    """
+
+    def __init__(self, redis_url: Optional[str] = REDIS_URL, max_ttl: int = 3600):
+        self._redis = aioredis.from_url(redis_url) if redis_url and aioredis else None
+        # 프로세스 내 캐시 (key -> (만료 시각, 값))
+        self._local = TTLCache(maxsize=10_000, ttl=max_ttl)
+        self._lock = threading.Lock()
+
+    async def get(self, key: str) -> Optional[bytes]:
+        """캐시된 값 조회 (없거나 만료된 경우 None)"""
+        if self._redis is not None:
+            try:
+                return await self._redis.get(key)
+            except RedisError:
+                pass
+        with self._lock:
+            entry = self._local.get(key)
+        if entry is None or entry[0] <= time.monotonic():
+            return None
+        return entry[1]
+
+    async def set(self, key: str, value: bytes, ttl: int):
+        """값을 ttl초 동안 캐시"""
+        if self._redis is not None:
+            try:
+                await self._redis.set(key, value, ex=ttl)
+                return
+            except RedisError:
+                pass
+        with self._lock:
+            self._local[key] = (time.monotonic() + ttl, value)
+
+    async def add(self, key: str, value: bytes, ttl: int) -> bool:
+        """키가 없을 때만 값을 ttl초 동안 캐시 (SET NX, 저장했으면 True)"""
+        if self._redis is not None:
+            try:
+                return bool(await self._redis.set(key, value, ex=ttl, nx=True))
+            except RedisError:
+                pass
+        now = time.monotonic()
+        with self._lock:
+            entry = self._local.get(key)
+            if entry is not None and entry[0] > now:
+                return False
+            self._local[key] = (now + ttl, value)
+            return True
+
+    async def delete(self, key: str):
+        """캐시된 값 제거"""
+        if self._redis is not None:
+            try:
+                await self._redis.delete(key)
+            except RedisError:
+                pass
+        with self._lock:
+            self._local.pop(key, None)
+
+# 애플리케이션 전역 응답 캐시
+response_cache = ResponseCache()
+
+def single_flight(func):
+    """
+    같은 인자로 동시에 호출된 비동기 함수를 한 번만 실행하는 데코레이터
+
+    먼저 들어온 호출이 실행하는 동안 나머지 호출은 같은 Future의 결과(또는 예외)를 기다립니다.
+    먼저 들어온 호출이 취소되면 기다리던 호출은 취소되지 않고 다시 실행을 시도합니다.
+    """
+    inflight: Dict[tuple, asyncio.Future] = {}
+
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        key = args + tuple(sorted(kwargs.items()))
+        future = inflight.get(key)
+        while future is not None:
+            try:
+                # 대기 중인 호출이 취소되어도 공유 Future는 취소되지 않도록 보호
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                # 이 호출 자체가 취소된 경우만 전파하고, 실행하던 호출이 취소된 경우에는 다시 시도
+                if not future.cancelled():
+                    raise
+            future = inflight.get(key)
+
+        future = asyncio.get_running_loop().create_future()
+        inflight[key] = future
+        try:
+            result = await func(*args, **kwargs)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # 기다리는 호출이 없어도 "exception was never retrieved" 경고가 나지 않도록 표시
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            inflight.pop(key, None)
+
+    return wrapper
+
+def async_ttl_cache(cache: TTLCache):
+    """
+    비동기 함수의 결과를 인자별로 TTL 캐시에 저장하는 데코레이터
+
+    여러 함수가 같은 캐시를 함께 쓸 수 있도록 키에 함수 이름을 포함합니다.
+    같은 인자로 동시에 캐시 미스가 나면 single_flight로 한 번만 호출하고
+    나머지는 그 결과를 사용합니다. None 결과(조회 실패)는 캐시하지 않습니다.
+    """
+    def decorator(func):
+        fetch = single_flight(func)
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            key = (func.__qualname__,) + args + tuple(sorted(kwargs.items()))
+            result = cache.get(key)
+            if result is not None:
+                return result
+
+            result = await fetch(*args, **kwargs)
+            if result is not None:
+                cache[key] = result
+            return result
+
+        wrapper.cache = cache
+        return wrapper
+    return decorator
@@ -0,0 +1,66 @@
+"""
+GET JSON 응답에 ETag를 부여하고 If-None-Match 조건부 요청에 304로 응답하는 ASGI 미들웨어
+"""
+
+import hashlib
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+class ETagMiddleware:
+    """
+    성공한 GET JSON 응답 본문의 해시로 약한 ETag를 생성합니다.
+
+    클라이언트가 보낸 If-None-Match 값이 일치하면 본문 없이 304 Not Modified를 반환합니다.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or scope["method"] != "GET":
+            await self.app(scope, receive, send)
+            return
+
+        if_none_match = Headers(scope=scope).get("if-none-match")
+        start_message: Message = {}
+        body = []
+
+        async def send_with_etag(message: Message):
+            nonlocal start_message
+
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message["headers"])
+                if message["status"] != 200 or "etag" in headers \
+                        or not headers.get("content-type", "").startswith("application/json"):
+                    # ETag 대상이 아닌 응답은 그대로 전달
+                    start_message = {}
+                    await send(message)
+                    return
+                start_message = message
+                return
+
+            if not start_message:
+                await send(message)
+                return
+
+            body.append(message.get("body", b""))
+            if message.get("more_body", False):
+                return
+
+            content = b"".join(body)
+            etag = f'W/"{hashlib.blake2b(content, digest_size=16).hexdigest()}"'
+            headers = MutableHeaders(raw=start_message["headers"])
+            headers["etag"] = etag
+
+            if if_none_match and etag in [tag.strip() for tag in if_none_match.split(",")]:
+                del headers["content-length"]
+                start_message["status"] = 304
+                await send(start_message)
+                await send({"type": "http.response.body", "body": b""})
+                return
+
+            await send(start_message)
+            await send({"type": "http.response.body", "body": content})
+
+        await self.app(scope, receive, send_with_etag)
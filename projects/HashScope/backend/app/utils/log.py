@@ -0,0 +1,78 @@
+"""
+백그라운드 스레드에서 출력하는 로거 (QueueHandler -> QueueListener)
+"""
+
+import atexit
+import logging
+import queue
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Tuple
+
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+# 같은 메시지를 다시 출력하지 않는 시간 (초)
+DUPLICATE_WINDOW = 1.0
+
+_listener = None
+_listener_lock = threading.Lock()
+_log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+
+class DuplicateFilter(logging.Filter):
+    """
+    같은 로거/레벨/메시지가 짧은 시간 안에 반복되면 버립니다. (RPC 장애 시 오류 로그 폭주 방지)
+    """
+
+    def __init__(self, window: float = DUPLICATE_WINDOW):
+        super().__init__()
+        self.window = window
+        self._last_seen: Dict[Tuple[str, int, str], float] = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        key = (record.name, record.levelno, record.getMessage())
+        now = time.monotonic()
+        with self._lock:
+            last = self._last_seen.get(key)
+            if last is not None and now - last < self.window:
+                return False
+            if len(self._last_seen) > 1024:
+                self._last_seen.clear()
+            self._last_seen[key] = now
+        return True
+
+def _start_listener():
+    global _listener
+    with _listener_lock:
+        if _listener is None:
+            handler = logging.StreamHandler()
+            handler.setFormatter(logging.Formatter(LOG_FORMAT))
+            _listener = QueueListener(_log_queue, handler, respect_handler_level=True)
+            _listener.start()
+            # 종료 시 큐에 남은 로그 출력
+            atexit.register(_listener.stop)
+
+def get_logger(name: str, level: int = logging.INFO) -> logging.Logger:
+    """
+    요청 처리 스레드에서 출력 I/O를 하지 않는 로거를 반환합니다.
+
+    로그 레코드는 큐에 넣기만 하고, 실제 출력은 QueueListener 스레드에서 수행합니다.
+
+    Args:
+        name: 로거 이름
+        level: 로그 레벨
+
+    Returns:
+        설정된 로거
+    """
+    _start_listener()
+    logger = logging.getLogger(name)
+    if not any(isinstance(handler, QueueHandler) for handler in logger.handlers):
+        handler = QueueHandler(_log_queue)
+        handler.addFilter(DuplicateFilter())
+        logger.addHandler(handler)
+        logger.setLevel(level)
+        # 루트 로거 핸들러로 중복 출력하지 않음
+        logger.propagate = False
+    return logger
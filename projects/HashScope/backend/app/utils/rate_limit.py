@@ -0,0 +1,218 @@
+"""
+API 키별 요청 속도 제한 (Redis 슬라이딩 윈도우/토큰 버킷, Redis를 사용할 수 없으면 프로세스 내 구현)
+"""
+
+import math
+import os
+import secrets
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import List, Optional, Tuple
+
+from cachetools import TTLCache
+from dotenv import load_dotenv
+
+try:
+    import redis.asyncio as aioredis
+    from redis.exceptions import RedisError
+except ImportError:  # redis 패키지가 없으면 프로세스 내 버킷만 사용
+    aioredis = None
+    RedisError = Exception
+
+load_dotenv()
+
+REDIS_URL = os.getenv("REDIS_URL")
+
+# 속도 제한 방식 ("sliding_window" 또는 "token_bucket")
+RATE_LIMIT_STRATEGY = os.getenv("RATE_LIMIT_STRATEGY", "sliding_window")
+
+# 슬라이딩 윈도우 크기 (ms)
+RATE_LIMIT_WINDOW_MS = 60_000
+
+# 토큰 버킷 Lua 스크립트 (충전 + 차감 + 만료 설정을 한 번의 왕복으로 원자적으로 실행)
+# KEYS[1] = 버킷 키, ARGV = 최대 토큰 수, ms당 충전량, 차감할 토큰 수, 현재 시각(ms)
+# 반환값 = {허용 여부(1/0), 다음 요청까지 대기 시간(ms)}
+TOKEN_BUCKET_LUA = """
+local capacity = tonumber(ARGV[1])
+local refill_per_ms = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local now = tonumber(ARGV[4])
+
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(bucket[1])
+local ts = tonumber(bucket[2])
+if tokens == nil then
+    tokens = capacity
+    ts = now
+end
+
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * refill_per_ms)
+
+local allowed = 0
+local wait_ms = 0
+if tokens >= cost then
+    tokens = tokens - cost
+    allowed = 1
+else
+    wait_ms = math.ceil((cost - tokens) / refill_per_ms)
+end
+
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil((capacity - tokens) / refill_per_ms) + 1000)
+return {allowed, wait_ms}
+"""
+
+# 슬라이딩 윈도우 Lua 스크립트 (Sorted Set에 요청 시각을 기록, 윈도우 경계에서 2배 버스트가 생기지 않음)
+# KEYS[1] = 윈도우 키, ARGV = 현재 시각(ms), 윈도우 크기(ms), 한도, 요청 고유 ID, 차감할 양
+# 반환값 = {허용 여부(1/0), 다음 요청까지 대기 시간(ms)}
+SLIDING_WINDOW_LUA = """
+local now = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local limit = tonumber(ARGV[3])
+local cost = tonumber(ARGV[5])
+
+redis.call('ZREMRANGEBYSCORE', KEYS[1], 0, now - window)
+local count = redis.call('ZCARD', KEYS[1])
+if count + cost > limit then
+    if cost > limit then
+        return {0, window}
+    end
+    -- cost만큼 자리가 비는 시점 = (count + cost - limit)번째로 오래된 기록이 윈도우를 벗어나는 시각
+    local index = count + cost - limit - 1
+    local oldest = redis.call('ZRANGE', KEYS[1], index, index, 'WITHSCORES')
+    return {0, tonumber(oldest[2]) + window - now}
+end
+
+for i = 1, cost do
+    redis.call('ZADD', KEYS[1], now, ARGV[1] .. ':' .. ARGV[4] .. ':' .. i)
+end
+redis.call('PEXPIRE', KEYS[1], window)
+return {1, 0}
+"""
+
+class RateLimiter(ABC):
+    """
+    API 키별 분당 요청 한도 적용기의 공통 부분
+
+    REDIS_URL이 설정되어 있으면 모든 워커가 Redis의 상태를 공유하고(EVALSHA 1회 왕복),
+    Redis가 없거나 오류가 나면 프로세스 내 구현으로 대체합니다.
+    한도를 초과한 키는 다시 허용될 때까지 같은 양 이상의 요청을 Redis에 묻지 않고 바로 거부합니다.
+    """
+
+    lua_script = ""
+
+    def __init__(self, redis_url: Optional[str] = REDIS_URL, prefix: str = "ratelimit"):
+        self.prefix = prefix
+        self._redis = aioredis.from_url(redis_url) if redis_url and aioredis else None
+        # register_script는 SHA를 캐시하여 EVALSHA로 호출 (스크립트가 없으면 자동으로 로드)
+        self._script = self._redis.register_script(self.lua_script) if self._redis else None
+        self._local = TTLCache(maxsize=100_000, ttl=120)
+        # 거부된 키 (key -> (다시 허용될 시각, 거부된 요청의 양))
+        self._denied_until = TTLCache(maxsize=100_000, ttl=60)
+        self._lock = threading.Lock()
+
+    async def allow(self, key: str, limit_per_minute: int, cost: int = 1) -> Tuple[bool, float]:
+        """
+        요청을 허용할지 판단하고 사용량을 기록합니다.
+
+        Args:
+            key: 제한 키 (API 키 ID)
+            limit_per_minute: 분당 허용 요청 수
+            cost: 이번 요청이 사용할 양
+
+        Returns:
+            (허용 여부, 거부된 경우 다시 시도할 수 있을 때까지의 시간(초))
+        """
+        now = time.time()
+        with self._lock:
+            denied = self._denied_until.get(key)
+        # 거부된 양보다 작은 요청은 남은 한도 안에 들어갈 수 있으므로 다시 확인
+        if denied is not None and now < denied[0] and cost >= denied[1]:
+            return False, denied[0] - now
+
+        limit = max(int(limit_per_minute or 0), 1)
+
+        result = None
+        if self._script is not None:
+            try:
+                allowed, wait_ms = await self._script(
+                    keys=[f"{self.prefix}:{key}"],
+                    args=self._script_args(limit, cost, int(now * 1000))
+                )
+                result = (bool(allowed), wait_ms / 1000)
+            except RedisError:
+                result = None
+        if result is None:
+            with self._lock:
+                result = self._allow_local(key, limit, cost, now)
+
+        allowed, retry_after = result
+        if not allowed:
+            with self._lock:
+                self._denied_until[key] = (now + retry_after, cost)
+        return result
+
+    @abstractmethod
+    def _script_args(self, limit: int, cost: int, now_ms: int) -> List:
+        """Lua 스크립트에 전달할 ARGV 목록"""
+
+    @abstractmethod
+    def _allow_local(self, key: str, limit: int, cost: int, now: float) -> Tuple[bool, float]:
+        """Redis를 사용할 수 없을 때의 프로세스 내 구현"""
+
+class TokenBucketLimiter(RateLimiter):
+    """
+    분당 한도를 토큰 버킷으로 적용합니다. (버킷 크기 = 분당 한도, 초당 한도/60개씩 충전)
+    """
+
+    lua_script = TOKEN_BUCKET_LUA
+
+    def _script_args(self, limit: int, cost: int, now_ms: int) -> List:
+        return [limit, limit / RATE_LIMIT_WINDOW_MS, cost, now_ms]
+
+    def _allow_local(self, key: str, limit: int, cost: int, now: float) -> Tuple[bool, float]:
+        refill_per_sec = limit / (RATE_LIMIT_WINDOW_MS / 1000)
+        tokens, ts = self._local.get(key, (limit, now))
+        tokens = min(limit, tokens + max(0.0, now - ts) * refill_per_sec)
+        if tokens >= cost:
+            self._local[key] = (tokens - cost, now)
+            return True, 0.0
+        self._local[key] = (tokens, now)
+        return False, math.ceil((cost - tokens) / refill_per_sec * 1000) / 1000
+
+class SlidingWindowLimiter(RateLimiter):
+    """
+    최근 60초 동안의 요청 수로 분당 한도를 적용합니다. (Redis Sorted Set)
+    """
+
+    lua_script = SLIDING_WINDOW_LUA
+
+    def _script_args(self, limit: int, cost: int, now_ms: int) -> List:
+        return [now_ms, RATE_LIMIT_WINDOW_MS, limit, secrets.token_hex(4), cost]
+
+    def _allow_local(self, key: str, limit: int, cost: int, now: float) -> Tuple[bool, float]:
+        window = RATE_LIMIT_WINDOW_MS / 1000
+        timestamps = self._local.get(key)
+        if timestamps is None:
+            timestamps = self._local[key] = deque()
+        while timestamps and timestamps[0] <= now - window:
+            timestamps.popleft()
+        if len(timestamps) + cost > limit:
+            if cost > limit:
+                return False, window
+            return False, timestamps[len(timestamps) + cost - limit - 1] + window - now
+        timestamps.extend([now] * cost)
+        return True, 0.0
+
+def create_rate_limiter(strategy: str = RATE_LIMIT_STRATEGY) -> RateLimiter:
+    """
+    설정된 방식의 속도 제한기를 생성합니다.
+    """
+    if strategy == "token_bucket":
+        return TokenBucketLimiter()
+    return SlidingWindowLimiter()
+
+# 애플리케이션 전역 속도 제한기
+rate_limiter = create_rate_limiter()
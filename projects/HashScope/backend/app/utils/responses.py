@@ -0,0 +1,36 @@
+"""
+응답 관련 클래스 (orjson 기반 JSON 응답, 장기 캐시 정적 파일)
+"""
+
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+from fastapi.staticfiles import StaticFiles
+from starlette.types import Scope
+
+class FastJSONResponse(JSONResponse):
+    """
+    orjson으로 직렬화하는 기본 JSON 응답
+
+    orjson은 64비트를 넘는 정수(큰 wei 금액 등)를 직렬화하지 못하므로
+    이 경우에만 표준 json 직렬화로 대체합니다.
+    """
+
+    def render(self, content: Any) -> bytes:
+        try:
+            return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            # orjson.JSONEncodeError는 TypeError의 하위 클래스
+            return super().render(content)
+
+class ImmutableStaticFiles(StaticFiles):
+    """
+    버전이 포함된 경로로 제공되는 정적 파일 (브라우저가 1년간 재검증 없이 캐시)
+    """
+
+    async def get_response(self, path: str, scope: Scope):
+        response = await super().get_response(path, scope)
+        if response.status_code == 200:
+            response.headers["Cache-Control"] = "public, max-age=31536000, immutable"
+        return response
@@ -0,0 +1,49 @@
+"""
+목록 응답의 필드 선택(sparse fieldset)을 위한 유틸리티 함수
+"""
+
+from typing import Any, List, Optional, Set
+
+from fastapi import Query
+from pydantic import BaseModel
+
+def parse_fields(
+    fields: Optional[str] = Query(
+        None,
+        description="응답에 포함할 필드 목록 (쉼표로 구분, 예: title,date). 생략하면 모든 필드를 반환합니다."
+    )
+) -> Optional[Set[str]]:
+    """
+    fields 쿼리 파라미터를 필드 이름 집합으로 변환합니다.
+
+    Args:
+        fields: 쉼표로 구분된 필드 이름
+
+    Returns:
+        필드 이름 집합 (지정하지 않은 경우 None)
+    """
+    if not fields:
+        return None
+
+    selected = {field.strip() for field in fields.split(",") if field.strip()}
+    return selected or None
+
+def select_fields(items: List[Any], fields: Optional[Set[str]]) -> List[Any]:
+    """
+    목록의 각 항목에서 요청된 필드만 남깁니다.
+
+    Args:
+        items: pydantic 모델 또는 딕셔너리 목록
+        fields: 남길 필드 이름 집합 (None이면 그대로 반환)
+
+    Returns:
+        필드가 선택된 항목 목록
+    """
+    if not fields:
+        return items
+
+    return [
+        item.model_dump(include=fields) if isinstance(item, BaseModel)
+        else {key: value for key, value in item.items() if key in fields}
+        for item in items
+    ]
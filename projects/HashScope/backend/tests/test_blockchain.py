@@ -1,3 +1,4 @@
+import asyncio
 import pytest
 import os
 import sys
@@ -25,11 +26,11 @@ load_dotenv()
 
 def test_web3_connection():
     """Web3 연결 테스트"""
-    assert w3.is_connected()
+    assert asyncio.run(w3.is_connected())
     print(f"Web3 연결 성공: {w3.provider}")
     
     # 현재 블록 번호 확인
-    current_block = w3.eth.block_number
+    current_block = asyncio.run(w3.eth.block_number)
     print(f"현재 블록 번호: {current_block}")
     assert current_block > 0
 
@@ -55,18 +56,18 @@ def test_balance_functions():
     test_address = "0x0000000000000000000000000000000000000000"
     
     # 예치 잔액 조회
-    deposit_balance = get_balance(test_address)
+    deposit_balance = asyncio.run(get_balance(test_address))
     print(f"예치 잔액: {format_wei_to_hsk(deposit_balance)}")
     assert isinstance(deposit_balance, int)
     
     # 컨트랙트 잔액 조회
-    contract_balance = get_contract_balance()
+    contract_balance = asyncio.run(get_contract_balance())
     print(f"컨트랙트 잔액: {format_wei_to_hsk(contract_balance)}")
     assert isinstance(contract_balance, int)
     
     # 지갑 잔액 조회 (이 함수는 실제 블록체인 조회가 필요)
     try:
-        wallet_balance = get_wallet_balance(test_address)
+        wallet_balance = asyncio.run(get_wallet_balance(test_address))
         print(f"지갑 잔액: {format_wei_to_hsk(wallet_balance)}")
         assert isinstance(wallet_balance, int)
     except Exception as e:
@@ -100,7 +101,7 @@ def test_transaction_build():
     # 예치 트랜잭션 생성
     amount_wei = hsk_to_wei(0.1)  # 0.1 HSK
     try:
-        tx = build_deposit_transaction(test_address, amount_wei)
+        tx = asyncio.run(build_deposit_transaction(test_address, amount_wei))
         
         # 트랜잭션 필드 확인
         assert "to" in tx
@@ -0,0 +1,84 @@
+import asyncio
+import os
+import sys
+
+# 프로젝트 루트 디렉토리를 Python 경로에 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cachetools import TTLCache
+
+from app.utils.cache import async_ttl_cache, single_flight
+
+def test_async_ttl_cache_coalesces_concurrent_misses():
+    """동시 캐시 미스가 한 번의 호출로 합쳐지고, 함수별로 캐시가 분리되는지 테스트"""
+    cache = TTLCache(maxsize=8, ttl=60)
+    calls = []
+    
+    @async_ttl_cache(cache)
+    async def fetch_btc():
+        calls.append("btc")
+        await asyncio.sleep(0.01)
+        return 1.0
+    
+    @async_ttl_cache(cache)
+    async def fetch_usdt():
+        calls.append("usdt")
+        return 2.0
+    
+    async def run():
+        results = await asyncio.gather(*[fetch_btc() for _ in range(10)])
+        return results, await fetch_usdt()
+    
+    results, usdt = asyncio.run(run())
+    
+    assert results == [1.0] * 10
+    assert usdt == 2.0
+    assert calls == ["btc", "usdt"]
+
+def test_single_flight_shares_result_and_errors():
+    """진행 중인 호출의 결과와 예외를 동시 호출이 공유하는지 테스트"""
+    calls = []
+    
+    @single_flight
+    async def fetch(fail):
+        calls.append(fail)
+        await asyncio.sleep(0.01)
+        if fail:
+            raise ValueError("upstream error")
+        return "ok"
+    
+    async def run():
+        ok = await asyncio.gather(*[fetch(False) for _ in range(5)])
+        errors = await asyncio.gather(*[fetch(True) for _ in range(5)], return_exceptions=True)
+        return ok, errors
+    
+    ok, errors = asyncio.run(run())
+    
+    assert ok == ["ok"] * 5
+    assert all(isinstance(error, ValueError) for error in errors)
+    assert calls == [False, True]
+
+def test_single_flight_leader_cancellation():
+    """먼저 실행한 호출이 취소되어도 기다리던 호출은 취소되지 않고 다시 실행되는지 테스트"""
+    calls = []
+    
+    @single_flight
+    async def fetch(key):
+        calls.append(key)
+        await asyncio.sleep(0.05)
+        return "ok"
+    
+    async def run():
+        leader = asyncio.create_task(fetch("a"))
+        await asyncio.sleep(0)
+        followers = [asyncio.create_task(fetch("a")) for _ in range(3)]
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        results = await asyncio.gather(*followers)
+        return leader, results
+    
+    leader, results = asyncio.run(run())
+    
+    assert leader.cancelled()
+    assert results == ["ok"] * 3
+    assert calls == ["a", "a"]
@@ -0,0 +1,44 @@
+import asyncio
+import os
+import sys
+
+# 프로젝트 루트 디렉토리를 Python 경로에 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.utils.rate_limit import SlidingWindowLimiter, TokenBucketLimiter
+
+def test_token_bucket_limits_per_minute():
+    """분당 한도만큼 허용한 뒤 거부하고 대기 시간을 알려주는지 테스트 (Redis 없이 프로세스 내 버킷)"""
+    limiter = TokenBucketLimiter(redis_url=None)
+    
+    results = [asyncio.run(limiter.allow("hsk_test", 3)) for _ in range(4)]
+    
+    assert [allowed for allowed, _ in results] == [True, True, True, False]
+    # 분당 3회이므로 토큰 1개가 차는 데 약 20초
+    assert 0 < results[-1][1] <= 20
+    
+    # 다른 키는 영향을 받지 않음
+    assert asyncio.run(limiter.allow("hsk_other", 3))[0]
+
+def test_sliding_window_limits_per_minute():
+    """최근 60초 요청 수로 한도를 적용하는지 테스트 (Redis 없이 프로세스 내 윈도우)"""
+    limiter = SlidingWindowLimiter(redis_url=None)
+    
+    results = [asyncio.run(limiter.allow("hsk_test", 2)) for _ in range(3)]
+    
+    assert [allowed for allowed, _ in results] == [True, True, False]
+    # 가장 오래된 요청이 윈도우를 벗어날 때까지 대기
+    assert 59 < results[-1][1] <= 60
+
+def test_sliding_window_mixed_costs():
+    """큰 요청이 거부되어도 남은 한도에 들어가는 작은 요청은 허용되는지 테스트"""
+    limiter = SlidingWindowLimiter(redis_url=None)
+    
+    assert asyncio.run(limiter.allow("notify:client", 120, cost=50))[0]
+    assert not asyncio.run(limiter.allow("notify:client", 120, cost=100))[0]
+    # 거부된 양 이상의 요청은 바로 거부
+    assert not asyncio.run(limiter.allow("notify:client", 120, cost=100))[0]
+    # 남은 70건 안의 요청은 허용
+    assert asyncio.run(limiter.allow("notify:client", 120, cost=1))[0]
+    assert asyncio.run(limiter.allow("notify:client", 120, cost=69))[0]
+    assert not asyncio.run(limiter.allow("notify:client", 120, cost=1))[0]
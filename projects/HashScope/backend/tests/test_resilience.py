@@ -0,0 +1,38 @@
+import asyncio
+import os
+import sys
+
+import aiohttp
+import pytest
+
+# 프로젝트 루트 디렉토리를 Python 경로에 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.blockchain.resilience import CircuitBreaker, CircuitOpenError, call_with_retry
+
+def test_circuit_breaker_opens_and_fails_fast():
+    """연속 실패 후 서킷이 열리면 호출하지 않고 바로 실패하는지 테스트"""
+    breaker = CircuitBreaker(fail_max=2, reset_timeout=60)
+    calls = []
+    
+    async def failing():
+        calls.append(1)
+        raise aiohttp.ClientConnectionError("node down")
+    
+    with pytest.raises(aiohttp.ClientConnectionError):
+        asyncio.run(call_with_retry(breaker, failing, attempts=2, base_delay=0))
+    assert breaker.state == "open"
+    assert len(calls) == 2
+    
+    with pytest.raises(CircuitOpenError):
+        asyncio.run(call_with_retry(breaker, failing, attempts=2, base_delay=0))
+    assert len(calls) == 2
+    
+    # 재설정 시간이 지나면 반개방 상태에서 성공 시 닫힘
+    breaker.reset_timeout = 0
+    
+    async def ok():
+        return "ok"
+    
+    assert asyncio.run(call_with_retry(breaker, ok)) == "ok"
+    assert breaker.state == "closed"
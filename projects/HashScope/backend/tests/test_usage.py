@@ -0,0 +1,73 @@
+import os
+import sys
+
+# 프로젝트 루트 디렉토리를 Python 경로에 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.auth.usage import MAX_FLUSH_RETRIES, UsageBuffer
+from app.models import User, APIKey, APIUsage
+from tests.conftest import TestingSessionLocal
+
+def test_usage_buffer_flush(test_db):
+    """버퍼에 쌓인 사용 기록이 한 번에 저장되는지 테스트"""
+    user = User(wallet_address="0xusagebuffer")
+    api_key = APIKey(key_id="hsk_usage", secret_key_hash="x", user_wallet=user.wallet_address, call_count=0)
+    test_db.add_all([user, api_key])
+    test_db.commit()
+    
+    buffer = UsageBuffer(session_factory=TestingSessionLocal, batch_size=2)
+    for _ in range(3):
+        buffer.record(api_key.id, "/crypto/btc/usd", "GET", cost=10**14)
+    
+    # 기록만으로는 DB에 쓰지 않음
+    assert test_db.query(APIUsage).count() == 0
+    
+    assert buffer.flush() == 3
+    assert buffer.pending_count() == 0
+    
+    test_db.expire_all()
+    assert test_db.query(APIUsage).filter(APIUsage.api_key_id == api_key.id).count() == 3
+    assert test_db.query(APIKey).filter(APIKey.id == api_key.id).first().call_count == 3
+
+def test_usage_buffer_skips_deleted_keys(test_db):
+    """기록 후 삭제된 API 키의 사용 기록은 건너뛰고 나머지는 저장되는지 테스트"""
+    user = User(wallet_address="0xusagedeleted")
+    kept = APIKey(key_id="hsk_kept", secret_key_hash="x", user_wallet=user.wallet_address, call_count=0)
+    deleted = APIKey(key_id="hsk_deleted", secret_key_hash="x", user_wallet=user.wallet_address, call_count=0)
+    test_db.add_all([user, kept, deleted])
+    test_db.commit()
+    kept_id, deleted_id = kept.id, deleted.id
+    
+    buffer = UsageBuffer(session_factory=TestingSessionLocal)
+    buffer.record(kept_id, "/crypto/btc/usd", "GET")
+    buffer.record(deleted_id, "/crypto/btc/usd", "GET")
+    
+    test_db.delete(deleted)
+    test_db.commit()
+    
+    buffer.flush()
+    assert buffer.pending_count() == 0
+    
+    test_db.expire_all()
+    assert test_db.query(APIUsage).filter(APIUsage.api_key_id == kept_id).count() == 1
+    assert test_db.query(APIUsage).filter(APIUsage.api_key_id == deleted_id).count() == 0
+
+def test_usage_buffer_limits(test_db):
+    """버퍼 크기 제한과 저장 실패 시 재시도 횟수 제한 테스트"""
+    buffer = UsageBuffer(session_factory=TestingSessionLocal, max_pending=2)
+    for _ in range(3):
+        buffer.record(1, "/crypto/btc/usd", "GET")
+    assert buffer.pending_count() == 2
+    
+    # 테이블이 없는 DB에 연결된 세션으로 저장 실패 재현
+    buffer.session_factory = sessionmaker(bind=create_engine("sqlite://"))
+    for _ in range(MAX_FLUSH_RETRIES - 1):
+        assert buffer.flush() == 0
+        assert buffer.pending_count() == 2
+    
+    # 마지막 재시도까지 실패하면 배치를 버림
+    assert buffer.flush() == 0
+    assert buffer.pending_count() == 0